@@ -1,7 +1,9 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import health, cases
+from app.api.v1.endpoints import health, cases, intake, exhibits
 
 api_router = APIRouter()
 
 api_router.include_router(health.router, prefix="/health", tags=["health"])
 api_router.include_router(cases.router, prefix="/cases", tags=["cases"])
+api_router.include_router(intake.router, prefix="/intake", tags=["intake"])
+api_router.include_router(exhibits.router, prefix="/exhibits", tags=["exhibits"])
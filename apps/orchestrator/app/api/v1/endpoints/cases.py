@@ -1,9 +1,11 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends
 from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime
 import uuid
 
+from app.core.exhibit_cache import get_exhibit_cache
+
 router = APIRouter()
 
 # Pydantic models
@@ -83,13 +85,15 @@ async def delete_case(case_id: str):
     raise HTTPException(status_code=404, detail="Case not found")
 
 @router.post("/{case_id}/start-trial", response_model=Case)
-async def start_trial(case_id: str):
-    """Start a trial for a case"""
+async def start_trial(case_id: str, background_tasks: BackgroundTasks):
+    """Start a trial for a case, warming the exhibit cache with its exhibits"""
     for i, case in enumerate(cases_db):
         if case.id == case_id:
             if case.status != "pretrial":
                 raise HTTPException(status_code=400, detail="Case must be in pretrial status to start trial")
             cases_db[i].status = "trial"
+            # Every participant opens the same exhibits as soon as the trial starts
+            background_tasks.add_task(get_exhibit_cache().prefetch_case, case_id)
             return cases_db[i]
     raise HTTPException(status_code=404, detail="Case not found")
 
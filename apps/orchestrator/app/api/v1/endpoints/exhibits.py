@@ -0,0 +1,38 @@
+from fastapi import APIRouter, HTTPException, Request, Response
+
+from app.core.exhibit_cache import get_exhibit_cache
+from app.core.range_response import RangeFileResponse, RangeNotSatisfiable, parse_byte_range
+
+router = APIRouter()
+
+# Content is addressed by checksum, so a response never changes
+EXHIBIT_CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+
+@router.api_route("/{checksum}", methods=["GET", "HEAD"])
+async def get_exhibit(checksum: str, request: Request):
+    """
+    Serve an exhibit by checksum from the local hot cache.
+
+    Supports single byte ranges (`Range: bytes=...`) for seeking in video
+    and paging through large documents. The first request for an exhibit
+    downloads it once, however many participants ask at the same moment.
+    """
+    etag = f'"{checksum}"'
+    headers = {"etag": etag, "cache-control": EXHIBIT_CACHE_CONTROL}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    try:
+        handle, entry = await get_exhibit_cache().open(checksum)
+    except LookupError:
+        raise HTTPException(status_code=404, detail="Exhibit not found")
+
+    try:
+        byte_range = parse_byte_range(request.headers.get("range"), entry.size_bytes)
+    except RangeNotSatisfiable:
+        handle.close()
+        return Response(status_code=416, headers={"content-range": f"bytes */{entry.size_bytes}"})
+
+    return RangeFileResponse(handle, entry.size_bytes, entry.mime_type, byte_range, headers, request.method)
+
@@ -0,0 +1,68 @@
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from typing import Any, Dict, Iterator, List, Tuple
+from celery.result import AsyncResult
+import json
+
+from app.core.celery_client import celery_client
+
+router = APIRouter()
+
+NORMALIZE_BATCH_TASK = "app.tasks.intake_normalizer.normalize_intake_batch"
+
+# Cases per Celery message; each message is fanned out over a worker's process pool
+BATCH_MESSAGE_SIZE = 1000
+BATCH_RESULT_TIMEOUT = 25 * 60
+
+
+def _dispatch(items: List[Any], is_ndjson: bool) -> List[Tuple[int, int, AsyncResult]]:
+    """Send the batch to the workers in large messages"""
+    dispatched = []
+    for offset in range(0, len(items), BATCH_MESSAGE_SIZE):
+        chunk = items[offset:offset + BATCH_MESSAGE_SIZE]
+        payload = "\n".join(chunk) if is_ndjson else chunk
+        result = celery_client.send_task(NORMALIZE_BATCH_TASK, args=[payload])
+        dispatched.append((offset, len(chunk), result))
+    return dispatched
+
+
+def _stream_results(dispatched: List[Tuple[int, int, AsyncResult]]) -> Iterator[str]:
+    """Yield NDJSON result lines in input order as each message completes"""
+    for offset, size, result in dispatched:
+        try:
+            batch: Dict[str, Any] = result.get(timeout=BATCH_RESULT_TIMEOUT)
+            for item in batch["results"]:
+                item["index"] += offset
+                yield json.dumps(item) + "\n"
+        except Exception as e:
+            for index in range(offset, offset + size):
+                yield json.dumps({"index": index, "status": "error", "error": f"Batch failed: {e}"}) + "\n"
+
+
+@router.post("/batch")
+async def normalize_intake_batch(request: Request):
+    """
+    Normalize a batch of case intakes.
+
+    Accepts a JSON array of case payloads, or NDJSON (`application/x-ndjson`)
+    with one payload per line. Results stream back as NDJSON in input order,
+    with per-item errors reported inline.
+    """
+    body = (await request.body()).decode("utf-8")
+    content_type = request.headers.get("content-type", "")
+
+    if "ndjson" in content_type:
+        # Split on "\n" only; JSON strings may contain U+2028 and friends raw
+        items: List[Any] = [line.removesuffix("\r") for line in body.split("\n") if line.strip()]
+        is_ndjson = True
+    else:
+        try:
+            items = json.loads(body)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+        if not isinstance(items, list):
+            raise HTTPException(status_code=400, detail="Body must be a JSON array of case payloads")
+        is_ndjson = False
+
+    dispatched = _dispatch(items, is_ndjson)
+    return StreamingResponse(_stream_results(dispatched), media_type="application/x-ndjson")
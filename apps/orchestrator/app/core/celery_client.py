@@ -0,0 +1,27 @@
+from celery import Celery
+from app.core.config import settings
+
+# Worker tasks that run on the process-pool queue; mirrors apps/workers/celery_app.py
+POOL_QUEUE = "pooled"
+POOL_TASKS = (
+    "app.tasks.intake_normalizer.normalize_intake_batch",
+    "app.tasks.evidence_ingest.ingest_exhibit",
+    "app.tasks.evidence_ingest.ingest_exhibits_batch",
+    "app.tasks.evidence_ingest.render_exhibit_page",
+)
+
+# Producer-only client for dispatching to the worker queues by task name
+celery_client = Celery(
+    "courtroom_simulator_orchestrator",
+    broker=settings.REDIS_URL,
+    backend=settings.REDIS_URL,
+)
+
+celery_client.conf.update(
+    task_serializer="json",
+    accept_content=["json"],
+    result_serializer="json",
+    timezone="UTC",
+    enable_utc=True,
+    task_routes={name: {"queue": POOL_QUEUE} for name in POOL_TASKS},
+)
@@ -25,6 +25,16 @@ class Settings(BaseSettings):
     AWS_SECRET_ACCESS_KEY: Optional[str] = None
     AWS_REGION: str = "us-east-1"
     S3_BUCKET: str = "courtroom-simulator"
+    S3_ENDPOINT_URL: Optional[str] = "http://localhost:9000"
+    
+    # Exhibit serving: hot exhibits are kept on local disk, least recently used evicted first.
+    # Each server process enforces the byte budget on its own, so processes sharing a
+    # directory can together hold up to EXHIBIT_CACHE_MAX_BYTES times their number.
+    EXHIBIT_CACHE_DIR: str = "/tmp/courtroom-exhibit-cache"
+    EXHIBIT_CACHE_MAX_BYTES: int = 20 * 1024 * 1024 * 1024
+    # Partial downloads untouched this long were abandoned by a process that died
+    EXHIBIT_CACHE_STALE_PART_SECONDS: int = 3600
+    EXHIBIT_PREFETCH_CONCURRENCY: int = 4
     
     # OpenAI
     OPENAI_API_KEY: Optional[str] = None
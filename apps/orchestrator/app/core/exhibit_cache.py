@@ -0,0 +1,245 @@
+from collections import OrderedDict
+from contextlib import suppress
+from functools import lru_cache
+from typing import Any, BinaryIO, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+import asyncio
+import json
+import os
+import re
+import threading
+import time
+import uuid
+
+import redis
+from starlette.concurrency import run_in_threadpool
+
+from app.core import storage
+from app.core.config import settings
+
+
+# Records written by the workers' blob store when exhibits are ingested:
+# "<namespace>:<checksum>" holds the blob record and "<namespace>:case:<id>"
+# maps each of a case's filenames to its checksum
+BLOB_NAMESPACE = "exhibit-blob"
+
+_CHECKSUM = re.compile(r"[0-9a-f]{64}")
+
+_redis: Optional[redis.Redis] = None
+
+
+def get_redis() -> redis.Redis:
+    global _redis
+    if _redis is None:
+        _redis = redis.Redis.from_url(settings.REDIS_URL)
+    return _redis
+
+
+def blob_record(checksum: str) -> Optional[Dict[str, Any]]:
+    """Stored object key, size and MIME type of an ingested exhibit"""
+    raw = get_redis().get(f"{BLOB_NAMESPACE}:{checksum}")
+    return json.loads(raw) if raw is not None else None
+
+
+def case_exhibit_checksums(case_id: str) -> List[str]:
+    """Distinct checksums of the exhibits ingested into a case"""
+    raw = get_redis().hgetall(f"{BLOB_NAMESPACE}:case:{case_id}")
+    return sorted({checksum.decode("utf-8") for checksum in raw.values()})
+
+
+def fetch_blob(checksum: str, path: str) -> Dict[str, Any]:
+    """Download an exhibit blob to `path` and return its record"""
+    record = blob_record(checksum)
+    if record is None:
+        raise LookupError(f"Unknown exhibit {checksum}")
+    storage.download_file(record["s3_key"], path)
+    return record
+
+
+class CachedExhibit(NamedTuple):
+    path: str
+    size_bytes: int
+    mime_type: Optional[str]
+
+
+class ExhibitCache:
+    """
+    Size-bounded local disk cache of exhibit blobs, keyed by checksum.
+
+    Blobs are content addressed, so a cached file never goes stale and is
+    only ever evicted, least recently used first. Concurrent misses for the
+    same checksum share one download. Handles are opened under the index
+    lock, so a request always has its file open before eviction can unlink
+    it, and an unlinked file stays readable through handles already open.
+
+    Several server processes may share a directory. Each indexes and evicts
+    only what it knows of, so `max_bytes` is a budget per process, and
+    another process's partial downloads are left alone until they are
+    `stale_part_seconds` old.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int,
+        fetch: Callable[[str, str], Dict[str, Any]] = fetch_blob,
+        stale_part_seconds: float = settings.EXHIBIT_CACHE_STALE_PART_SECONDS,
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.stale_part_seconds = stale_part_seconds
+        self.fetch_blob = fetch
+        self.size_bytes = 0
+        self._entries: "OrderedDict[str, CachedExhibit]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._adopt_existing()
+
+    def __contains__(self, checksum: str) -> bool:
+        with self._lock:
+            return checksum in self._entries
+
+    def _path(self, checksum: str) -> str:
+        return os.path.join(self.directory, checksum[:2], checksum)
+
+    def _adopt_existing(self) -> None:
+        """Index exhibits already on disk, oldest access first, and drop abandoned partial downloads"""
+        found = []
+        os.makedirs(self.directory, exist_ok=True)
+        stale_before = time.time() - self.stale_part_seconds
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    status = os.stat(path)
+                except FileNotFoundError:
+                    # Renamed or removed by another process meanwhile
+                    continue
+                if _CHECKSUM.fullmatch(name):
+                    found.append((status.st_atime, name, CachedExhibit(path, status.st_size, None)))
+                elif name.endswith(".part") and status.st_mtime < stale_before:
+                    # A live download keeps writing, so only an old one is abandoned
+                    with suppress(FileNotFoundError):
+                        os.unlink(path)
+
+        for _, checksum, entry in sorted(found):
+            self._add(checksum, entry)
+        self._evict()
+
+    def _add(self, checksum: str, entry: CachedExhibit) -> None:
+        previous = self._entries.pop(checksum, None)
+        if previous is not None:
+            self.size_bytes -= previous.size_bytes
+        self._entries[checksum] = entry
+        self.size_bytes += entry.size_bytes
+
+    def _drop(self, checksum: str) -> None:
+        entry = self._entries.pop(checksum)
+        self.size_bytes -= entry.size_bytes
+        with suppress(FileNotFoundError):
+            os.unlink(entry.path)
+
+    def _evict(self) -> None:
+        # The newest entry stays even if it alone is over budget
+        while self.size_bytes > self.max_bytes and len(self._entries) > 1:
+            self._drop(next(iter(self._entries)))
+
+    def _download(self, checksum: str) -> CachedExhibit:
+        path = self._path(checksum)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        partial = f"{path}.{uuid.uuid4().hex}.part"
+        try:
+            record = self.fetch_blob(checksum, partial)
+            os.replace(partial, path)
+        except BaseException:
+            with suppress(FileNotFoundError):
+                os.unlink(partial)
+            raise
+
+        entry = CachedExhibit(path, os.path.getsize(path), record.get("mime_type"))
+        with self._lock:
+            self._add(checksum, entry)
+            self._evict()
+        return entry
+
+    def _settled(self, checksum: str, future: asyncio.Future) -> None:
+        self._inflight.pop(checksum, None)
+        if not future.cancelled():
+            # Retrieve the error so a download nobody is waiting on any more is not logged as unhandled
+            future.exception()
+
+    async def fetch(self, checksum: str) -> CachedExhibit:
+        """
+        Bring an exhibit onto local disk.
+
+        Callers missing the same checksum at once await a single download,
+        which carries on for the others if one of them disconnects.
+
+        Raises:
+            LookupError: If the checksum is malformed or not a known exhibit
+        """
+        if not _CHECKSUM.fullmatch(checksum):
+            raise LookupError(f"Not an exhibit checksum: {checksum!r}")
+        with self._lock:
+            entry = self._entries.get(checksum)
+        if entry is not None:
+            return entry
+
+        pending = self._inflight.get(checksum)
+        if pending is None:
+            pending = asyncio.ensure_future(run_in_threadpool(self._download, checksum))
+            self._inflight[checksum] = pending
+            pending.add_done_callback(lambda future: self._settled(checksum, future))
+        return await asyncio.shield(pending)
+
+    async def open(self, checksum: str) -> Tuple[BinaryIO, CachedExhibit]:
+        """An open handle on a cached exhibit, downloading it first on a miss"""
+        while True:
+            await self.fetch(checksum)
+            with self._lock:
+                entry = self._entries.get(checksum)
+                if entry is None:
+                    # Evicted again before we got to it
+                    continue
+                self._entries.move_to_end(checksum)
+                try:
+                    handle = open(entry.path, "rb")
+                except FileNotFoundError:
+                    # Removed behind the cache's back
+                    self._drop(checksum)
+                    continue
+                break
+
+        if entry.mime_type is None:
+            record = await run_in_threadpool(blob_record, checksum) or {}
+            entry = entry._replace(mime_type=record.get("mime_type") or "application/octet-stream")
+            with self._lock:
+                if checksum in self._entries:
+                    self._entries[checksum] = entry
+        return handle, entry
+
+    async def prefetch(
+        self,
+        checksums: Iterable[str],
+        concurrency: int = settings.EXHIBIT_PREFETCH_CONCURRENCY,
+    ) -> Dict[str, int]:
+        """Download exhibits ahead of demand, a few at a time; failures are counted, not raised"""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def warm(checksum: str) -> None:
+            async with semaphore:
+                await self.fetch(checksum)
+
+        results = await asyncio.gather(*(warm(checksum) for checksum in checksums), return_exceptions=True)
+        failed = sum(1 for result in results if isinstance(result, BaseException))
+        return {"cached": len(results) - failed, "failed": failed}
+
+    async def prefetch_case(self, case_id: str) -> Dict[str, int]:
+        """Warm the cache with every exhibit on a case's exhibit list"""
+        checksums = await run_in_threadpool(case_exhibit_checksums, case_id)
+        return await self.prefetch(checksums)
+
+
+@lru_cache(maxsize=None)
+def get_exhibit_cache() -> ExhibitCache:
+    """The process-wide exhibit cache"""
+    return ExhibitCache(settings.EXHIBIT_CACHE_DIR, settings.EXHIBIT_CACHE_MAX_BYTES)
@@ -0,0 +1,114 @@
+from typing import BinaryIO, Mapping, Optional, Tuple
+import os
+
+import anyio
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+
+# ASGI extension servers advertise when they can sendfile() a descriptor
+ZEROCOPY_EXTENSION = "http.response.zerocopysend"
+
+
+class RangeNotSatisfiable(ValueError):
+    pass
+
+
+def parse_byte_range(header: Optional[str], size_bytes: int) -> Optional[Tuple[int, int]]:
+    """
+    [start, end) requested by a Range header, or None to send the whole file.
+
+    Malformed headers and multi-range requests are ignored, as RFC 9110
+    allows, and answered with the full content.
+
+    Raises:
+        RangeNotSatisfiable: If the range starts past the end of the file
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, separator, last = header[len("bytes="):].strip().partition("-")
+    if not separator or not (first or last) or not (first + last).isdigit():
+        return None
+
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0 or size_bytes == 0:
+            raise RangeNotSatisfiable(header)
+        return max(0, size_bytes - length), size_bytes
+
+    start = int(first)
+    end = int(last) + 1 if last else size_bytes
+    if start >= size_bytes:
+        raise RangeNotSatisfiable(header)
+    if end <= start:
+        return None
+    return start, min(end, size_bytes)
+
+
+class RangeFileResponse(Response):
+    """
+    Whole or partial content of an open file.
+
+    When the server offers the zero-copy extension the kernel sends the
+    range straight from the page cache; otherwise it is streamed in
+    positional reads off the event loop. The handle is closed when done.
+    """
+
+    chunk_size = 256 * 1024
+
+    def __init__(
+        self,
+        handle: BinaryIO,
+        size_bytes: int,
+        media_type: str,
+        byte_range: Optional[Tuple[int, int]] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        method: str = "GET",
+    ) -> None:
+        self.handle = handle
+        self.start, self.end = byte_range or (0, size_bytes)
+        self.status_code = 206 if byte_range else 200
+        self.media_type = media_type
+        self.background = None
+        self.send_header_only = method.upper() == "HEAD"
+
+        headers = dict(headers or {})
+        headers["accept-ranges"] = "bytes"
+        headers["content-length"] = str(self.end - self.start)
+        if byte_range:
+            headers["content-range"] = f"bytes {self.start}-{self.end - 1}/{size_bytes}"
+        self.init_headers(headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+
+            count = self.end - self.start
+            if self.send_header_only or count == 0:
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+            elif ZEROCOPY_EXTENSION in scope.get("extensions", {}):
+                await send({
+                    "type": ZEROCOPY_EXTENSION,
+                    "file": self.handle,
+                    "offset": self.start,
+                    "count": count,
+                    "more_body": False,
+                })
+            else:
+                await self._send_chunks(send)
+        finally:
+            self.handle.close()
+
+    async def _send_chunks(self, send: Send) -> None:
+        descriptor = self.handle.fileno()
+        offset = self.start
+        while offset < self.end:
+            chunk = await anyio.to_thread.run_sync(os.pread, descriptor, min(self.chunk_size, self.end - offset), offset)
+            if not chunk:
+                # File shorter than recorded; end the body rather than hang
+                break
+            offset += len(chunk)
+            await send({"type": "http.response.body", "body": chunk, "more_body": offset < self.end})
+        if offset < self.end:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
@@ -0,0 +1,35 @@
+import threading
+
+import boto3
+from botocore.config import Config
+
+from app.core.config import settings
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_s3_client():
+    """S3/MinIO client shared by the request handlers; boto3 clients are thread-safe"""
+    global _client
+
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = boto3.client(
+                    's3',
+                    endpoint_url=settings.S3_ENDPOINT_URL,
+                    aws_access_key_id=settings.AWS_ACCESS_KEY_ID or 'minioadmin',
+                    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY or 'minioadmin',
+                    region_name=settings.AWS_REGION,
+                    config=Config(retries={'max_attempts': 5, 'mode': 'adaptive'}, tcp_keepalive=True),
+                )
+
+    return _client
+
+
+def download_file(key: str, path: str) -> str:
+    """Download an object to a local path, in concurrent ranges when it is large"""
+    get_s3_client().download_file(settings.S3_BUCKET, key, path)
+    return path
@@ -0,0 +1,79 @@
+import struct
+import uuid
+import numpy as np
+from app.core import database
+from app.core.embeddings import HashingEmbedder, embedding_hash, to_pgvector_binary
+from app.tasks.embedding_pipeline import copy_values, iter_embedded_batches
+
+
+class FakeCursor:
+    """Captures COPY statements and payloads"""
+    
+    def __init__(self):
+        self.copies = []
+    
+    def copy_expert(self, sql, buffer):
+        self.copies.append((sql, buffer.read()))
+
+
+class TestEmbeddingPipeline:
+    
+    def test_hashing_embeddings_are_unit_and_batch_independent(self):
+        """Test a text embeds the same alone or in a batch"""
+        embedder = HashingEmbedder()
+        texts = ["The officer saw the red car", "Contract breach damages", ""]
+        
+        batch = embedder.embed(texts)
+        alone = embedder.embed(texts[:1])
+        
+        assert batch.shape == (3, 1536)
+        assert batch.dtype == np.float32
+        assert np.allclose(np.linalg.norm(batch[:2], axis=1), 1.0)
+        assert not batch[2].any()
+        assert np.allclose(batch[0], alone[0])
+    
+    def test_similar_texts_score_higher(self):
+        """Test overlapping wording yields higher cosine similarity"""
+        vectors = HashingEmbedder().embed([
+            "The witness saw the defendant leave the store",
+            "The witness saw the defendant run from the store",
+            "Invoice for medical equipment shipped in March",
+        ])
+        
+        assert vectors[0] @ vectors[1] > vectors[0] @ vectors[2]
+    
+    def test_embedding_hash_tracks_text_and_model(self):
+        """Test the content hash changes with the text or the model version"""
+        base = embedding_hash("Exhibit A", HashingEmbedder())
+        
+        assert base == embedding_hash("Exhibit A", HashingEmbedder())
+        assert base != embedding_hash("Exhibit B", HashingEmbedder())
+        assert base != embedding_hash("Exhibit A", HashingEmbedder(bigrams=False))
+    
+    def test_batches_encode_binary_copy_values(self):
+        """Test rows are embedded per batch and encoded for binary COPY"""
+        rows = [(str(uuid.uuid4()), f"fact number {index}", f"hash-{index}") for index in range(5)]
+        
+        batches = list(iter_embedded_batches(rows, HashingEmbedder(dim=8), batch_size=2))
+        
+        assert [len(batch) for batch, _ in batches] == [2, 2, 1]
+        assert batches[0][1].shape == (2, 8)
+        row_id, vector, body_hash = copy_values(*batches[0])[0]
+        assert row_id == uuid.UUID(rows[0][0]).bytes
+        assert body_hash == b"hash-0"
+        assert struct.unpack(">hh", vector[:4]) == (8, 0)
+        assert np.allclose(np.frombuffer(vector[4:], dtype=">f4"), HashingEmbedder(dim=8).embed([rows[0][1]])[0])
+    
+    def test_copy_binary_rows_framing(self):
+        """Test the binary COPY stream has header, tuples and trailer"""
+        cursor = FakeCursor()
+        vector = to_pgvector_binary(np.ones((1, 2), dtype=np.float32))[0]
+        
+        count = database.copy_binary_rows(cursor, "embedding_load", ("id", "embedding"), [(b"\x01" * 16, vector), (None, vector)])
+        
+        sql, payload = cursor.copies[0]
+        assert count == 2
+        assert sql == "COPY embedding_load (id, embedding) FROM STDIN WITH (FORMAT binary)"
+        assert payload.startswith(b"PGCOPY\n\xff\r\n\x00")
+        assert payload.endswith(struct.pack(">h", -1))
+        assert struct.pack(">hi", 2, -1) in payload
@@ -0,0 +1,541 @@
+import hashlib
+import io
+import json
+import pytest
+from unittest.mock import patch
+from app.core.cache import ResultCache
+from app.core.config import settings
+from app.core.merkle import MerkleTree, leaf_hash
+from app.tasks.evidence_ingest import (
+    blob_store,
+    ingest_exhibit,
+    ingest_exhibits_batch,
+    release_exhibit,
+    verify_exhibit_range,
+)
+
+
+class FakeS3Client:
+    """In-memory stand-in for the boto3 S3 client calls used by ingest"""
+    
+    def __init__(self):
+        self.objects = {}
+        self.uploads = {}
+        self.calls = []
+        self.ranges = []
+    
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.calls.append("put_object")
+        self.objects[Key] = bytes(Body)
+    
+    def create_multipart_upload(self, Bucket, Key, **kwargs):
+        self.calls.append("create_multipart_upload")
+        self.uploads["upload-1"] = {}
+        return {"UploadId": "upload-1"}
+    
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        self.calls.append("upload_part")
+        self.uploads[UploadId][PartNumber] = bytes(Body)
+        return {"ETag": f"etag-{PartNumber}"}
+    
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        self.calls.append("complete_multipart_upload")
+        parts = self.uploads.pop(UploadId)
+        self.objects[Key] = b"".join(parts[part["PartNumber"]] for part in MultipartUpload["Parts"])
+    
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.calls.append("abort_multipart_upload")
+        self.uploads.pop(UploadId, None)
+    
+    def upload_fileobj(self, Fileobj, Bucket, Key, ExtraArgs=None, Config=None):
+        """Mimic s3transfer: one PUT below the threshold, otherwise sized parts"""
+        first = Fileobj.read(Config.multipart_threshold)
+        rest = Fileobj.read(Config.multipart_chunksize)
+        if not rest:
+            return self.put_object(Bucket, Key, first, **(ExtraArgs or {}))
+        
+        upload_id = self.create_multipart_upload(Bucket, Key)["UploadId"]
+        parts = []
+        chunk = first
+        while chunk:
+            part_number = len(parts) + 1
+            response = self.upload_part(Bucket, Key, upload_id, part_number, chunk)
+            parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+            chunk, rest = rest, Fileobj.read(Config.multipart_chunksize)
+        self.complete_multipart_upload(Bucket, Key, upload_id, {"Parts": parts})
+    
+    def upload_file(self, Filename, Bucket, Key, ExtraArgs=None, Config=None):
+        with open(Filename, "rb") as handle:
+            self.upload_fileobj(handle, Bucket, Key, ExtraArgs=ExtraArgs, Config=Config)
+    
+    def copy(self, CopySource, Bucket, Key, Config=None):
+        self.calls.append("copy")
+        self.objects[Key] = self.objects[CopySource["Key"]]
+    
+    def get_object(self, Bucket, Key, Range=None):
+        content = self.objects[Key]
+        if Range:
+            first, _, last = Range[len("bytes="):].partition("-")
+            content = content[int(first):int(last) + 1 if last else None]
+        self.ranges.append((Key, Range))
+        return {"Body": io.BytesIO(content)}
+    
+    def get_paginator(self, operation):
+        objects = self.objects
+        
+        class Paginator:
+            def paginate(self, Bucket, Prefix):
+                yield {"Contents": [{"Key": key} for key in sorted(objects) if key.startswith(Prefix)]}
+        
+        return Paginator()
+    
+    def delete_objects(self, Bucket, Delete):
+        self.calls.append("delete_objects")
+        for item in Delete["Objects"]:
+            self.objects.pop(item["Key"], None)
+        return {}
+    
+    def generate_presigned_url(self, method, Params, ExpiresIn):
+        return f"https://minio.test/{Params['Bucket']}/{Params['Key']}?expires={ExpiresIn}"
+
+
+class FakeRedis:
+    """In-memory stand-in for the Redis commands used by the blob store"""
+    
+    def __init__(self):
+        self.values = {}
+        self.sets = {}
+        self.hashes = {}
+    
+    def get(self, key):
+        return self.values.get(key)
+    
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value.encode("utf-8") if isinstance(value, str) else value
+        return True
+    
+    def exists(self, key):
+        return int(key in self.values or bool(self.sets.get(key)))
+    
+    def sadd(self, key, member):
+        self.sets.setdefault(key, set()).add(member)
+    
+    def srem(self, key, member):
+        self.sets.get(key, set()).discard(member)
+    
+    def scard(self, key):
+        return len(self.sets.get(key, ()))
+    
+    def sismember(self, key, member):
+        return member in self.sets.get(key, ())
+    
+    def multi(self):
+        pass
+    
+    def transaction(self, func, *watches, value_from_callable=False):
+        """Single-threaded tests never see a watched key change, so run the body once"""
+        return func(self)
+    
+    def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field.encode("utf-8")] = value.encode("utf-8")
+    
+    def hdel(self, key, field):
+        self.hashes.get(key, {}).pop(field.encode("utf-8"), None)
+    
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+    
+    def incr(self, key):
+        value = int(self.values.get(key, b"0")) + 1
+        self.values[key] = str(value).encode("utf-8")
+        return value
+    
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+    
+    def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+            self.sets.pop(key, None)
+
+
+class FakePipeline:
+    """Queues commands and runs them together on execute, as MULTI/EXEC does"""
+    
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+        self.commands = []
+    
+    def __getattr__(self, name):
+        command = getattr(self.redis_client, name)
+        return lambda *args, **kwargs: self.commands.append((command, args, kwargs))
+    
+    def execute(self):
+        return [command(*args, **kwargs) for command, args, kwargs in self.commands]
+
+
+class FakeExhibitTable:
+    """The exhibits table's unique keys: upserts on (case_id, checksum), codes unique per case"""
+    
+    def __init__(self):
+        self.rows = {}
+        self.statements = []
+    
+    def codes(self, case_id):
+        return {row[1]: row[6] for key, row in self.rows.items() if key[0] == case_id}
+    
+    def insert_rows(self, sql, rows, template=None):
+        self.statements.append((sql, list(rows)))
+        for row in rows:
+            existing = self.rows.get((row[0], row[6]))
+            code = existing[1] if existing else row[1]
+            assert code not in self.codes(row[0]) or existing, f"duplicate code {code}"
+            self.rows[(row[0], row[6])] = (row[0], code, *row[2:])
+        return len(rows)
+    
+    def case_rows(self, case_id):
+        return sorted((row[1], row[2]) for key, row in self.rows.items() if key[0] == case_id)
+
+
+@pytest.fixture
+def s3():
+    client = FakeS3Client()
+    redis_client = FakeRedis()
+    with patch("app.core.storage.get_s3_client", return_value=client), \
+            patch.object(blob_store, "client_factory", lambda: redis_client), \
+            patch("app.core.timeline_index.get_redis", lambda: redis_client), \
+            patch.object(settings, "S3_MULTIPART_CHUNK_SIZE", 4096):
+        yield client
+
+
+@pytest.fixture
+def exhibit_table():
+    table = FakeExhibitTable()
+    with patch("app.core.database.insert_rows", side_effect=table.insert_rows), \
+            patch("app.tasks.evidence_ingest.existing_exhibit_codes", side_effect=table.codes):
+        yield table
+
+
+class TestEvidenceIngest:
+    
+    def test_ingest_large_file_multipart(self, s3, tmp_path):
+        """Test large files are uploaded part by part under their checksum"""
+        content = bytes(range(256)) * 100
+        path = tmp_path / "video.bin"
+        path.write_bytes(content)
+        
+        result = ingest_exhibit("case-1", {"filename": "video.bin", "mime_type": "video/mp4", "path": str(path)})
+        
+        checksum = hashlib.sha256(content).hexdigest()
+        assert result["checksum"] == checksum
+        assert result["s3_key"] == f"blobs/sha256/{checksum[:2]}/{checksum}"
+        assert s3.objects[result["s3_key"]] == content
+        assert s3.calls.count("upload_part") == 7
+        assert s3.calls[-1] == "complete_multipart_upload"
+    
+    def test_duplicate_content_is_stored_once(self, s3):
+        """Test re-ingesting known content skips upload and reuses metadata"""
+        content = b"Officer Smith observed the vehicle.\nIt was red.\n"
+        
+        first = ingest_exhibit("case-1", {"filename": "report.txt", "mime_type": "text/plain", "content": content})
+        uploads = list(s3.calls)
+        with patch("app.tasks.evidence_ingest.process_exhibit_file") as process:
+            second = ingest_exhibit("case-2", {"filename": "copy.txt", "mime_type": "text/plain", "content": content})
+        
+        assert not first["deduplicated"]
+        assert second["deduplicated"]
+        assert second["s3_key"] == first["s3_key"]
+        assert second["metadata"] == first["metadata"]
+        assert second["reference_count"] == 2
+        assert s3.calls == uploads
+        process.assert_not_called()
+    
+    def test_release_deletes_unreferenced_blob(self, s3):
+        """Test the blob is deleted only when its last reference is released, and leaves the case index"""
+        content = b"shared exhibit"
+        for case_id in ("case-1", "case-2"):
+            result = ingest_exhibit(case_id, {"filename": "a.txt", "mime_type": "text/plain", "content": content})
+        
+        assert blob_store.case_exhibits("case-1") == {"a.txt": result["checksum"]}
+        
+        first = release_exhibit("case-1", "a.txt", result["checksum"])
+        assert blob_store.case_exhibits("case-1") == {}
+        assert first["reference_count"] == 1
+        assert not first["blob_deleted"]
+        assert result["s3_key"] in s3.objects
+        
+        derived = f"derived/sha256/{result['checksum'][:2]}/{result['checksum']}/"
+        s3.objects[derived + "render/1/00001.png"] = b"png"
+        
+        last = release_exhibit("case-2", "a.txt", result["checksum"])
+        assert last["blob_deleted"]
+        assert result["s3_key"] not in s3.objects
+        assert not [key for key in s3.objects if key.startswith(derived)]
+        assert blob_store.lookup(result["checksum"]) is None
+    
+    def test_release_racing_dedupe_stores_blob_again(self, s3):
+        """Test an ingest that deduped onto a blob released before it referenced it stores the blob again"""
+        content = b"contested exhibit"
+        first = ingest_exhibit("case-1", {"filename": "a.txt", "mime_type": "text/plain", "content": content})
+        lookup = blob_store.lookup
+        
+        def lookup_then_release(checksum):
+            record = lookup(checksum)
+            if record is not None:
+                release_exhibit("case-1", "a.txt", checksum)
+            return record
+        
+        with patch.object(blob_store, "lookup", side_effect=lookup_then_release):
+            second = ingest_exhibit("case-2", {"filename": "b.txt", "mime_type": "text/plain", "content": content})
+        
+        assert s3.objects[first["s3_key"]] == content
+        assert blob_store.lookup(first["checksum"]) is not None
+        assert second["reference_count"] == 1
+        assert not second["deduplicated"]
+    
+    def test_ingest_exhibit_from_staged_key(self, s3):
+        """Test exhibits staged in the bucket are ingested by reference"""
+        content = b"Officer Smith observed the vehicle.\nIt was red.\n"
+        s3.objects["staging/upload-1"] = content
+        
+        result = ingest_exhibit("case-1", {
+            "filename": "report.txt",
+            "mime_type": "text/plain",
+            "staged_key": "staging/upload-1"
+        })
+        
+        assert result["checksum"] == hashlib.sha256(content).hexdigest()
+        assert result["size_bytes"] == len(content)
+        assert result["metadata"]["line_count"] == 2
+        assert result["metadata"]["line_index_key"] in s3.objects
+        assert s3.objects[result["s3_key"]] == content
+        assert "copy" in s3.calls
+        assert "staging/upload-1" not in s3.objects
+    
+    def test_pdf_pages_are_extracted_and_stored(self, s3, tmp_path):
+        """Test every page's text is written to storage and the page table"""
+        import fitz
+        from app.core.pdf_text import page_cache
+        
+        document = fitz.open()
+        for number in range(40):
+            document.new_page().insert_text((72, 72), f"Page {number + 1} testimony")
+        path = tmp_path / "discovery.pdf"
+        document.save(str(path))
+        
+        rows = []
+        page_cache.clear_local()
+        with patch("app.core.database.insert_rows", side_effect=lambda sql, batch, template: rows.extend(batch)):
+            result = ingest_exhibit("case-1", {"filename": "discovery.pdf", "mime_type": "application/pdf", "path": str(path)})
+        
+        checksum = result["checksum"]
+        assert result["metadata"]["page_count"] == 40
+        assert result["metadata"]["text"]["pages_extracted"] == 40
+        assert sorted(row[1] for row in rows) == list(range(1, 41))
+        page = json.loads(s3.objects[f"derived/sha256/{checksum[:2]}/{checksum}/pages/00007.json"])
+        assert page["text"].strip() == "Page 7 testimony"
+        assert [word[4] for word in page["words"]] == ["Page", "7", "testimony"]
+    
+    def test_pdf_path_reused_for_new_content_is_parsed_again(self, tmp_path):
+        """Test a pool worker never serves an earlier document spooled to the same path"""
+        import fitz
+        from concurrent.futures import ProcessPoolExecutor
+        from app.core.pdf_text import iter_pdf_pages, page_cache
+        
+        path = tmp_path / "spool.pdf"
+        
+        def pages_of(label):
+            document = fitz.open()
+            for number in range(40):
+                document.new_page().insert_text((72, 72), f"{label} page {number + 1}")
+            document.save(str(path))
+            document.close()
+            checksum = hashlib.sha256(path.read_bytes()).hexdigest()
+            return sorted(page["text"].strip() for page in iter_pdf_pages(str(path), checksum, 40))
+        
+        page_cache.clear_local()
+        with ProcessPoolExecutor(max_workers=1) as pool, \
+                patch("app.core.pdf_text.get_process_pool", return_value=pool):
+            assert pages_of("Original")[0] == "Original page 1"
+            assert pages_of("Amended")[0] == "Amended page 1"
+    
+    def test_image_preview_pyramid(self, s3, tmp_path):
+        """Test photos get reduced-resolution previews without upscaling"""
+        from PIL import Image
+        
+        path = tmp_path / "scene.jpg"
+        Image.new("RGB", (3000, 2000), (120, 30, 30)).save(path, "JPEG")
+        
+        result = ingest_exhibit("case-1", {"filename": "scene.jpg", "mime_type": "image/jpeg", "path": str(path)})
+        
+        previews = result["metadata"]["previews"]
+        assert result["metadata"]["width"] == 3000
+        assert [preview["size"] for preview in previews] == [2048, 1024, 512, 256]
+        assert (previews[0]["width"], previews[0]["height"]) == (2048, 1365)
+        with Image.open(io.BytesIO(s3.objects[previews[-1]["s3_key"]])) as thumbnail:
+            assert thumbnail.size == (256, 171)
+    
+    def test_recording_time_joins_case_timeline(self, s3, tmp_path):
+        """Test a video's embedded recording time is a case timeline event until the exhibit is released"""
+        from app.core.timeline_index import load_timeline, store_timeline
+        
+        path = tmp_path / "dashcam.mp4"
+        path.write_bytes(b"\x00" * 64)
+        probed = {"container": "mp4", "creation_time": "2023-03-03T21:14:05Z"}
+        
+        with patch("app.tasks.evidence_ingest.probe_file", return_value=probed):
+            result = ingest_exhibit("case-tl", {"filename": "dashcam.mp4", "mime_type": "video/mp4", "path": str(path)})
+        
+        assert "date_and_time_of_recording" not in result["foundation_requirements"]
+        events = load_timeline("case-tl").range("2023-03-01", "2023-03-31")
+        assert [(event["date"], event["filename"]) for event in events] == [("2023-03-03", "dashcam.mp4")]
+        
+        # A later intake keeps the recording alongside its own events
+        with patch("app.core.timeline_index._timeline_store", ResultCache("timeline-test", "1", redis_url="")), \
+                patch("app.core.timeline_index._revision_store", ResultCache("timeline-revision-test", "1", redis_url="")):
+            store_timeline("case-tl", [{"date": "2023-03-05", "date_text": "March 5, 2023", "source": "case_summary"}])
+            assert [event["source"] for event in load_timeline("case-tl").range()] == ["exhibit", "case_summary"]
+            
+            release_exhibit("case-tl", "dashcam.mp4", result["checksum"])
+            assert [event["source"] for event in load_timeline("case-tl").range()] == ["case_summary"]
+    
+    def test_batch_ingest_bulk_inserts_in_input_order(self, s3, exhibit_table, tmp_path):
+        """Test batches keep input order, isolate failures and insert rows in bulk"""
+        files = []
+        for number in range(5):
+            path = tmp_path / f"doc-{number}.txt"
+            path.write_bytes(f"Deposition excerpt {number}\n".encode())
+            files.append({"filename": path.name, "mime_type": "text/plain", "path": str(path)})
+        files.insert(2, {"filename": "missing.txt", "mime_type": "text/plain", "path": str(tmp_path / "missing.txt")})
+        
+        result = ingest_exhibits_batch("case-1", files, concurrency=3)
+        
+        assert (result["total"], result["succeeded"], result["failed"]) == (6, 5, 1)
+        assert [item["filename"] for item in result["results"]] == [item["filename"] for item in files]
+        assert result["results"][2]["status"] == "error"
+        assert len(exhibit_table.statements) == 1
+        assert sorted(row[1] for row in exhibit_table.statements[0][1]) == ["EX-0001", "EX-0002", "EX-0003", "EX-0004", "EX-0005"]
+    
+    def test_batch_code_collisions_are_item_errors(self, s3, exhibit_table, tmp_path):
+        """Test a requested code already given to other content fails that file instead of replacing a row"""
+        files = []
+        for number in range(3):
+            path = tmp_path / f"doc-{number}.txt"
+            path.write_bytes(f"Deposition excerpt {number}\n".encode())
+            files.append({"filename": path.name, "mime_type": "text/plain", "path": str(path), "code": "EX-A"})
+        files[0]["code"] = "EX-B"
+        
+        result = ingest_exhibits_batch("case-1", files, concurrency=1)
+        
+        sql, _ = exhibit_table.statements[0]
+        assert "ON CONFLICT (case_id, checksum) DO UPDATE" in sql
+        assert [item["status"] for item in result["results"]] == ["ingested", "ingested", "error"]
+        assert "EX-A is already used" in result["results"][2]["error"]
+        assert exhibit_table.case_rows("case-1") == [("EX-A", "doc-1.txt"), ("EX-B", "doc-0.txt")]
+    
+    def test_batches_continue_the_case_code_sequence(self, s3, exhibit_table, tmp_path):
+        """Test a second batch for a case keeps the first batch's rows, and a retry rewrites its own"""
+        def batch(names):
+            files = []
+            for name in names:
+                path = tmp_path / name
+                path.write_bytes(f"Exhibit {name}\n".encode())
+                files.append({"filename": name, "mime_type": "text/plain", "path": str(path)})
+            return files
+        
+        ingest_exhibits_batch("case-1", batch(["a.txt", "b.txt"]), concurrency=1)
+        second = batch(["c.txt", "d.txt"])
+        ingest_exhibits_batch("case-1", second, concurrency=1)
+        retried = ingest_exhibits_batch("case-1", second, concurrency=1)
+        ingest_exhibits_batch("case-2", batch(["e.txt"]), concurrency=1)
+        
+        assert [item["exhibit_code"] for item in retried["results"]] == ["EX-0003", "EX-0004"]
+        assert exhibit_table.case_rows("case-1") == [
+            ("EX-0001", "a.txt"), ("EX-0002", "b.txt"), ("EX-0003", "c.txt"), ("EX-0004", "d.txt"),
+        ]
+        assert exhibit_table.case_rows("case-2") == [("EX-0001", "e.txt")]
+    
+    def test_text_exhibit_gets_redacted_copy(self, s3, tmp_path):
+        """Test text exhibits store a masked copy and span map without touching the original"""
+        content = b"Witness Dana Reyes, SSN 987-65-4321, phone 555-010-9999.\nNothing else.\n"
+        path = tmp_path / "statement.txt"
+        path.write_bytes(content)
+        
+        result = ingest_exhibit("case-1", {
+            "filename": path.name, "mime_type": "text/plain", "path": str(path), "pii_names": ["Dana Reyes"]
+        })
+        
+        redaction = result["redaction"]
+        redacted = s3.objects[redaction["redacted_key"]]
+        spans = json.loads(s3.objects[redaction["spans_key"]])["spans"]
+        assert s3.objects[result["s3_key"]] == content
+        assert len(redacted) == len(content)
+        assert b"Reyes" not in redacted and b"4321" not in redacted and b"9999" not in redacted
+        assert [kind for _, _, kind in spans] == ["name", "ssn", "phone"]
+        assert redaction["span_counts"] == {"name": 1, "ssn": 1, "phone": 1}
+    
+    def test_interrupted_staged_source_resumes_at_last_custody_chunk(self, s3):
+        """Test a dropped stream is reopened at the last whole chunk instead of from the start"""
+        content = bytes(range(256)) * 40
+        s3.objects["staging/upload-2"] = content
+        original_get = s3.get_object
+        
+        def flaky_get(Bucket, Key, Range=None):
+            body = original_get(Bucket, Key, Range)["Body"]
+            if Range:
+                return {"Body": body}
+            
+            class DroppedBody:
+                def read(self, size=-1):
+                    if body.tell() >= 5000:
+                        raise ConnectionResetError("connection reset by peer")
+                    return body.read(min(size, 5000 - body.tell()))
+                
+                def close(self):
+                    body.close()
+            
+            return {"Body": DroppedBody()}
+        
+        with patch.object(settings, "CUSTODY_CHUNK_SIZE", 1024), patch.object(s3, "get_object", flaky_get):
+            result = ingest_exhibit("case-1", {
+                "filename": "clip.bin", "mime_type": "video/mp4", "staged_key": "staging/upload-2"
+            })
+        
+        assert result["checksum"] == hashlib.sha256(content).hexdigest()
+        assert s3.ranges == [("staging/upload-2", None), ("staging/upload-2", "bytes=4096-")]
+        assert result["custody_checksum"] == MerkleTree(1024, len(content), b"".join(
+            leaf_hash(content[offset:offset + 1024]) for offset in range(0, len(content), 1024)
+        )).hexroot
+    
+    def test_verify_range_reads_only_touched_chunks(self, s3, tmp_path):
+        """Test range verification fetches the overlapping chunks and pinpoints tampering"""
+        content = bytes(range(256)) * 40
+        path = tmp_path / "bodycam.mp4"
+        path.write_bytes(content)
+        
+        with patch.object(settings, "CUSTODY_CHUNK_SIZE", 1024):
+            result = ingest_exhibit("case-1", {"filename": path.name, "mime_type": "video/mp4", "path": str(path)})
+        
+        intact = verify_exhibit_range(result["checksum"], 2100, 2200)
+        assert intact["verified"] and intact["chunks_checked"] == 1
+        assert s3.ranges[-1] == (result["s3_key"], "bytes=2048-3071")
+        
+        tampered = bytearray(content)
+        tampered[5000] ^= 0xFF
+        s3.objects[result["s3_key"]] = bytes(tampered)
+        
+        report = verify_exhibit_range(result["checksum"])
+        assert not report["verified"]
+        assert report["tampered_chunks"] == [4]
+        assert report["custody_root"] == result["custody_checksum"]
+    
+    def test_export_upload_is_signed(self, s3):
+        """Test exports go through the shared storage client and come back signed"""
+        from app.tasks.exporter import upload_and_sign_url
+        
+        url = upload_and_sign_url(b"bundle", {"case_id": "case-1", "export_id": "exp-1", "format": "zip"})
+        
+        assert s3.objects["exports/exp-1/trial-bundle.zip"] == b"bundle"
+        assert "exports/exp-1/trial-bundle.zip" in url
@@ -0,0 +1,279 @@
+import asyncio
+import hashlib
+import os
+import threading
+import time
+import pytest
+from unittest.mock import patch
+
+# Orchestrator modules; skipped when the suite runs against the workers' app package
+exhibit_cache = pytest.importorskip("app.core.exhibit_cache")
+range_response = pytest.importorskip("app.core.range_response")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api.v1.endpoints import cases, exhibits
+from app.core.exhibit_cache import ExhibitCache
+from app.core.range_response import RangeFileResponse, RangeNotSatisfiable, ZEROCOPY_EXTENSION, parse_byte_range
+
+
+CONTENT = {
+    name: content
+    for name, content in (
+        ("clip", bytes(range(256)) * 40),
+        ("memo", b"Memorandum of understanding\n" * 3),
+        ("photo", b"\x89PNG" + b"\x00" * 60),
+    )
+}
+CHECKSUMS = {name: hashlib.sha256(content).hexdigest() for name, content in CONTENT.items()}
+BLOBS = {CHECKSUMS[name]: content for name, content in CONTENT.items()}
+
+
+class FakeBlobSource:
+    """Blob downloads that count calls and can be held open"""
+    
+    def __init__(self):
+        self.calls = []
+        self.release = threading.Event()
+        self.release.set()
+    
+    def __call__(self, checksum, path):
+        self.calls.append(checksum)
+        if checksum not in BLOBS:
+            raise LookupError(f"Unknown exhibit {checksum}")
+        self.release.wait(5)
+        with open(path, "wb") as handle:
+            handle.write(BLOBS[checksum])
+        return {"s3_key": f"blobs/{checksum}", "mime_type": "application/octet-stream"}
+
+
+def serve(response, extensions=None):
+    """Run an ASGI response and collect what it sends"""
+    messages = []
+
+    async def receive():
+        return {"type": "http.request"}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(response({"type": "http", "extensions": extensions or {}}, receive, send))
+    return messages
+
+
+def body_of(messages):
+    return b"".join(message.get("body", b"") for message in messages[1:])
+
+
+@pytest.fixture
+def source():
+    return FakeBlobSource()
+
+
+@pytest.fixture
+def cache(tmp_path, source):
+    return ExhibitCache(str(tmp_path / "cache"), 10 ** 6, fetch=source)
+
+
+@pytest.fixture
+def client(cache):
+    app = FastAPI()
+    app.include_router(exhibits.router, prefix="/exhibits")
+    app.include_router(cases.router, prefix="/cases")
+    with patch.object(exhibits, "get_exhibit_cache", lambda: cache), \
+            patch.object(cases, "get_exhibit_cache", lambda: cache):
+        yield TestClient(app)
+
+
+class TestByteRanges:
+    
+    @pytest.mark.parametrize("header, expected", [
+        (None, None),
+        ("bytes=0-99", (0, 100)),
+        ("bytes=100-", (100, 1000)),
+        ("bytes=990-2000", (990, 1000)),
+        ("bytes=-10", (990, 1000)),
+        ("bytes=-5000", (0, 1000)),
+        ("bytes=5-2", None),
+        ("bytes=0-1,5-9", None),
+        ("items=0-9", None),
+        ("bytes=-", None),
+        ("bytes=a-9", None),
+    ])
+    def test_parse_byte_range(self, header, expected):
+        """Test open, suffix and clamped ranges, with malformed and multi-range headers sending everything"""
+        assert parse_byte_range(header, 1000) == expected
+    
+    @pytest.mark.parametrize("header, size", [("bytes=1000-", 1000), ("bytes=-0", 1000), ("bytes=-10", 0)])
+    def test_unsatisfiable_ranges(self, header, size):
+        """Test ranges starting past the end, or empty suffixes, are refused"""
+        with pytest.raises(RangeNotSatisfiable):
+            parse_byte_range(header, size)
+    
+    def test_partial_response_headers_and_chunks(self, tmp_path):
+        """Test a range streams in chunks with 206 headers and closes the file"""
+        path = tmp_path / "clip"
+        path.write_bytes(CONTENT["clip"])
+        handle = open(path, "rb")
+        response = RangeFileResponse(handle, len(CONTENT["clip"]), "video/mp4", (100, 5000))
+        response.chunk_size = 1024
+        
+        messages = serve(response)
+        
+        headers = dict(messages[0]["headers"])
+        assert messages[0]["status"] == 206
+        assert headers[b"content-range"] == b"bytes 100-4999/10240"
+        assert headers[b"content-length"] == b"4900"
+        assert headers[b"accept-ranges"] == b"bytes"
+        assert len(messages) == 6
+        assert body_of(messages) == CONTENT["clip"][100:5000]
+        assert messages[-1]["more_body"] is False
+        assert handle.closed
+    
+    def test_head_and_zero_copy(self, tmp_path):
+        """Test HEAD sends headers only and servers with zero-copy get the descriptor instead of chunks"""
+        path = tmp_path / "memo"
+        path.write_bytes(CONTENT["memo"])
+        size = len(CONTENT["memo"])
+        
+        head = serve(RangeFileResponse(open(path, "rb"), size, "text/plain", method="HEAD"))
+        assert head[0]["status"] == 200
+        assert dict(head[0]["headers"])[b"content-length"] == str(size).encode()
+        assert body_of(head) == b""
+        
+        handle = open(path, "rb")
+        sent = serve(RangeFileResponse(handle, size, "text/plain", (10, 20)), {ZEROCOPY_EXTENSION: {}})
+        assert sent[1]["type"] == ZEROCOPY_EXTENSION
+        assert (sent[1]["file"], sent[1]["offset"], sent[1]["count"]) == (handle, 10, 10)
+    
+    def test_file_shorter_than_recorded_ends_the_body(self, tmp_path):
+        """Test the chunked fallback finishes the response when the file runs out early"""
+        path = tmp_path / "memo"
+        path.write_bytes(CONTENT["memo"])
+        
+        messages = serve(RangeFileResponse(open(path, "rb"), 1000, "text/plain"))
+        
+        assert body_of(messages) == CONTENT["memo"]
+        assert messages[-1] == {"type": "http.response.body", "body": b"", "more_body": False}
+
+
+class TestExhibitCache:
+    
+    def test_concurrent_misses_share_one_download(self, cache, source):
+        """Test callers missing the same exhibit at once await a single download"""
+        checksum = CHECKSUMS["clip"]
+        source.release.clear()
+        
+        async def main():
+            waiting = [asyncio.ensure_future(cache.fetch(checksum)) for _ in range(5)]
+            await asyncio.sleep(0.05)
+            source.release.set()
+            return await asyncio.gather(*waiting)
+        
+        entries = asyncio.run(main())
+        
+        assert source.calls == [checksum]
+        assert {entry.path for entry in entries} == {cache._path(checksum)}
+        assert entries[0].size_bytes == len(CONTENT["clip"])
+    
+    def test_least_recently_opened_is_evicted(self, tmp_path, source):
+        """Test the byte budget evicts the exhibit opened longest ago and unlinks its file"""
+        budget = len(CONTENT["clip"]) + len(CONTENT["memo"])
+        cache = ExhibitCache(str(tmp_path / "cache"), budget, fetch=source)
+        
+        async def open_closed(name):
+            handle, entry = await cache.open(CHECKSUMS[name])
+            handle.close()
+            return entry
+        
+        async def main():
+            clip = await open_closed("clip")
+            await open_closed("memo")
+            await open_closed("clip")
+            await open_closed("photo")
+            return clip
+        
+        clip = asyncio.run(main())
+        
+        assert CHECKSUMS["memo"] not in cache
+        assert CHECKSUMS["clip"] in cache and CHECKSUMS["photo"] in cache
+        assert cache.size_bytes == len(CONTENT["clip"]) + len(CONTENT["photo"])
+        assert os.path.exists(clip.path)
+        assert not os.path.exists(cache._path(CHECKSUMS["memo"]))
+    
+    def test_unknown_and_malformed_checksums(self, cache, source):
+        """Test malformed checksums never reach storage and unknown ones raise LookupError"""
+        with pytest.raises(LookupError):
+            asyncio.run(cache.fetch("../etc/passwd"))
+        with pytest.raises(LookupError):
+            asyncio.run(cache.fetch("0" * 64))
+        
+        assert source.calls == ["0" * 64]
+    
+    def test_restart_adopts_files_and_spares_live_partial_downloads(self, tmp_path, source):
+        """Test a new process indexes cached exhibits and removes only partial downloads that went stale"""
+        directory = tmp_path / "cache"
+        asyncio.run(ExhibitCache(str(directory), 10 ** 6, fetch=source).fetch(CHECKSUMS["memo"]))
+        shard = directory / CHECKSUMS["clip"][:2]
+        shard.mkdir(exist_ok=True)
+        live = shard / f"{CHECKSUMS['clip']}.1111.part"
+        stale = shard / f"{CHECKSUMS['clip']}.2222.part"
+        live.write_bytes(b"in flight")
+        stale.write_bytes(b"abandoned")
+        old = time.time() - 7200
+        os.utime(stale, (old, old))
+        
+        restarted = ExhibitCache(str(directory), 10 ** 6, fetch=source, stale_part_seconds=3600)
+        
+        assert CHECKSUMS["memo"] in restarted
+        assert restarted.size_bytes == len(CONTENT["memo"])
+        assert live.exists() and not stale.exists()
+    
+    def test_prefetch_counts_failures(self, cache, source):
+        """Test prefetching downloads what it can and counts the rest"""
+        result = asyncio.run(cache.prefetch([CHECKSUMS["clip"], CHECKSUMS["photo"], "f" * 64], concurrency=2))
+        
+        assert result == {"cached": 2, "failed": 1}
+        assert CHECKSUMS["clip"] in cache and CHECKSUMS["photo"] in cache
+
+
+class TestExhibitEndpoints:
+    
+    def test_get_whole_and_partial_exhibit(self, client):
+        """Test full and ranged GETs, HEAD and revalidation of an exhibit"""
+        checksum = CHECKSUMS["clip"]
+        
+        whole = client.get(f"/exhibits/{checksum}")
+        assert whole.status_code == 200
+        assert whole.content == CONTENT["clip"]
+        assert whole.headers["etag"] == f'"{checksum}"'
+        
+        partial = client.get(f"/exhibits/{checksum}", headers={"Range": "bytes=-16"})
+        assert partial.status_code == 206
+        assert partial.content == CONTENT["clip"][-16:]
+        assert partial.headers["content-range"] == "bytes 10224-10239/10240"
+        
+        head = client.head(f"/exhibits/{checksum}")
+        assert head.status_code == 200 and head.content == b""
+        
+        assert client.get(f"/exhibits/{checksum}", headers={"If-None-Match": f'"{checksum}"'}).status_code == 304
+    
+    def test_missing_exhibit_and_unsatisfiable_range(self, client):
+        """Test unknown exhibits are 404 and ranges past the end are 416 with the size"""
+        assert client.get(f"/exhibits/{'e' * 64}").status_code == 404
+        
+        response = client.get(f"/exhibits/{CHECKSUMS['memo']}", headers={"Range": "bytes=5000-"})
+        assert response.status_code == 416
+        assert response.headers["content-range"] == f"bytes */{len(CONTENT['memo'])}"
+    
+    def test_start_trial_prefetches_case_exhibits(self, client, cache, source):
+        """Test starting a trial warms the cache with the case's exhibits"""
+        case = client.post("/cases/", json={"title": "State v. Doe", "case_type": "criminal"}).json()
+        client.post(f"/cases/{case['id']}/complete-intake")
+        
+        with patch("app.core.exhibit_cache.case_exhibit_checksums", return_value=[CHECKSUMS["memo"], CHECKSUMS["photo"]]):
+            response = client.post(f"/cases/{case['id']}/start-trial")
+        
+        assert response.json()["status"] == "trial"
+        assert sorted(source.calls) == sorted([CHECKSUMS["memo"], CHECKSUMS["photo"]])
+        assert CHECKSUMS["memo"] in cache and CHECKSUMS["photo"] in cache
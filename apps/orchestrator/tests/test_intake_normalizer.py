@@ -1,10 +1,22 @@
+import threading
 import pytest
+from datetime import datetime
 from unittest.mock import patch
+from app.core.cache import ResultCache
+from app.core.timeline_index import TimelineIndex
 from app.tasks.intake_normalizer import (
+    intake_cache_key,
+    normalize_case,
+    normalize_case_cached,
+    normalize_incremental,
     normalize_intake,
+    normalize_intake_batch,
     parse_counts,
+    scan_charges,
     parse_parties,
     parse_witnesses,
+    parse_timeline,
+    scan_entities,
     get_criminal_elements,
     get_civil_elements
 )
@@ -46,6 +58,41 @@ class TestIntakeNormalizer:
             assert "burden" in count
             assert count["burden"] == "preponderance"
     
+    def test_scan_charges_reports_spans(self):
+        """Test the compiled charge scanner reports every hit with its span"""
+        summary = "He STOLE a car, then a stolen bike, and later assaulted a clerk"
+        
+        hits = scan_charges(summary, "criminal")
+        
+        assert [summary[start:end] for start, end in hits[0]] == ["STOLE", "stolen"]
+        assert [summary[start:end] for start, end in hits[1]] == ["assault"]
+        assert scan_charges(summary, "unknown") == {}
+        
+        counts = parse_counts(summary, "criminal")
+        assert [count["label"] for count in counts] == ["Theft", "Assault"]
+        assert counts[0]["spans"] == hits[0]
+    
+    @pytest.mark.parametrize("summary", [
+        "The newsletter repeated the slander",
+        "THE NEWSLETTER REPEATED THE SLANDER İN PRİNT",
+    ])
+    def test_scan_charges_finds_terms_inside_other_matches(self, summary):
+        """Test a term inside another entry's match is found, as a search per catalog entry would"""
+        hits = scan_charges(summary, "civil")
+        
+        assert [summary[start:end].lower() for start, end in hits[2]] == ["slander"]
+        assert [summary[start:end].lower() for start, end in hits[3]] == ["land"]
+    
+    def test_scan_charges_finds_terms_overlapping_other_matches(self):
+        """Test a term running on from another entry's match is found, and nested spans are reported once"""
+        summary = "assaultheft, then slander and slander"
+        
+        hits = scan_charges(summary, "criminal")
+        
+        assert [summary[start:end] for start, end in hits[1]] == ["assault"]
+        assert [summary[start:end] for start, end in hits[0]] == ["theft"]
+        assert scan_charges(summary, "civil")[3] == [[19, 23], [31, 35]]
+    
     def test_parse_parties_criminal(self):
         """Test parsing parties for criminal case"""
         summary = "John Smith was charged with theft. The prosecutor is Jane Doe."
@@ -80,6 +127,53 @@ class TestIntakeNormalizer:
             assert "role" in witness
             assert "credibility_notes" in witness
     
+    def test_parse_witnesses_sentence_initial_cue(self):
+        """Test a capitalized cue word opening a sentence is not read as a first name"""
+        summary = "Witness Sarah Wilson described the scene. Later, the defendant left."
+        assert [witness["name"] for witness in parse_witnesses(summary)] == ["Sarah Wilson"]
+        
+        summary = "The officer spoke. Witnesses Tom Brown and Amy Green were present."
+        assert [witness["name"] for witness in parse_witnesses(summary)] == ["Tom Brown", "Amy Green"]
+    
+    def test_scan_entities_single_pass(self):
+        """Test the entity scanner feeds parties, timeline and witnesses consistently"""
+        summary = (
+            "On March 3, 2023 Mary Johnson sued Bob Wilson. Sarah Lee testified "
+            "that she saw the crash. Sarah Lee was deposed on 04/05/2023."
+        )
+        
+        spans = scan_entities(summary)
+        
+        assert [span.kind for span in spans][:3] == ["date", "name", "name"]
+        assert all(summary[span.start:span.end] == span.text for span in spans)
+        
+        parties = parse_parties(summary, "civil", spans)
+        assert [party["name"] for party in parties] == ["Mary Johnson", "Bob Wilson"]
+        assert parse_parties(summary, "civil") == parties
+        
+        dates = [event["date_text"] for event in parse_timeline(summary, spans)]
+        assert dates == ["March 3, 2023", "04/05/2023"]
+        
+        witnesses = parse_witnesses(summary, spans)
+        assert [witness["name"] for witness in witnesses] == ["Mary Johnson", "Bob Wilson", "Sarah Lee"]
+    
+    def test_parse_timeline_normalizes_and_sorts(self):
+        """Test timeline events get ISO dates, sentence context and date order"""
+        summary = (
+            "Police arrived on 2023-06-01. On March 3, 2023 John Smith bought a gun. "
+            "The lease was signed 13/45/2022."
+        )
+        
+        timeline = parse_timeline(summary)
+        
+        assert [event["date"] for event in timeline] == ["2023-03-03", "2023-06-01", None]
+        assert timeline[0]["description"] == "On March 3, 2023 John Smith bought a gun."
+        
+        index = TimelineIndex(timeline)
+        assert [event["date"] for event in index.range("2023-04-01", None)] == ["2023-06-01"]
+        assert index.nearest("2023-05-20")[0]["date"] == "2023-06-01"
+        assert [event["date"] for event in index.nearest("2023-03-01", limit=2)] == ["2023-03-03", "2023-06-01"]
+    
     def test_get_criminal_elements(self):
         """Test getting criminal elements"""
         elements = get_criminal_elements("Theft")
@@ -88,6 +182,23 @@ class TestIntakeNormalizer:
         assert isinstance(elements["elements"], list)
         assert len(elements["elements"]) > 0
     
+    def test_catalog_is_immutable_and_jurisdiction_aware(self):
+        """Test the element catalog is shared read-only with precomputed descriptions"""
+        from app.core.catalog import get_catalog
+        
+        catalog = get_catalog("Nowhere County")
+        
+        assert catalog is get_catalog(None)
+        assert [entry.name for entry in catalog.charge("criminal", "Theft").elements][0] == "taking"
+        assert catalog.charge("civil", "Trespass").elements[0].name == "general_elements"
+        assert catalog.describe("intent_to_deprive") == "Element: Intent To Deprive"
+        with pytest.raises(TypeError):
+            catalog.charges["criminal"]["Theft"] = None
+        
+        elements = get_criminal_elements("Theft")
+        elements["elements"].append("mutated")
+        assert "mutated" not in get_criminal_elements("Theft")["elements"]
+    
     def test_get_civil_elements(self):
         """Test getting civil elements"""
         elements = get_civil_elements("Breach of Contract")
@@ -121,3 +232,130 @@ class TestIntakeNormalizer:
         assert "parties" in result
         assert "witnesses" in result
         assert "exhibits" in result
+    
+    def test_normalize_intake_batch_reports_item_errors(self):
+        """Test batch normalization keeps input order and isolates bad items"""
+        lines = [
+            '{"id": "case-1", "summary": "John Smith stole a car", "case_type": "criminal"}',
+            '{"id": "case-2", "summary": broken',
+            '["not", "an", "object"]',
+            '{"id": "case-4", "summary": "Mary Johnson breached the contract", "case_type": "civil"}',
+        ]
+        
+        result = normalize_intake_batch("\n".join(lines), chunk_size=2)
+        
+        assert result["total"] == 4
+        assert result["succeeded"] == 2
+        assert result["failed"] == 2
+        assert [item["index"] for item in result["results"]] == [0, 1, 2, 3]
+        assert [item["status"] for item in result["results"]] == ["normalized", "error", "error", "normalized"]
+        assert result["results"][3]["result"]["case_id"] == "case-4"
+        assert "line 2" in result["results"][1]["error"]
+    
+    def test_normalize_intake_batch_splits_on_newlines_only(self):
+        """Test Unicode line separators inside JSON strings do not split a record"""
+        lines = [
+            '{"id": "case-1", "summary": "John Smith stole a car\u2028on 2023-03-01", "case_type": "criminal"}',
+            '{"id": "case-2", "summary": "Mary Johnson breached\u2029the contract\u0085", "case_type": "civil"}',
+        ]
+        
+        result = normalize_intake_batch("\r\n".join(lines) + "\r\n")
+        
+        assert result["total"] == 2
+        assert result["failed"] == 0
+        assert [item["result"]["case_id"] for item in result["results"]] == ["case-1", "case-2"]
+    
+    def test_normalize_intake_cache_reuses_results(self):
+        """Test repeat intakes are served from cache and a version bump invalidates them"""
+        cache = ResultCache("intake-test", "v1", max_entries=2, redis_url="")
+        case_data = {"id": "case-1", "summary": "John Smith stole a car", "case_type": "criminal"}
+        
+        with patch("app.tasks.intake_normalizer.intake_cache", cache):
+            first = normalize_case_cached(case_data)
+            second = normalize_case_cached(dict(case_data, id="case-2"))
+            
+            assert second["counts"] == first["counts"]
+            assert second["case_id"] == "case-2"
+            assert cache.stats()["local_hits"] == 1
+            
+            cache.set_version("v2")
+            assert cache.get(intake_cache_key(case_data)) is None
+        
+        assert intake_cache_key(case_data) != intake_cache_key(dict(case_data, case_type="civil"))
+    
+    def test_cache_hit_is_stamped_when_served(self):
+        """Test a cached intake reports when it was served, not when it was first normalized"""
+        cache = ResultCache("intake-test", "v1", redis_url="")
+        case_data = {"id": "case-1", "summary": "John Smith stole a car", "case_type": "criminal"}
+        
+        with patch("app.tasks.intake_normalizer.intake_cache", cache):
+            with patch("app.tasks.intake_normalizer.datetime") as clock:
+                clock.utcnow.return_value = datetime(2024, 1, 1, 9, 0)
+                first = normalize_case_cached(case_data)
+                clock.utcnow.return_value = datetime(2024, 1, 2, 9, 0)
+                second = normalize_case_cached(case_data)
+        
+        assert first["normalized_at"] == "2024-01-01T09:00:00"
+        assert second["normalized_at"] == "2024-01-02T09:00:00"
+        assert cache.stats()["local_hits"] == 1
+    
+    def test_cache_stats_are_exact_across_threads(self):
+        """Test hit and miss counters lose no updates when worker threads share a cache"""
+        cache = ResultCache("intake-test", "v1", max_entries=0, redis_url="")
+        
+        def look_up(worker):
+            for attempt in range(2000):
+                cache.get(f"{worker}-{attempt}")
+        
+        threads = [threading.Thread(target=look_up, args=(worker,)) for worker in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert cache.stats()["misses"] == 16000
+    
+    def test_repeat_intake_does_not_republish_case_tables(self):
+        """Test a cache hit for a case already published skips rewriting its timeline and names"""
+        cache = ResultCache("intake-test", "v1", redis_url="")
+        published = ResultCache("intake-published-test", "v1", redis_url="")
+        case_data = {"id": "case-1", "summary": "John Smith stole a car on 2023-03-01", "case_type": "criminal"}
+        
+        with patch("app.tasks.intake_normalizer.intake_cache", cache), \
+                patch("app.tasks.intake_normalizer.published_intakes", published), \
+                patch("app.tasks.intake_normalizer.store_timeline") as store_timeline, \
+                patch("app.tasks.intake_normalizer.store_case_names") as store_case_names:
+            normalize_case_cached(case_data)
+            normalize_case_cached(case_data)
+            normalize_case_cached(dict(case_data, id="case-2"))
+        
+        assert [call.args[0] for call in store_timeline.call_args_list] == ["case-1", "case-2"]
+        assert store_case_names.call_count == 2
+    
+    def test_normalize_incremental_returns_delta(self):
+        """Test incremental intake matches a full parse and returns only the changes"""
+        paragraphs = [
+            "John Smith stole a laptop on March 3, 2023.",
+            "Sarah Wilson testified that she saw him leave.",
+            "The laptop was never recovered.",
+        ]
+        case_data = {"id": "case-inc", "summary": "\n\n".join(paragraphs), "case_type": "criminal"}
+        state = ResultCache("intake-state-test", "v1", redis_url="")
+        
+        with patch("app.tasks.intake_normalizer.intake_state_cache", state), \
+                patch("app.tasks.intake_normalizer.paragraph_cache", ResultCache("p", "v1", redis_url="")):
+            first = normalize_incremental(case_data)
+            
+            assert first["full"] is True
+            full = normalize_case(case_data)
+            for section in ("counts", "parties", "timeline", "witnesses"):
+                assert first["result"][section] == full[section]
+            
+            paragraphs[2] = "Michael Chen observed the defendant assault a guard."
+            edited = dict(case_data, summary="\n\n".join(paragraphs))
+            delta = normalize_incremental(edited, first["revision"])
+        
+        assert delta["full"] is False
+        assert delta["paragraphs"]["changed"] == [2]
+        assert [count["label"] for count in delta["changes"]["counts"]["added"]] == ["Assault"]
+        assert [witness["name"] for witness in delta["changes"]["witnesses"]["added"]] == ["Michael Chen"]
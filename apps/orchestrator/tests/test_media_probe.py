@@ -0,0 +1,150 @@
+import io
+import struct
+import pytest
+from unittest.mock import patch
+from app.core.media_probe import FileReader, ObjectReader, probe_file, probe_media
+
+
+def atom(kind, body):
+    return struct.pack(">I4s", 8 + len(body), kind) + body
+
+
+def track(handler, sample_entry):
+    return atom(b"trak", atom(b"tkhd", b"\x00" * 76 + struct.pack(">II", 1280 << 16, 720 << 16)) + atom(b"mdia",
+        atom(b"mdhd", b"\x00" * 4 + struct.pack(">IIII", 0, 0, 48000, 48000 * 90) + b"\x00" * 4)
+        + atom(b"hdlr", b"\x00" * 8 + handler + b"\x00" * 13)
+        + atom(b"minf", atom(b"stbl", atom(b"stsd", struct.pack(">II", 0, 1) + sample_entry) + atom(b"stsz", b"\x00" * 400_000)))
+    ))
+
+
+def movie_header(brand=b"isom"):
+    video = atom(b"avc1", b"\x00" * 6 + b"\x00\x01" + b"\x00" * 16 + struct.pack(">HH", 1920, 1080) + b"\x00" * 50)
+    audio = atom(b"mp4a", b"\x00" * 6 + b"\x00\x01" + b"\x00" * 8 + struct.pack(">HHHHI", 2, 16, 0, 0, 48000 << 16))
+    # 2023-03-03T21:14:05Z in seconds since 1904
+    created = 3760722845
+    moov = atom(b"moov",
+        atom(b"mvhd", b"\x00" * 4 + struct.pack(">IIII", created, created, 1000, 90_500) + b"\x00" * 80)
+        + track(b"vide", video) + track(b"soun", audio)
+    )
+    return atom(b"ftyp", brand + b"\x00\x00\x02\x00" + b"isommp41"), moov
+
+
+class SparseObject:
+    """Ranged GETs over a large object that is zeros except for a few pieces"""
+    
+    def __init__(self, size, pieces):
+        self.size = size
+        self.pieces = pieces
+        self.ranges = []
+    
+    def open_object(self, key, byte_range=None):
+        self.ranges.append(byte_range)
+        first, _, last = byte_range[len("bytes="):].partition("-")
+        start, end = int(first), int(last) + 1
+        data = bytearray(end - start)
+        for offset, piece in self.pieces:
+            low, high = max(start, offset), min(end, offset + len(piece))
+            if low < high:
+                data[low - start:high - start] = piece[low - offset:high - offset]
+        return io.BytesIO(bytes(data))
+
+
+def mp3_frames(count, first=b""):
+    # MPEG-1 layer III, 128 kbit/s, 44.1 kHz, stereo: 417-byte frames
+    frame = b"\xff\xfb\x90\x00"
+    frames = [frame + first.ljust(413, b"\x00")] if first else []
+    return b"".join(frames + [frame + b"\x00" * 413] * count)
+
+
+class TestMediaProbe:
+    
+    def test_mp4_with_trailing_movie_header_over_ranged_gets(self):
+        """Test a 4 GB video with moov after mdat is probed in a few small range requests"""
+        ftyp, moov = movie_header()
+        mdat_size = 4 * 1024 ** 3
+        mdat_header = struct.pack(">I4sQ", 1, b"mdat", mdat_size)
+        size = len(ftyp) + mdat_size + len(moov)
+        remote = SparseObject(size, [(0, ftyp + mdat_header), (len(ftyp) + mdat_size, moov)])
+        
+        reader = ObjectReader("blobs/video", size)
+        with patch("app.core.storage.open_object", remote.open_object):
+            metadata = probe_media(reader)
+        
+        assert metadata == {
+            "container": "mp4",
+            "duration_seconds": 90.5,
+            "creation_time": "2023-03-03T21:14:05Z",
+            "video_codec": "avc1",
+            "width": 1920,
+            "height": 1080,
+            "audio_codec": "mp4a",
+            "sample_rate": 48000,
+            "channels": 2,
+        }
+        assert reader.requests <= 3
+        assert reader.bytes_read < len(moov) + 3 * reader.block_size
+    
+    def test_quicktime_brand_from_local_file(self, tmp_path):
+        """Test a local MOV is read with seeks and labelled by its brand"""
+        ftyp, moov = movie_header(b"qt  ")
+        path = tmp_path / "interview.mov"
+        path.write_bytes(ftyp + atom(b"mdat", b"\x00" * 100_000) + moov)
+        
+        with open(path, "rb") as handle:
+            reader = FileReader(handle, path.stat().st_size)
+            metadata = probe_media(reader)
+        
+        assert metadata["container"] == "mov" and metadata["width"] == 1920
+        assert reader.bytes_read < 2000
+    
+    def test_wav_duration_and_broadcast_time(self, tmp_path):
+        """Test WAV duration comes from the data size and recording time from bext"""
+        fmt = b"fmt " + struct.pack("<I", 16) + struct.pack("<HHIIHH", 1, 2, 48000, 192000, 4, 16)
+        bext_body = b"\x00" * 320 + b"2023-03-03" + b"21:14:05" + b"\x00" * 274
+        bext = b"bext" + struct.pack("<I", len(bext_body)) + bext_body
+        data = b"data" + struct.pack("<I", 192000 * 3) + b"\x00" * (192000 * 3)
+        body = b"WAVE" + fmt + bext + data
+        path = tmp_path / "dispatch.wav"
+        path.write_bytes(b"RIFF" + struct.pack("<I", len(body)) + body)
+        
+        assert probe_file(str(path)) == {
+            "container": "wav",
+            "audio_codec": "pcm",
+            "channels": 2,
+            "sample_rate": 48000,
+            "bitrate": 1536000,
+            "creation_time": "2023-03-03T21:14:05",
+            "duration_seconds": 3.0,
+        }
+    
+    def test_mp3_duration_from_xing_header(self, tmp_path):
+        """Test a VBR MP3 is timed from the frame count in its Xing header"""
+        path = tmp_path / "call.mp3"
+        path.write_bytes(mp3_frames(5, first=b"\x00" * 32 + b"Xing" + struct.pack(">II", 1, 1000)))
+        
+        metadata = probe_file(str(path))
+        
+        assert metadata["duration_seconds"] == round(1000 * 1152 / 44100, 3)
+        assert metadata["audio_codec"] == "mp3" and "bitrate" not in metadata
+    
+    def test_mp3_constant_bitrate_after_id3_tag(self, tmp_path):
+        """Test the ID3 tag is skipped, its recording time kept, and CBR duration derived"""
+        text = b"\x032023-03-03T21:14"
+        frame = b"TDRC" + struct.pack(">I", len(text)) + b"\x00\x00" + text
+        tag = b"ID3\x04\x00\x00" + bytes([0, 0, 0, len(frame)]) + frame
+        path = tmp_path / "voicemail.mp3"
+        path.write_bytes(tag + mp3_frames(100) + b"TAG" + b"\x00" * 125)
+        
+        metadata = probe_file(str(path))
+        
+        assert metadata["creation_time"] == "2023-03-03T21:14"
+        assert metadata["bitrate"] == 128000 and metadata["channels"] == 2
+        assert metadata["duration_seconds"] == round(100 * 417 * 8 / 128000, 3)
+    
+    def test_unknown_container_is_rejected(self, tmp_path):
+        """Test bytes that are no supported container raise instead of guessing"""
+        path = tmp_path / "clip.avi"
+        path.write_bytes(bytes(range(256)) * 4)
+        
+        with pytest.raises(ValueError):
+            probe_file(str(path))
@@ -0,0 +1,50 @@
+import random
+import pytest
+from app.core.merkle import MerkleHasher, MerkleTree
+
+
+class TestMerkle:
+    
+    def test_root_does_not_depend_on_slicing(self):
+        """Test the same bytes give the same tree however they are fed in"""
+        data = random.Random(5).randbytes(10_000)
+        whole = MerkleHasher(1000)
+        whole.update(data)
+        
+        sliced = MerkleHasher(1000)
+        offset = 0
+        for size in [1, 999, 1, 2500, 37, 6462]:
+            sliced.update(data[offset:offset + size])
+            offset += size
+        
+        assert sliced.finish().root == whole.finish().root
+        assert len(whole.finish()) == 10
+    
+    def test_rewind_drops_partial_chunk(self):
+        """Test rewinding to a chunk boundary and refeeding reproduces the tree"""
+        data = bytes(range(256)) * 20
+        expected = MerkleHasher(512)
+        expected.update(data)
+        
+        hasher = MerkleHasher(512)
+        hasher.update(data[:1300])
+        hasher.rewind(1024)
+        hasher.update(data[1024:])
+        
+        assert hasher.finish().root == expected.finish().root
+        with pytest.raises(ValueError):
+            hasher.rewind(100)
+    
+    def test_sidecar_roundtrip(self):
+        """Test the sidecar restores the tree and rejects a truncated copy"""
+        hasher = MerkleHasher(256)
+        hasher.update(b"x" * 1000)
+        tree = hasher.finish()
+        sidecar = tree.to_sidecar()
+        
+        restored = MerkleTree.from_sidecar(sidecar)
+        
+        assert restored.root == tree.root and restored.size_bytes == 1000
+        assert list(restored.chunk_range(200, 600)) == [0, 1, 2]
+        with pytest.raises(ValueError):
+            MerkleTree.from_sidecar(sidecar[:-32])
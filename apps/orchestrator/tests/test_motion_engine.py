@@ -0,0 +1,61 @@
+from unittest.mock import patch
+from app.tasks.motion_engine import (
+    MOTION_CHUNK_SIZE,
+    MOTION_INLINE_LIMIT,
+    batch_process_motions,
+    merge_motion_rulings,
+    motion_batch_signature,
+    process_motion,
+    process_motion_chunk,
+)
+
+
+def docket(size):
+    kinds = [
+        ("suppress", "The warrantless search was unreasonable"),
+        ("limine", "Prior bad act evidence"),
+        ("sever", "Same transaction and common scheme"),
+        ("summary_judgment", "No genuine issue of material fact"),
+    ]
+    return [
+        {"id": f"m-{index}", "kind": kinds[index % 4][0], "arguments": kinds[index % 4][1], "filed_by": "defense"}
+        for index in range(size)
+    ]
+
+
+class TestMotionEngine:
+    
+    def test_small_batch_is_ruled_in_process(self):
+        """Test a pretrial docket is ruled on in one pass, in order, without dispatching subtasks"""
+        motions = docket(40)
+        
+        with patch.object(process_motion, "apply_async") as apply_async:
+            results = batch_process_motions("case-1", motions)
+        
+        apply_async.assert_not_called()
+        assert [result["motion_id"] for result in results] == [motion["id"] for motion in motions]
+        assert [result["status"] for result in results[:4]] == ["granted", "granted", "denied", "granted"]
+        assert results[0]["ruling"] == "Motion to suppress GRANTED"
+    
+    def test_large_batch_replaces_itself_with_chord(self):
+        """Test a large batch hands its result to a chord of chunked subtasks instead of waiting"""
+        motions = docket(MOTION_INLINE_LIMIT + 1)
+        
+        with patch.object(batch_process_motions, "replace", side_effect=lambda signature: signature) as replace:
+            signature = batch_process_motions("case-1", motions)
+        
+        replace.assert_called_once()
+        chunks = [task.args[1] for task in signature.tasks]
+        assert [len(chunk) for chunk in chunks] == [MOTION_CHUNK_SIZE, MOTION_CHUNK_SIZE, 1]
+        assert [motion for chunk in chunks for motion in chunk] == motions
+        assert signature.body.task == merge_motion_rulings.name
+    
+    def test_merge_keeps_chunk_order(self):
+        """Test merged rulings come back in the original docket order"""
+        signature = motion_batch_signature("case-1", docket(250))
+        chunks = [process_motion_chunk(*task.args) for task in signature.tasks]
+        
+        merged = merge_motion_rulings(chunks)
+        
+        assert [ruling["motion_id"] for ruling in merged] == [f"m-{index}" for index in range(250)]
+
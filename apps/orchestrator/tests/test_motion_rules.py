@@ -0,0 +1,62 @@
+import json
+import os
+import pytest
+from app.core.motion_rules import RULES_PATH, MotionRuleSource, build_rule_set
+
+
+def rule_file(tmp_path, reasoning="Motion denied."):
+    data = json.loads(RULES_PATH.read_text())
+    data["kinds"]["limine"]["default"]["reasoning"] = reasoning
+    path = tmp_path / "motions.json"
+    path.write_text(json.dumps(data))
+    return path, data
+
+
+class TestMotionRules:
+    
+    def test_priority_beats_position(self):
+        """Test a higher-priority rule wins even when a lower one matches earlier in the brief"""
+        rules = build_rule_set(json.loads(RULES_PATH.read_text()))
+        limine = rules.kind("limine")
+        
+        brief = "The expert's prior bad act testimony is unfairly PREJUDICIAL."
+        
+        assert limine.rule_for(brief) == limine.rules[0]
+        assert limine.rule_for("Hearsay from an unqualified expert") == limine.rules[2]
+        assert limine.rule_for("nothing relevant here") == limine.default
+        assert rules.kind("dismiss") is limine
+        
+        scanned = limine._replace(phrases=None)
+        assert scanned.rule_for(brief) == limine.rules[0]
+        assert scanned.rule_for("Hearsay from an unqualified expert") == limine.rules[2]
+    
+    def test_uppercase_pattern_is_rejected(self):
+        """Test patterns must be lowercase, since briefs are lowercased before matching"""
+        data = json.loads(RULES_PATH.read_text())
+        data["kinds"]["sever"]["rules"][0]["pattern"] = r"Joinder\S*"
+        
+        with pytest.raises(ValueError):
+            build_rule_set(data)
+        
+        data["kinds"]["sever"]["rules"][0]["pattern"] = r"joinder\S*"
+        assert build_rule_set(data).kind("sever").rule_for("Improper JOINDERS").status == "granted"
+    
+    def test_changed_file_is_swapped_in_and_bad_file_ignored(self, tmp_path):
+        """Test edits reload without a restart, while a broken edit keeps the last good rules"""
+        path, data = rule_file(tmp_path)
+        source = MotionRuleSource(path, check_interval=0)
+        original = source.get()
+        
+        data["kinds"]["limine"]["default"]["reasoning"] = "Motion denied on reload."
+        path.write_text(json.dumps(data))
+        os.utime(path, ns=(1, 1))
+        
+        reloaded = source.get()
+        assert reloaded.version != original.version
+        assert reloaded.kind("limine").default.reasoning == "Motion denied on reload."
+        
+        path.write_text('{"kinds": ')
+        os.utime(path, ns=(2, 2))
+        
+        assert source.get() is reloaded
+        assert source.last_error.startswith("JSONDecodeError")
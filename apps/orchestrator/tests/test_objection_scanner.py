@@ -0,0 +1,147 @@
+import random
+import re
+from app.core.objection_scanner import (
+    CONJOINED_QUESTION,
+    OBJECTION_GROUNDS,
+    STACKED_QUESTIONS,
+    ObjectionScanner,
+    ground_counts,
+    question_structure,
+    segment_questions,
+)
+from app.tasks.objection_engine import suggest_objection_grounds
+
+
+TURNS = [
+    "Isn't it true that she said she was home? And isn't it true that he said otherwise?",
+    "Someone told me the copy of the contract was confidential, according to the clerk.",
+    "What kind of person leaves the scene?\nHow dare you! Have you ever been convicted?",
+    "Describe the intersection for the jury.",
+    "Was the light red? Was it green? Or was it yellow? And who was driving?",
+    "HE SAID, SHE SAID, THEY SAID",
+]
+
+
+def findall_counts(turn):
+    """Original approach: re.findall per phrase on the lowercased turn"""
+    counts = {}
+    for ground in OBJECTION_GROUNDS:
+        if ground.structural:
+            continue
+        for pattern in ground.patterns:
+            found = len(re.findall(pattern, turn.lower(), re.IGNORECASE))
+            if found:
+                counts[pattern] = found
+    return counts
+
+
+def adversarial_turn(rng, size):
+    """Question marks, conjunctions and long unbroken lines: the inputs that stalled .* patterns"""
+    pieces = ["?", "? ", "and ", "or ", "but ", "and?", "x", " ", ".", "\n", "what if ", "he said "]
+    weights = [20, 10, 10, 10, 5, 5, 20, 15, 2, 1, 1, 1]
+    text = "".join(rng.choices(pieces, weights, k=size // 3))
+    return (text * (size // max(len(text), 1) + 1))[:size]
+
+
+class SteppingClock:
+    """A clock that moves `step` seconds on every read, so budgets do not depend on machine load"""
+    
+    def __init__(self, step=0.0):
+        self.step = step
+        self.now = 0.0
+        self.reads = 0
+    
+    def __call__(self):
+        self.reads += 1
+        self.now += self.step
+        return self.now
+
+
+class TestObjectionScanner:
+    
+    def test_counts_match_findall(self):
+        """Test every pattern is counted as re.findall counts it, overlapping phrases included"""
+        scanner = ObjectionScanner()
+        
+        for turn in TURNS:
+            counts, complete = scanner.pattern_counts(turn.lower())
+            assert complete
+            assert {pattern: count for pattern, count in counts.items() if pattern in scanner.phrases} == findall_counts(turn)
+        
+        counts, _ = scanner.pattern_counts(TURNS[0].lower())
+        assert counts["he said"] == 2  # once alone and once inside "she said"
+    
+    def test_ground_counts(self):
+        """Test per-ground totals, with a phrase shared by two grounds counted for both"""
+        hits = ObjectionScanner().scan(TURNS[2]).hits
+        
+        assert ground_counts(hits) == {"argumentative": 2, "character": 2}
+        assert [hit.ground.key for hit in hits] == ["argumentative", "argumentative", "character", "character"]
+    
+    def test_suggestions(self):
+        """Test the task suggests repeated grounds and reports counts per ground"""
+        result = suggest_objection_grounds(
+            TURNS[0],
+            {"phase": "witness_examination", "examination_mode": "direct"},
+        )
+        
+        assert result["ground_counts"]["leading"] == 2
+        assert result["ground_counts"]["hearsay"] == 3
+        top = result["suggestions"][0]
+        assert (top["objection_type"], top["pattern_matched"], top["confidence"]) == ("leading", "isn't it true that", 0.72)
+        assert not result["scan_truncated"] and not result["scan_over_budget"]
+    
+    def test_compound_questions_are_counted_structurally(self):
+        """Test stacked and conjoined questions are read from sentences and whole words"""
+        counts, complete = question_structure(TURNS[4].lower())
+        
+        assert complete
+        assert counts == {STACKED_QUESTIONS: 1, CONJOINED_QUESTION: 2}
+        # "or" inside "officer" and "before" no longer reads as a conjunction
+        assert question_structure("officer, before the accident, were you on duty?")[0][CONJOINED_QUESTION] == 0
+        assert question_structure("was it red?! and then?\nwhy?")[0] == {STACKED_QUESTIONS: 0, CONJOINED_QUESTION: 1}
+    
+    def test_long_turn_is_capped_and_budgeted(self):
+        """Test only the end of an over-long turn is scanned and an exhausted budget is reported"""
+        turn = "According to the clerk, " + "the record continues. " * 100 + "Have you ever been there?"
+        
+        scanned = ObjectionScanner(max_chars=200).scan(turn)
+        
+        assert scanned.truncated and not scanned.over_budget
+        assert ground_counts(scanned.hits) == {"character": 1}
+    
+    def test_exhausted_budget_reports_counts_so_far(self):
+        """Test a scan stops at the first line read past its deadline and says so"""
+        turn = "Was it red? Or green? Why?\n" * 5
+        
+        # Deadline at 0.07; lines are checked at 0.04, 0.06 and then 0.08
+        scanned = ObjectionScanner(budget_ms=50, clock=SteppingClock(0.02)).scan(turn)
+        assert scanned.over_budget
+        assert ground_counts(scanned.hits) == {"compound": 4}
+        
+        unhurried = ObjectionScanner(budget_ms=50, clock=SteppingClock()).scan(turn)
+        assert not unhurried.over_budget
+        assert ground_counts(unhurried.hits) == {"compound": 10}
+    
+    def test_fuzzed_turns_are_read_in_one_pass(self):
+        """Test adversarial turns are read line by line, each character in at most one question"""
+        rng = random.Random(11)
+        
+        for size in (100, 1000, 10000, 100000):
+            for _ in range(5):
+                turn = adversarial_turn(rng, size)
+                clock = SteppingClock()
+                scanner = ObjectionScanner(clock=clock)
+                
+                scanned = scanner.scan(turn)
+                
+                text = turn[-scanner.max_chars:].lower()
+                lines = text.splitlines()
+                assert not scanned.over_budget
+                assert scanned.truncated == (size > scanner.max_chars)
+                # One read for the deadline, then one per line
+                assert clock.reads == 1 + len(lines)
+                for line in lines:
+                    questions = segment_questions(line)
+                    assert sum(map(len, questions)) <= len(line)
+                    assert all("?" in question for question in questions)
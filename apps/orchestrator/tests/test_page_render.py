@@ -0,0 +1,96 @@
+import fitz
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from app.core import page_render
+from app.core.config import settings
+from app.core.page_render import PageRenderer
+
+
+@pytest.fixture
+def pdf(tmp_path):
+    path = tmp_path / "exhibit.pdf"
+    document = fitz.open()
+    for number in range(6):
+        document.new_page(width=200, height=300).insert_text((20, 40), f"Page {number + 1}")
+    document.save(str(path))
+    document.close()
+    return str(path)
+
+
+@pytest.fixture
+def renderer(pdf, tmp_path):
+    renderer = PageRenderer(max_bytes=10 ** 7, prefetch=2)
+    renderer._sources["c" * 64] = pdf
+    page_render._documents.clear()
+    with patch.object(settings, "PAGE_RENDER_DIR", str(tmp_path)):
+        yield renderer
+
+
+class TestPageRender:
+    
+    def test_render_in_process_reuses_document_and_cache(self, renderer):
+        """Test pages render at the requested zoom, reopen nothing and repeat from cache"""
+        opened = []
+        real_open = fitz.open
+        
+        with patch.object(page_render, "get_process_pool", return_value=None), \
+                patch.object(page_render.fitz, "open", lambda path: opened.append(path) or real_open(path)):
+            first = renderer.render("c" * 64, 0, zoom=2)
+            second = renderer.render("c" * 64, 1, zoom=2)
+            again = renderer.render("c" * 64, 0, zoom=2.001)
+        
+        assert (first.width, first.height, first.page_count) == (400, 600, 6)
+        assert first.png.startswith(b"\x89PNG") and second.png != first.png
+        assert again is first
+        assert len(opened) == 1
+    
+    def test_request_prefetches_following_pages(self, renderer):
+        """Test the next pages are rendered in the background, stopping at the last page"""
+        pool = ThreadPoolExecutor(1)
+        
+        with patch.object(page_render, "get_process_pool", return_value=pool), \
+                patch.object(settings, "PAGE_RENDER_WORKERS", 1):
+            renderer.render("c" * 64, 4)
+            pool.shutdown(wait=True)
+        
+        assert renderer.cached("c" * 64, 5, 1.0) is not None
+        assert renderer.cached("c" * 64, 6, 1.0) is None
+        assert not renderer._pending
+    
+    def test_cache_is_bounded_by_bytes(self, renderer):
+        """Test least recently used renders are evicted once over the byte budget"""
+        with patch.object(page_render, "get_process_pool", return_value=None):
+            first = renderer.render("c" * 64, 0)
+            renderer.max_bytes = len(first.png) + 1
+            second = renderer.render("c" * 64, 1)
+        
+        assert renderer.cached("c" * 64, 0, 1.0) is None
+        assert renderer.cached("c" * 64, 1, 1.0) is second
+        assert renderer.size_bytes == len(second.png)
+    
+    def test_page_past_end_raises(self, renderer):
+        """Test out-of-range pages are rejected rather than wrapped around"""
+        with patch.object(page_render, "get_process_pool", return_value=None):
+            with pytest.raises(IndexError):
+                renderer.render("c" * 64, 6)
+            with pytest.raises(IndexError):
+                renderer.render("c" * 64, -1)
+    
+    def test_source_unlinked_by_another_process_is_fetched_again(self, renderer, pdf, tmp_path):
+        """Test a cached source path another worker evicted from the shared directory is downloaded again"""
+        shared = tmp_path / ("d" * 64 + ".pdf")
+        renderer._sources["d" * 64] = str(shared)
+        fetched = []
+        
+        def download(key, path):
+            fetched.append(key)
+            with open(pdf, "rb") as source, open(path, "wb") as target:
+                target.write(source.read())
+        
+        with patch.object(page_render.blob_store, "lookup", return_value={"s3_key": "blobs/d"}), \
+                patch.object(page_render.storage, "download_file", side_effect=download):
+            assert renderer.local_path("d" * 64) == str(shared)
+        
+        assert fetched == ["blobs/d"]
+        assert shared.exists()
@@ -0,0 +1,74 @@
+import io
+import random
+import pytest
+from app.core.redaction import Redactor, name_terms
+
+
+SAMPLE = (
+    b"Call Jane Smith at (555) 123-4567 or 555.123.4567. SSN 123-45-6789, "
+    b"account 12345678901, email j.doe+trial@mail.example.com. Mr. SMITH agreed. "
+    b"Filed 2023-10-17 as case 123-45-67890."
+)
+
+
+class TestRedaction:
+    
+    def test_patterns_and_names(self):
+        """Test each PII kind is found once and other numbers are left alone"""
+        masked, spans = Redactor(["Jane Smith"]).redact_bytes(SAMPLE)
+        
+        assert [SAMPLE[start:end] for start, end, _ in spans] == [
+            b"Jane Smith", b"(555) 123-4567", b"555.123.4567", b"123-45-6789",
+            b"12345678901", b"j.doe+trial@mail.example.com", b"SMITH",
+        ]
+        assert [kind for _, _, kind in spans] == ["name", "phone", "phone", "ssn", "account", "email", "name"]
+        assert len(masked) == len(SAMPLE)
+        assert b"2023-10-17" in masked and b"123-45-67890" in masked
+        assert b"Jane" not in masked and b"@" not in masked
+    
+    def test_name_terms_add_surnames(self):
+        """Test full names are kept whole, longest first, with surnames added"""
+        assert name_terms(["Jane  Smith", "Smith", "", "Wei Chen"]) == ["Jane Smith", "Wei Chen", "Smith", "Chen"]
+    
+    @pytest.mark.parametrize("chunk_size", [64, 1000, 4096])
+    def test_stream_matches_whole_buffer_across_chunk_boundaries(self, chunk_size):
+        """Test matches split between chunks are found exactly as in one pass"""
+        rng = random.Random(3)
+        tokens = [b"the", b"witness", b"Jane Smith", b"123-45-6789", b"(555) 123-4567",
+                  b"a.b@c.com", b"12345678", b"2023", b"\n", b"x@", b"1234567"]
+        data = b"".join(rng.choice(tokens) + rng.choice([b" ", b"", b"-", b"."]) for _ in range(3000))
+        redactor = Redactor(["Jane Smith"])
+        expected, expected_spans = redactor.redact_bytes(data)
+        
+        sink = io.BytesIO()
+        spans = redactor.redact_stream(io.BytesIO(data), sink, chunk_size=chunk_size)
+        
+        assert sink.getvalue() == expected
+        assert spans == expected_spans
+        assert spans
+    
+    def test_redact_text_uses_character_offsets(self):
+        """Test spans index the string, not its UTF-8 bytes"""
+        text = "José told Jane Smith: call 555-123-4567"
+        
+        redacted, spans = Redactor(["Jane Smith"]).redact_text(text)
+        
+        assert [text[start:end] for start, end, _ in spans] == ["Jane Smith", "555-123-4567"]
+        assert redacted == "José told **********: call ************"
+    
+    @pytest.mark.parametrize("encoding", ["utf-8", "cp1252"])
+    def test_non_ascii_names_in_capitals(self, encoding):
+        """Test names with accented letters are found in capitals and lowercase, as court captions write them"""
+        redactor = Redactor(["José Núñez", "René"], encoding)
+        text = "WITNESS JOSÉ NÚÑEZ. Mr. NÚÑEZ testified; núñez and RENÉ, not Renée, agreed."
+        
+        redacted, spans = redactor.redact_text(text)
+        
+        assert [text[start:end] for start, end, _ in spans] == ["JOSÉ NÚÑEZ", "NÚÑEZ", "núñez", "RENÉ"]
+        assert "Renée" in redacted
+    
+    def test_scattered_digits_without_other_candidates(self):
+        """Test text with many digits but no dense run of them scans cleanly"""
+        text = "Exhibits 1, 2, 3, 4, 5, 6, 7, 8 and 9 were admitted."
+        
+        assert Redactor().redact_text(text) == (text, [])
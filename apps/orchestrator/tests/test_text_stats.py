@@ -0,0 +1,55 @@
+import codecs
+import io
+import pytest
+from app.core.text_stats import analyze_text, detect_encoding, line_range
+
+
+def reference_counts(text):
+    lines = text.split("\n")
+    if lines and lines[-1] == "":
+        lines = lines[:-1]
+    return len(text), len(text.split()), len(lines)
+
+
+class TestTextStats:
+    
+    @pytest.mark.parametrize("chunk_size", [4, 7, 16, 1 << 20])
+    def test_counts_match_full_decode_across_chunk_boundaries(self, chunk_size):
+        """Test multi-byte characters and words split between chunks are counted once"""
+        text = "Witness: café 漢字 😀\r\nDefense  counsel objects\n\nlast line without newline"
+        
+        stats = analyze_text(io.BytesIO(text.encode("utf-8")), chunk_size=chunk_size)
+        
+        assert stats.encoding == "utf-8"
+        assert (stats.character_count, stats.word_count, stats.line_count) == reference_counts(text)
+    
+    @pytest.mark.parametrize("encoding,data", [
+        ("utf-16-le", codecs.BOM_UTF16_LE + "ab\ncd\n".encode("utf-16-le")),
+        ("utf-16-be", codecs.BOM_UTF16_BE + "ab\ncd\n".encode("utf-16-be")),
+        ("utf-32-le", codecs.BOM_UTF32_LE + "ab\ncd\n".encode("utf-32-le")),
+        ("utf-8", codecs.BOM_UTF8 + "ab\ncd\n".encode("utf-8")),
+        ("utf-16-le", "chat export line\n".encode("utf-16-le")),
+        ("cp1252", "caf\xe9 r\xe9sum\xe9".encode("cp1252")),
+    ])
+    def test_detect_encoding(self, encoding, data):
+        """Test BOMs, BOM-less UTF-16 and legacy single-byte files are recognised"""
+        assert detect_encoding(data)[0] == encoding
+    
+    def test_line_offsets_seek_to_any_line(self):
+        """Test the offset index gives each line's byte range"""
+        lines = ["first", "sécond 😀", "", "fourth"]
+        data = codecs.BOM_UTF16_LE + "\n".join(lines).encode("utf-16-le")
+        
+        stats = analyze_text(io.BytesIO(data), chunk_size=6)
+        
+        assert stats.line_count == 4
+        for number, line in enumerate(lines):
+            start, end = line_range(stats.line_offsets, number, stats.size_bytes)
+            assert data[start:end].decode("utf-16-le").rstrip("\n") == line
+    
+    def test_empty_file(self):
+        """Test empty input has no lines"""
+        stats = analyze_text(io.BytesIO(b""))
+        
+        assert (stats.character_count, stats.word_count, stats.line_count) == (0, 0, 0)
+        assert len(stats.line_offsets) == 0
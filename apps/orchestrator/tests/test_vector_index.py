@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+from unittest.mock import patch
+from app.core import vector_index
+from app.core.config import settings
+from app.core.embeddings import HashingEmbedder, normalize_rows
+from app.core.vector_index import VectorIndex, load_index, update_index
+from app.tasks.trial_director import find_supporting_evidence
+
+
+def random_unit_vectors(count, dim=64, seed=0):
+    return normalize_rows(np.random.default_rng(seed).standard_normal((count, dim)).astype(np.float32))
+
+
+@pytest.fixture
+def index_dir(tmp_path):
+    with patch.object(settings, "VECTOR_INDEX_DIR", str(tmp_path)):
+        vector_index._loaded.clear()
+        yield tmp_path
+
+
+class TestVectorIndex:
+    
+    def test_exact_search_ranks_by_cosine(self):
+        """Test small indexes return the best matches first"""
+        vectors = random_unit_vectors(50)
+        index = VectorIndex.build([f"row-{i}" for i in range(50)], vectors)
+        
+        hits = index.search(vectors[7], limit=3)
+        
+        assert index.centroids is None
+        assert hits[0][0] == "row-7"
+        assert hits[0][1] == pytest.approx(1.0, abs=1e-5)
+        assert hits[1][1] >= hits[2][1]
+    
+    def test_ivf_search_recall(self):
+        """Test clustered indexes still find near-duplicates of the query"""
+        vectors = random_unit_vectors(2000)
+        with patch.object(vector_index, "IVF_MIN_VECTORS", 500):
+            index = VectorIndex.build([str(i) for i in range(2000)], vectors)
+        
+        queries = normalize_rows(vectors[:100] + 0.05 * random_unit_vectors(100, seed=1))
+        found = sum(index.search(query, limit=1)[0][0] == str(i) for i, query in enumerate(queries))
+        
+        assert index.centroids is not None
+        assert found >= 95
+    
+    def test_updates_replace_rows_and_publish_generations(self, index_dir):
+        """Test incremental updates persist memory-mapped generations"""
+        vectors = random_unit_vectors(10)
+        update_index("case-1", "facts", [f"fact-{i}" for i in range(10)], vectors)
+        first = load_index("case-1", "facts")
+        
+        replacement = random_unit_vectors(1, seed=3)
+        update_index("case-1", "facts", ["fact-0", "fact-10"], np.vstack([replacement, vectors[1:2]]))
+        second = load_index("case-1", "facts")
+        
+        assert isinstance(first.vectors, np.memmap)
+        assert load_index("case-1", "facts") is second
+        assert len(second) == 11
+        assert second.search(replacement[0], limit=1)[0][0] == "fact-0"
+        assert sorted(path.name for path in (index_dir / "case-1" / "facts").glob("*.npy")) == ["keys-2.npy", "vectors-2.npy"]
+    
+    def test_rejects_path_traversal(self, index_dir):
+        """Test case IDs cannot escape the index directory"""
+        with pytest.raises(ValueError):
+            load_index("../etc", "facts")
+    
+    def test_find_supporting_evidence(self, index_dir):
+        """Test a transcript line is anchored to the closest exhibit"""
+        texts = ["Surveillance video of the parking lot", "Receipt for the laptop purchase", "Medical report of the injury"]
+        update_index("case-1", "exhibits", ["ex-1", "ex-2", "ex-3"], HashingEmbedder().embed(texts))
+        
+        matches = find_supporting_evidence("case-1", "Where was the laptop purchase receipt?", limit=1)
+        
+        assert matches["exhibits"][0]["id"] == "ex-2"
+        assert matches["facts"] == []
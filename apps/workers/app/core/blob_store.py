@@ -0,0 +1,174 @@
+from typing import Any, Callable, Dict, Optional, Tuple
+import json
+import time
+
+import redis
+
+from app.core.cache import get_redis
+
+
+BLOB_PREFIX = "blobs/sha256"
+DERIVED_PREFIX = "derived/sha256"
+
+# How long a released blob's record is held while its objects are deleted;
+# a release that dies part way is resumed by its retry within this time
+RELEASE_MARKER_SECONDS = 15 * 60
+
+# How long an ingest waits for a concurrent release of the same content
+RELEASE_WAIT_SECONDS = 30.0
+
+
+def blob_key(checksum: str) -> str:
+    """Object key for content with the given SHA-256"""
+    return f"{BLOB_PREFIX}/{checksum[:2]}/{checksum}"
+
+
+def derived_prefix(checksum: str) -> str:
+    """Key prefix of every artifact derived from a blob"""
+    return f"{DERIVED_PREFIX}/{checksum[:2]}/{checksum}/"
+
+
+def derived_key(checksum: str, name: str) -> str:
+    """Object key for an artifact derived from a blob, e.g. extracted page text"""
+    return f"{derived_prefix(checksum)}{name}"
+
+
+class BlobStore:
+    """
+    Registry of content-addressed exhibit blobs.
+
+    Each blob record holds its object key, size and the metadata extracted on
+    first ingest. References are a set of "case_id/filename" members, so
+    re-ingesting the same file into the same case does not inflate the count.
+
+    Referencing and releasing are transactions over the record and its
+    reference set. Releasing the last reference moves the record to a
+    releasing marker in the same transaction, so an ingest can never dedupe
+    onto a blob whose objects are being deleted: its reference fails and it
+    stores the content again once the release has finished.
+    """
+
+    def __init__(self, client_factory: Callable[[], redis.Redis] = get_redis, namespace: str = "exhibit-blob"):
+        self.client_factory = client_factory
+        self.namespace = namespace
+
+    def _record_key(self, checksum: str) -> str:
+        return f"{self.namespace}:{checksum}"
+
+    def _refs_key(self, checksum: str) -> str:
+        return f"{self.namespace}:{checksum}:refs"
+
+    def _releasing_key(self, checksum: str) -> str:
+        return f"{self.namespace}:{checksum}:releasing"
+
+    def _case_key(self, case_id: str) -> str:
+        return f"{self.namespace}:case:{case_id}"
+
+    def lookup(self, checksum: str) -> Optional[Dict[str, Any]]:
+        """Blob record for a checksum, or None if the content is new"""
+        raw = self.client_factory().get(self._record_key(checksum))
+        return json.loads(raw) if raw is not None else None
+
+    def register(self, checksum: str, record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Record a newly stored blob.
+
+        Returns:
+            The stored record; if a concurrent ingest registered first, theirs
+        """
+        client = self.client_factory()
+        if client.set(self._record_key(checksum), json.dumps(record), nx=True):
+            return record
+        return self.lookup(checksum) or record
+
+    def add_reference(self, checksum: str, reference: str) -> int:
+        """
+        Reference a registered blob from a case.
+
+        Returns:
+            The reference count, or 0 if the blob was released since it was
+            looked up and has to be stored again
+        """
+        record_key, refs_key = self._record_key(checksum), self._refs_key(checksum)
+
+        def reference_if_registered(pipe) -> int:
+            if not pipe.exists(record_key):
+                return 0
+            count = pipe.scard(refs_key) + (0 if pipe.sismember(refs_key, reference) else 1)
+            pipe.multi()
+            pipe.sadd(refs_key, reference)
+            return count
+
+        return self.client_factory().transaction(
+            reference_if_registered, record_key, refs_key, value_from_callable=True
+        )
+
+    def release_reference(self, checksum: str, reference: str) -> Tuple[int, Optional[Dict[str, Any]]]:
+        """
+        Drop a case reference.
+
+        Returns:
+            The remaining reference count, and when none remain the released
+            record, whose objects the caller deletes before `finish_release`.
+            A retried release gets the record again until it is finished.
+        """
+        record_key, refs_key = self._record_key(checksum), self._refs_key(checksum)
+        releasing_key = self._releasing_key(checksum)
+
+        def release(pipe) -> Tuple[int, Optional[Dict[str, Any]]]:
+            remaining = pipe.scard(refs_key) - (1 if pipe.sismember(refs_key, reference) else 0)
+            raw = pipe.get(record_key)
+            pipe.multi()
+            pipe.srem(refs_key, reference)
+            if remaining > 0 or raw is None:
+                return remaining, None
+            pipe.set(releasing_key, raw, ex=RELEASE_MARKER_SECONDS)
+            pipe.delete(record_key, refs_key)
+            return 0, json.loads(raw)
+
+        remaining, record = self.client_factory().transaction(
+            release, record_key, refs_key, value_from_callable=True
+        )
+        if remaining == 0 and record is None:
+            # Already released by an earlier attempt that did not finish
+            raw = self.client_factory().get(releasing_key)
+            record = json.loads(raw) if raw is not None else None
+        return remaining, record
+
+    def finish_release(self, checksum: str) -> None:
+        """Clear the releasing marker once a released blob's objects are deleted"""
+        self.client_factory().delete(self._releasing_key(checksum))
+
+    def wait_for_release(self, checksum: str, timeout: float = RELEASE_WAIT_SECONDS) -> None:
+        """
+        Block while a release of this content is deleting its objects.
+
+        Raises:
+            TimeoutError: If the release is still running after `timeout` seconds
+        """
+        client = self.client_factory()
+        deadline = time.monotonic() + timeout
+        while client.exists(self._releasing_key(checksum)):
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Blob {checksum} is still being released")
+            time.sleep(0.1)
+
+    def index_case_exhibit(self, case_id: str, filename: str, checksum: str) -> None:
+        """
+        List a blob under a case, for readers that start from the case.
+
+        The orchestrator reads this hash of filename -> checksum to warm its
+        exhibit cache when a trial starts.
+        """
+        self.client_factory().hset(self._case_key(case_id), filename, checksum)
+
+    def unindex_case_exhibit(self, case_id: str, filename: str) -> None:
+        self.client_factory().hdel(self._case_key(case_id), filename)
+
+    def case_exhibits(self, case_id: str) -> Dict[str, str]:
+        """Checksum of each exhibit in a case, by filename"""
+        raw = self.client_factory().hgetall(self._case_key(case_id))
+        return {name.decode("utf-8"): checksum.decode("utf-8") for name, checksum in raw.items()}
+
+
+blob_store = BlobStore()
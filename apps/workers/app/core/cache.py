@@ -0,0 +1,158 @@
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+import hashlib
+import json
+import os
+import threading
+import time
+
+import redis
+
+from app.core.config import settings
+
+
+_redis_client: Optional[redis.Redis] = None
+_redis_pid: Optional[int] = None
+
+
+def get_redis() -> redis.Redis:
+    """Redis client for this worker process, re-created after a fork"""
+    global _redis_client, _redis_pid
+    if _redis_client is None or _redis_pid != os.getpid():
+        _redis_client = redis.Redis.from_url(settings.REDIS_URL)
+        _redis_pid = os.getpid()
+    return _redis_client
+
+
+def content_key(*parts: Any) -> str:
+    """Stable SHA-256 digest of JSON-serializable parts"""
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    Versioned two-tier cache for JSON-serializable results.
+
+    Lookups try an in-process LRU first, then Redis. Entries are namespaced by
+    `version`, so bumping it invalidates every older entry in both tiers. Redis
+    failures are counted and the tier is skipped for `redis_backoff` seconds
+    rather than failing the caller.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        version: str,
+        max_entries: int = 1024,
+        ttl: int = 24 * 60 * 60,
+        redis_url: Optional[str] = None,
+        redis_backoff: float = 30.0,
+    ):
+        self.namespace = namespace
+        self.version = version
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.redis_url = redis_url if redis_url is not None else settings.REDIS_URL
+        self.redis_backoff = redis_backoff
+
+        self._local: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis: Optional[redis.Redis] = None
+        self._redis_pid: Optional[int] = None
+        self._redis_down_until = 0.0
+        self._stats = {"local_hits": 0, "redis_hits": 0, "misses": 0, "redis_errors": 0}
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self.namespace}:{self.version}:{key}"
+
+    def _client(self) -> Optional[redis.Redis]:
+        if not self.redis_url or time.monotonic() < self._redis_down_until:
+            return None
+        # Connections must not be shared with a forked child
+        if self._redis is None or self._redis_pid != os.getpid():
+            self._redis = redis.Redis.from_url(
+                self.redis_url, socket_connect_timeout=0.25, socket_timeout=0.25
+            )
+            self._redis_pid = os.getpid()
+        return self._redis
+
+    def _count(self, counter: str) -> None:
+        # Caches are shared by the threads of the pooled worker
+        with self._lock:
+            self._stats[counter] += 1
+
+    def _redis_failed(self) -> None:
+        self._count("redis_errors")
+        self._redis_down_until = time.monotonic() + self.redis_backoff
+
+    def set_version(self, version: str) -> None:
+        """Switch to a new version, dropping local entries from the old one"""
+        with self._lock:
+            if version != self.version:
+                self.version = version
+                self._local.clear()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for `key`, or None on a miss"""
+        with self._lock:
+            raw = self._local.get(key)
+            if raw is not None:
+                self._local.move_to_end(key)
+                self._stats["local_hits"] += 1
+                return json.loads(raw)
+
+        client = self._client()
+        if client is not None:
+            try:
+                raw_bytes = client.get(self._redis_key(key))
+            except redis.RedisError:
+                self._redis_failed()
+                raw_bytes = None
+            if raw_bytes is not None:
+                raw = raw_bytes.decode("utf-8")
+                self._store_local(key, raw)
+                self._count("redis_hits")
+                return json.loads(raw)
+
+        self._count("misses")
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        """Store `value` in both tiers"""
+        raw = json.dumps(value, separators=(",", ":"), default=str)
+        self._store_local(key, raw)
+
+        client = self._client()
+        if client is not None:
+            try:
+                client.set(self._redis_key(key), raw, ex=self.ttl)
+            except redis.RedisError:
+                self._redis_failed()
+
+    def _store_local(self, key: str, raw: str) -> None:
+        with self._lock:
+            self._local[key] = raw
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+
+    def clear_local(self) -> None:
+        """Drop every in-process entry"""
+        with self._lock:
+            self._local.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process"""
+        with self._lock:
+            counters = dict(self._stats)
+            local_entries = len(self._local)
+        lookups = counters["local_hits"] + counters["redis_hits"] + counters["misses"]
+        hits = lookups - counters["misses"]
+        return {
+            "namespace": self.namespace,
+            "version": self.version,
+            "local_entries": local_entries,
+            **counters,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
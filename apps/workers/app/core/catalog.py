@@ -0,0 +1,142 @@
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, NamedTuple, Optional, Tuple
+import json
+import re
+import sys
+
+from app.core.cache import content_key
+
+
+CATALOG_DIR = Path(__file__).resolve().parent.parent / "catalogs"
+DEFAULT_JURISDICTION = "default"
+
+
+class CatalogEntry(NamedTuple):
+    """An element or defense with its precomputed display description"""
+    name: str
+    description: str
+
+
+class ChargeDefinition(NamedTuple):
+    """Elements and defenses for one charge or claim"""
+    label: str
+    elements: Tuple[CatalogEntry, ...]
+    defenses: Tuple[CatalogEntry, ...]
+
+
+class Catalog(NamedTuple):
+    """
+    Immutable element/defense lookup tables for one jurisdiction.
+
+    Built once per process; workers fork after it is loaded, so prefork
+    children share the tables copy-on-write.
+    """
+    jurisdiction: str
+    version: str
+    charges: Mapping[str, Mapping[str, ChargeDefinition]]
+    fallbacks: Mapping[str, ChargeDefinition]
+    entries: Mapping[str, CatalogEntry]
+
+    def charge(self, case_type: str, label: str) -> ChargeDefinition:
+        """Definition for a charge, falling back to the case type's generic one"""
+        definition = self.charges.get(case_type, {}).get(label)
+        if definition is None:
+            definition = self.fallbacks.get(case_type, self.fallbacks["criminal"])
+        return definition
+
+    def describe(self, name: str, kind: str = "Element") -> str:
+        """Display description for an element or defense name"""
+        entry = self.entries.get(name)
+        title = entry.description if entry else name.replace("_", " ").title()
+        return f"{kind}: {title}"
+
+
+def jurisdiction_slug(jurisdiction: Optional[str]) -> str:
+    """File stem for a jurisdiction name, e.g. 'New York' -> 'new_york'"""
+    if not jurisdiction:
+        return DEFAULT_JURISDICTION
+    return re.sub(r"[^a-z0-9]+", "_", jurisdiction.lower()).strip("_") or DEFAULT_JURISDICTION
+
+
+def _merge(base: Dict[str, Any], overlay: Dict[str, Any]) -> Dict[str, Any]:
+    """Overlay a jurisdiction file on the default definitions"""
+    merged = json.loads(json.dumps(base))
+    for case_type in ("criminal", "civil"):
+        section = overlay.get(case_type, {})
+        for key in ("default_elements", "default_defenses"):
+            if key in section:
+                merged[case_type][key] = section[key]
+        merged[case_type]["charges"].update(section.get("charges", {}))
+    merged["descriptions"].update(overlay.get("descriptions", {}))
+    merged["version"] = f"{base.get('version', '0')}+{overlay.get('version', '0')}"
+    return merged
+
+
+def build_catalog(jurisdiction: str, data: Dict[str, Any]) -> Catalog:
+    """Freeze raw catalog data into interned, read-only lookup tables"""
+    descriptions = data.get("descriptions", {})
+    entries: Dict[str, CatalogEntry] = {}
+
+    def entry(name: str) -> CatalogEntry:
+        name = sys.intern(name)
+        if name not in entries:
+            title = descriptions.get(name) or name.replace("_", " ").title()
+            entries[name] = CatalogEntry(name, sys.intern(title))
+        return entries[name]
+
+    charges: Dict[str, Mapping[str, ChargeDefinition]] = {}
+    fallbacks: Dict[str, ChargeDefinition] = {}
+
+    for case_type in ("criminal", "civil"):
+        section = data[case_type]
+        default_defenses = tuple(entry(name) for name in section["default_defenses"])
+
+        fallbacks[case_type] = ChargeDefinition(
+            "",
+            tuple(entry(name) for name in section["default_elements"]),
+            default_defenses,
+        )
+        charges[case_type] = MappingProxyType({
+            sys.intern(label): ChargeDefinition(
+                sys.intern(label),
+                tuple(entry(name) for name in definition.get("elements", section["default_elements"])),
+                tuple(entry(name) for name in definition["defenses"]) if "defenses" in definition else default_defenses,
+            )
+            for label, definition in section["charges"].items()
+        })
+
+    return Catalog(
+        jurisdiction=jurisdiction,
+        version=content_key(data)[:12],
+        charges=MappingProxyType(charges),
+        fallbacks=MappingProxyType(fallbacks),
+        entries=MappingProxyType(entries),
+    )
+
+
+def _read(path: Path) -> Dict[str, Any]:
+    with path.open(encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def load_catalogs(directory: Path = CATALOG_DIR) -> Mapping[str, Catalog]:
+    """Load and freeze every jurisdiction file in `directory`"""
+    base = _read(directory / f"{DEFAULT_JURISDICTION}.json")
+    catalogs = {DEFAULT_JURISDICTION: build_catalog(DEFAULT_JURISDICTION, base)}
+
+    for path in sorted(directory.glob("*.json")):
+        if path.stem != DEFAULT_JURISDICTION:
+            catalogs[path.stem] = build_catalog(path.stem, _merge(base, _read(path)))
+
+    return MappingProxyType(catalogs)
+
+
+# Loaded at import, i.e. in the Celery parent before the pool forks
+CATALOGS = load_catalogs()
+CATALOGS_VERSION = content_key(sorted((name, catalog.version) for name, catalog in CATALOGS.items()))[:12]
+
+
+def get_catalog(jurisdiction: Optional[str] = None) -> Catalog:
+    """Catalog for a jurisdiction, or the default one when it has no file"""
+    return CATALOGS.get(jurisdiction_slug(jurisdiction), CATALOGS[DEFAULT_JURISDICTION])
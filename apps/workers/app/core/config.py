@@ -17,6 +17,37 @@ class Settings(BaseSettings):
     AWS_SECRET_ACCESS_KEY: Optional[str] = None
     AWS_REGION: str = "us-east-1"
     S3_BUCKET: str = "courtroom-simulator"
+    S3_ENDPOINT_URL: Optional[str] = "http://localhost:9000"
+    S3_MAX_POOL_CONNECTIONS: int = 50
+    S3_TRANSFER_CONCURRENCY: int = 8
+    S3_MULTIPART_CHUNK_SIZE: int = 8 * 1024 * 1024
+    
+    # Exhibit processing
+    IMAGE_PREVIEW_WORKERS: int = 2
+    CUSTODY_CHUNK_SIZE: int = 1024 * 1024
+    
+    # PDF page rendering
+    PAGE_RENDER_WORKERS: int = 2
+    PAGE_RENDER_CACHE_BYTES: int = 256 * 1024 * 1024
+    PAGE_RENDER_PREFETCH: int = 3
+    PAGE_RENDER_DOCUMENTS: int = 8
+    PAGE_RENDER_DIR: str = "/tmp/courtroom-simulator/page-render"
+    
+    # Motion rulings; defaults to the packaged app/rules/motions.json
+    MOTION_RULES_PATH: Optional[str] = None
+    
+    # Objection suggestions; only the end of a longer turn is scanned
+    OBJECTION_MAX_TURN_CHARS: int = 20000
+    OBJECTION_SCAN_BUDGET_MS: float = 50.0
+    
+    # Embeddings
+    EMBEDDING_MODEL: str = "hashing"
+    EMBEDDING_BATCH_SIZE: int = 256
+    VECTOR_INDEX_DIR: str = "/tmp/courtroom-simulator/vector-index"
+    
+    # Intake result cache
+    INTAKE_CACHE_MAX_ENTRIES: int = 2048
+    INTAKE_CACHE_TTL_SECONDS: int = 24 * 60 * 60
     
     # OpenAI
     OPENAI_API_KEY: Optional[str] = None
@@ -0,0 +1,126 @@
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator, Optional, Sequence
+import io
+import os
+import struct
+
+from app.core.config import settings
+
+
+_connection: Optional[Any] = None
+_connection_pid: Optional[int] = None
+
+# Rows sent per multi-row INSERT
+INSERT_PAGE_SIZE = 500
+
+
+def get_connection():
+    """Postgres connection for this worker process, re-created after a fork"""
+    global _connection, _connection_pid
+    # Imported here so tasks that never touch Postgres don't need the driver
+    import psycopg2
+
+    if _connection is None or _connection.closed or _connection_pid != os.getpid():
+        _connection = psycopg2.connect(settings.DATABASE_URL)
+        _connection_pid = os.getpid()
+    return _connection
+
+
+@contextmanager
+def transaction() -> Iterator[Any]:
+    """Cursor inside a transaction that commits on success and rolls back on error"""
+    connection = get_connection()
+    try:
+        with connection.cursor() as cursor:
+            yield cursor
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+
+
+def insert_rows(sql: str, rows: Sequence[Sequence[Any]], template: Optional[str] = None) -> int:
+    """
+    Insert many rows with multi-row VALUES statements in one transaction.
+
+    Args:
+        sql: Statement with a single `VALUES %s` placeholder
+        rows: Row tuples in column order
+        template: Optional per-row template, e.g. "(%s, %s::jsonb)"
+
+    Returns:
+        Number of rows sent
+    """
+    if not rows:
+        return 0
+
+    from psycopg2.extras import execute_values
+
+    with transaction() as cursor:
+        execute_values(cursor, sql, rows, template=template, page_size=INSERT_PAGE_SIZE)
+    return len(rows)
+
+
+def _copy_value(value: Any) -> str:
+    if value is None:
+        return "\\N"
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def copy_rows(cursor: Any, table: str, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> int:
+    """
+    Bulk load rows with COPY ... FROM STDIN in text format.
+
+    Much faster than INSERT for wide rows such as vectors, since nothing is
+    parsed as SQL. Runs on the caller's cursor so it joins their transaction.
+
+    Returns:
+        Number of rows copied
+    """
+    buffer = io.StringIO()
+    count = 0
+    for row in rows:
+        buffer.write("\t".join(_copy_value(value) for value in row))
+        buffer.write("\n")
+        count += 1
+
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buffer)
+    return count
+
+
+# Signature, flags and header-extension length that start every binary COPY stream
+_BINARY_COPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+_BINARY_COPY_TRAILER = struct.pack(">h", -1)
+
+
+def copy_binary_rows(cursor: Any, table: str, columns: Sequence[str], rows: Iterable[Sequence[Optional[bytes]]]) -> int:
+    """
+    Bulk load rows with COPY ... FROM STDIN in binary format.
+
+    Each value must already be in the column type's binary send format
+    (e.g. 16 raw bytes for UUID, UTF-8 for TEXT); None loads NULL.
+
+    Returns:
+        Number of rows copied
+    """
+    buffer = io.BytesIO()
+    buffer.write(_BINARY_COPY_HEADER)
+    field_count = struct.pack(">h", len(columns))
+    null = struct.pack(">i", -1)
+    count = 0
+
+    for row in rows:
+        buffer.write(field_count)
+        for value in row:
+            if value is None:
+                buffer.write(null)
+            else:
+                buffer.write(struct.pack(">i", len(value)))
+                buffer.write(value)
+        count += 1
+
+    buffer.write(_BINARY_COPY_TRAILER)
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT binary)", buffer)
+    return count
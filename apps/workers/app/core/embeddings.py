@@ -0,0 +1,154 @@
+from collections import Counter
+from functools import lru_cache
+from itertools import repeat
+from typing import Callable, Dict, List, Sequence
+import hashlib
+import re
+import struct
+
+import numpy as np
+
+from app.core.config import settings
+
+
+# Matches the VECTOR(1536) columns in init-db.sql
+EMBEDDING_DIM = 1536
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+class Embedder:
+    """
+    A local embedding model.
+
+    Subclasses map a batch of texts to an (n, dim) float32 array of unit
+    vectors. `version` must change whenever the output for the same text
+    would, so stored content hashes invalidate and rows are re-embedded.
+    """
+
+    name = "base"
+    dim = EMBEDDING_DIM
+
+    @property
+    def version(self) -> str:
+        return f"{self.name}:{self.dim}"
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        raise NotImplementedError
+
+
+@lru_cache(maxsize=1 << 18)
+def _hash_feature(feature: str, dim: int) -> int:
+    """
+    Stable signed column for a feature: +(column + 1) or -(column + 1).
+
+    Python's hash() is salted per process, so a keyed digest is used instead.
+    """
+    digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+    column = digest % dim + 1
+    return column if digest >> 63 else -column
+
+
+class HashingEmbedder(Embedder):
+    """
+    Signed feature hashing of unigrams and bigrams with sublinear TF weights.
+
+    Needs no vocabulary, fitting or network, and embeds a text the same way
+    regardless of what else is in the batch.
+    """
+
+    name = "hashing"
+
+    def __init__(self, dim: int = EMBEDDING_DIM, bigrams: bool = True):
+        self.dim = dim
+        self.bigrams = bigrams
+
+    @property
+    def version(self) -> str:
+        return f"{self.name}:{self.dim}:{int(self.bigrams)}:1"
+
+    def features(self, text: str) -> Counter:
+        tokens = _TOKEN.findall(text.lower())
+        features = Counter(tokens)
+        if self.bigrams:
+            features.update(f"{first} {second}" for first, second in zip(tokens, tokens[1:]))
+        return features
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        counters = [self.features(text) for text in texts]
+        total = sum(len(counter) for counter in counters)
+
+        signed = np.fromiter(
+            map(_hash_feature, (feature for counter in counters for feature in counter), repeat(self.dim)),
+            dtype=np.int64, count=total,
+        )
+        counts = np.fromiter(
+            (count for counter in counters for count in counter.values()), dtype=np.float64, count=total
+        )
+        rows = np.repeat(np.arange(len(texts), dtype=np.int64), [len(counter) for counter in counters])
+
+        # Colliding features add up before the sublinear transform
+        cells = rows * self.dim + np.abs(signed) - 1
+        matrix = np.bincount(cells, weights=np.sign(signed) * counts, minlength=len(texts) * self.dim)
+        matrix = matrix.astype(np.float32).reshape(len(texts), self.dim)
+        np.copysign(np.log1p(np.abs(matrix)), matrix, out=matrix)
+
+        return normalize_rows(matrix)
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Scale each row to unit length, leaving all-zero rows at zero"""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+EMBEDDERS: Dict[str, Callable[[], Embedder]] = {
+    "hashing": HashingEmbedder,
+}
+
+_embedders: Dict[str, Embedder] = {}
+
+
+def register_embedder(name: str, factory: Callable[[], Embedder]) -> None:
+    """Make a model available to `get_embedder` under `name`"""
+    EMBEDDERS[name] = factory
+    _embedders.pop(name, None)
+
+
+def get_embedder(name: str = "") -> Embedder:
+    """The configured embedding model, created once per process"""
+    name = name or settings.EMBEDDING_MODEL
+    if name not in _embedders:
+        if name not in EMBEDDERS:
+            raise ValueError(f"Unknown embedding model: {name}")
+        _embedders[name] = EMBEDDERS[name]()
+    return _embedders[name]
+
+
+def embedding_hash(text: str, embedder: Embedder) -> str:
+    """
+    Content hash stored next to a vector; changes with the text or the model.
+
+    Must match the SQL expression in the embedding pipeline, which filters
+    unchanged rows before their text leaves the database.
+    """
+    return hashlib.sha256(f"{embedder.version}\n{text}".encode("utf-8")).hexdigest()[:32]
+
+
+def to_pgvector(matrix: np.ndarray) -> List[str]:
+    """pgvector text literals, one per row, e.g. for query parameters"""
+    return ["[" + ",".join(map(repr, row)) + "]" for row in np.round(matrix, 6).tolist()]
+
+
+def to_pgvector_binary(matrix: np.ndarray) -> List[bytes]:
+    """
+    pgvector binary values, one per row, for COPY ... (FORMAT binary).
+
+    The wire format is an int16 dimension, an unused int16, then big-endian
+    float4s, so rows are sliced straight out of one byte-swapped array instead
+    of formatting every float as text.
+    """
+    header = struct.pack(">hh", matrix.shape[1], 0)
+    swapped = matrix.astype(">f4", copy=False)
+    return [header + row.tobytes() for row in swapped]
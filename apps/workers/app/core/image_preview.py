@@ -0,0 +1,70 @@
+from typing import Any, Dict, List, Sequence
+import io
+
+from PIL import Image, ImageOps
+
+from app.core.config import settings
+from app.core.pools import get_process_pool
+
+
+# Longest edge of each pyramid level, largest first
+PREVIEW_SIZES = (2048, 1024, 512, 256)
+PREVIEW_FORMAT = "JPEG"
+PREVIEW_QUALITY = 82
+
+
+def pyramid_sizes(width: int, height: int, sizes: Sequence[int] = PREVIEW_SIZES) -> List[int]:
+    """Levels worth generating for an image; never upscales past the original"""
+    longest = max(width, height)
+    levels = [size for size in sizes if size < longest]
+    return levels or [min(sizes)]
+
+
+def build_pyramid(path: str, sizes: Sequence[int] = PREVIEW_SIZES) -> List[Dict[str, Any]]:
+    """
+    Encode reduced-resolution previews of an image, largest first.
+
+    JPEGs are decoded in draft mode, which lets libjpeg scale by 1/2, 1/4 or
+    1/8 while decoding, so a 48 MP photo is never materialized at full size.
+    Each smaller level is resampled from the previous one rather than the
+    original.
+
+    Returns:
+        One dict per level with `size`, `width`, `height` and encoded `data`
+    """
+    with Image.open(path) as image:
+        levels = pyramid_sizes(image.width, image.height, sizes)
+        image.draft("RGB", (levels[0], levels[0]))
+        current = ImageOps.exif_transpose(image)
+        if current.mode not in ("RGB", "L"):
+            current = current.convert("RGB")
+
+        pyramid = []
+        for size in levels:
+            current = current.copy()
+            current.thumbnail((size, size), Image.LANCZOS)
+
+            buffer = io.BytesIO()
+            current.save(buffer, PREVIEW_FORMAT, quality=PREVIEW_QUALITY, optimize=True)
+            pyramid.append({
+                "size": size,
+                "width": current.width,
+                "height": current.height,
+                "data": buffer.getvalue(),
+            })
+
+    return pyramid
+
+
+def render_pyramid(path: str, sizes: Sequence[int] = PREVIEW_SIZES) -> List[Dict[str, Any]]:
+    """
+    Build a preview pyramid on the bounded "image" process pool.
+
+    The pool is capped at IMAGE_PREVIEW_WORKERS so a burst of large photos
+    cannot take every core from the rest of the worker. Runs in-process when
+    the worker cannot fork.
+    """
+    pool = get_process_pool("image", settings.IMAGE_PREVIEW_WORKERS)
+    if pool is None:
+        return build_pyramid(path, sizes)
+    return pool.submit(build_pyramid, path, tuple(sizes)).result()
@@ -0,0 +1,451 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, BinaryIO, Dict, Iterator, Optional, Tuple
+import struct
+
+from app.core import storage
+
+
+# Object reads are rounded out to whole blocks and cached, so walking many
+# small atom headers costs a handful of range requests
+PROBE_BLOCK_SIZE = 64 * 1024
+
+# A movie header up to this size is fetched in one request before it is walked
+MAX_PREFETCH_BYTES = 4 * 1024 * 1024
+
+# Bytes searched for the first MPEG audio frame after any ID3 tag
+MP3_SYNC_WINDOW = 64 * 1024
+
+# Most of an atom that is ever read; sample descriptions are all near the front
+MAX_ATOM_READ = 512
+
+_MP4_EPOCH = datetime(1904, 1, 1, tzinfo=timezone.utc)
+
+# Atoms that only hold other atoms, and the leaves that carry metadata. Every
+# other atom, including the sample tables and the media data, is skipped over
+_MP4_CONTAINERS = {b"moov", b"trak", b"mdia", b"minf", b"stbl", b"mvex"}
+_MP4_LEAVES = {b"mvhd", b"tkhd", b"mdhd", b"hdlr", b"stsd", b"mehd"}
+_MP4_TOP_LEVEL = {b"ftyp", b"moov", b"mdat", b"free", b"skip", b"wide", b"pnot", b"uuid"}
+
+_WAV_CODECS = {1: "pcm", 3: "pcm_float", 6: "alaw", 7: "mulaw", 0x55: "mp3", 0xFFFE: "pcm"}
+
+# (MPEG version, layer) -> kbit/s by bitrate index 1-14
+_MP3_BITRATES = {
+    (1, 1): (32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (1, 2): (32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (1, 3): (32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (2, 1): (32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (2, 2): (8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (2, 3): (8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_MP3_SAMPLE_RATES = (44100, 48000, 32000)
+
+
+class FileReader:
+    """Positional reads from a local file; each read is one seek"""
+
+    def __init__(self, handle: BinaryIO, size_bytes: int):
+        self.handle = handle
+        self.size_bytes = size_bytes
+        self.bytes_read = 0
+
+    def read_at(self, offset: int, size: int) -> bytes:
+        self.handle.seek(offset)
+        data = self.handle.read(max(0, min(size, self.size_bytes - offset)))
+        self.bytes_read += len(data)
+        return data
+
+    def prefetch(self, start: int, end: int) -> None:
+        pass
+
+
+class ObjectReader:
+    """Positional reads from a stored object through cached ranged GETs"""
+
+    def __init__(self, key: str, size_bytes: int, block_size: int = PROBE_BLOCK_SIZE):
+        self.key = key
+        self.size_bytes = size_bytes
+        self.block_size = block_size
+        self.bytes_read = 0
+        self.requests = 0
+        self._blocks: Dict[int, bytes] = {}
+
+    def _fetch(self, first: int, last: int) -> None:
+        """Load blocks first..last, one request per run of missing blocks"""
+        index = first
+        while index <= last:
+            if index in self._blocks:
+                index += 1
+                continue
+            run_end = index
+            while run_end < last and run_end + 1 not in self._blocks:
+                run_end += 1
+
+            start = index * self.block_size
+            end = min((run_end + 1) * self.block_size, self.size_bytes) - 1
+            body = storage.open_object(self.key, f"bytes={start}-{end}")
+            try:
+                data = body.read()
+            finally:
+                body.close()
+            self.bytes_read += len(data)
+            self.requests += 1
+
+            for block in range(index, run_end + 1):
+                offset = (block - index) * self.block_size
+                self._blocks[block] = data[offset:offset + self.block_size]
+            index = run_end + 1
+
+    def read_at(self, offset: int, size: int) -> bytes:
+        end = min(offset + size, self.size_bytes)
+        if offset >= end:
+            return b""
+        first, last = offset // self.block_size, (end - 1) // self.block_size
+        self._fetch(first, last)
+        data = b"".join(self._blocks[block] for block in range(first, last + 1))
+        skip = offset - first * self.block_size
+        return data[skip:skip + end - offset]
+
+    def prefetch(self, start: int, end: int) -> None:
+        """Load [start, end) in one request when it is small enough to be worth it"""
+        end = min(end, self.size_bytes)
+        if start < end and end - start <= MAX_PREFETCH_BYTES:
+            self._fetch(start // self.block_size, (end - 1) // self.block_size)
+
+
+def probe_media(reader) -> Dict[str, Any]:
+    """
+    Container metadata of an audio or video file.
+
+    Only headers are read: MP4/MOV atoms are walked by seeking past their
+    bodies, WAV chunks likewise, and MP3 duration comes from the first frame's
+    Xing/VBRI header or the bitrate. The cost does not depend on file size.
+
+    Returns:
+        `container` plus whichever of `duration_seconds`, `creation_time`,
+        `video_codec`, `width`, `height`, `audio_codec`, `sample_rate`,
+        `channels` and `bitrate` the file records
+
+    Raises:
+        ValueError: If the container is not MP4/MOV, WAV or MP3
+    """
+    head = reader.read_at(0, 16)
+    if head[:4] in (b"RIFF", b"RF64") and head[8:12] == b"WAVE":
+        metadata = probe_wav(reader)
+    elif head[4:8] in _MP4_TOP_LEVEL:
+        metadata = probe_mp4(reader)
+    elif head[:3] == b"ID3" or mp3_frame(head) is not None:
+        metadata = probe_mp3(reader)
+    else:
+        raise ValueError("Unrecognized media container")
+
+    return {key: value for key, value in metadata.items() if value is not None}
+
+
+def probe_file(path: str) -> Dict[str, Any]:
+    """probe_media for a local file"""
+    with open(path, "rb") as handle:
+        handle.seek(0, 2)
+        return probe_media(FileReader(handle, handle.tell()))
+
+
+def probe_object(key: str, size_bytes: int) -> Dict[str, Any]:
+    """probe_media for a stored object, through ranged GETs"""
+    return probe_media(ObjectReader(key, size_bytes))
+
+
+def _iso_time(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _seconds(duration: int, timescale: int) -> Optional[float]:
+    return round(duration / timescale, 3) if duration and timescale else None
+
+
+def mp4_atoms(reader, start: int, end: int) -> Iterator[Tuple[bytes, int, int]]:
+    """(type, payload start, end) of each atom in [start, end), without reading bodies"""
+    offset = start
+    while offset + 8 <= end:
+        header = reader.read_at(offset, 16)
+        if len(header) < 8:
+            return
+        size, kind = struct.unpack(">I4s", header[:8])
+        header_size = 8
+        if size == 1:
+            if len(header) < 16:
+                return
+            size = struct.unpack(">Q", header[8:16])[0]
+            header_size = 16
+        elif size == 0:
+            size = end - offset
+        if size < header_size:
+            return
+        yield kind, offset + header_size, min(offset + size, end)
+        offset += size
+
+
+def probe_mp4(reader) -> Dict[str, Any]:
+    """Metadata from the movie header and the first video and audio tracks"""
+    metadata: Dict[str, Any] = {"container": "mp4"}
+    movie: Dict[str, int] = {}
+    tracks = []
+    seen_ftyp = False
+
+    def walk(start: int, end: int, track: Optional[Dict[str, Any]]) -> None:
+        for kind, body_start, body_end in mp4_atoms(reader, start, end):
+            if kind == b"trak":
+                track = {}
+                tracks.append(track)
+            if kind in _MP4_CONTAINERS:
+                walk(body_start, body_end, track)
+            elif kind in _MP4_LEAVES:
+                body = reader.read_at(body_start, min(body_end - body_start, MAX_ATOM_READ))
+                parse_mp4_leaf(kind, body, movie, track)
+
+    for kind, body_start, body_end in mp4_atoms(reader, 0, reader.size_bytes):
+        if kind == b"ftyp" and not seen_ftyp:
+            seen_ftyp = True
+            if reader.read_at(body_start, 4) == b"qt  ":
+                metadata["container"] = "mov"
+        elif kind == b"moov":
+            reader.prefetch(body_start, body_end)
+            walk(body_start, body_end, None)
+            break
+
+    if not seen_ftyp:
+        # QuickTime files from before the ftyp atom existed
+        metadata["container"] = "mov"
+    if "timescale" not in movie:
+        raise ValueError("MP4 file has no movie header")
+
+    metadata["duration_seconds"] = _seconds(movie.get("duration", 0), movie["timescale"])
+    if movie.get("created"):
+        metadata["creation_time"] = _iso_time(_MP4_EPOCH + timedelta(seconds=movie["created"]))
+
+    for track in tracks:
+        if track.get("handler") == b"vide" and "video_codec" not in metadata:
+            metadata["video_codec"] = track.get("codec")
+            metadata["width"] = track.get("width") or track.get("display_width")
+            metadata["height"] = track.get("height") or track.get("display_height")
+            metadata["duration_seconds"] = metadata["duration_seconds"] or _seconds(
+                track.get("duration", 0), track.get("timescale", 0)
+            )
+        elif track.get("handler") == b"soun" and "audio_codec" not in metadata:
+            metadata["audio_codec"] = track.get("codec")
+            metadata["sample_rate"] = track.get("sample_rate")
+            metadata["channels"] = track.get("channels")
+
+    return metadata
+
+
+def parse_mp4_leaf(kind: bytes, body: bytes, movie: Dict[str, int], track: Optional[Dict[str, Any]]) -> None:
+    """Fold one metadata atom into the movie or current track"""
+    if len(body) < 4:
+        return
+    version = body[0]
+
+    if kind in (b"mvhd", b"mdhd"):
+        if version == 1 and len(body) >= 32:
+            created, _, timescale, duration = struct.unpack(">QQIQ", body[4:32])
+        elif len(body) >= 20:
+            created, _, timescale, duration = struct.unpack(">IIII", body[4:20])
+        else:
+            return
+        if kind == b"mvhd":
+            movie.update(created=created, timescale=timescale, duration=duration)
+        elif track is not None:
+            track.update(timescale=timescale, duration=duration)
+
+    elif kind == b"mehd":
+        # Fragmented files leave the movie duration at zero and record it here
+        if not movie.get("duration"):
+            if version == 1 and len(body) >= 12:
+                movie["duration"] = struct.unpack(">Q", body[4:12])[0]
+            elif len(body) >= 8:
+                movie["duration"] = struct.unpack(">I", body[4:8])[0]
+
+    elif track is None:
+        return
+
+    elif kind == b"tkhd" and len(body) >= 8:
+        # Presentation size as 16.16 fixed point in the last eight bytes
+        width, height = struct.unpack(">II", body[-8:])
+        track.update(display_width=width >> 16, display_height=height >> 16)
+
+    elif kind == b"hdlr" and len(body) >= 12:
+        track["handler"] = body[8:12]
+
+    elif kind == b"stsd" and len(body) >= 16:
+        # First sample description: size, format, then the format's fields
+        track["codec"] = body[12:16].decode("latin-1").strip()
+        entry = body[16:]
+        if track.get("handler") == b"vide" and len(entry) >= 28:
+            track["width"], track["height"] = struct.unpack(">HH", entry[24:28])
+        elif track.get("handler") == b"soun" and len(entry) >= 28:
+            channels, _, _, _, rate = struct.unpack(">HHHHI", entry[16:28])
+            track.update(channels=channels, sample_rate=rate >> 16)
+
+
+def probe_wav(reader) -> Dict[str, Any]:
+    """Metadata from the format, data and broadcast-extension chunks of a WAV file"""
+    metadata: Dict[str, Any] = {"container": "wav"}
+    data_size = None
+    byte_rate = 0
+    large_data_size = None
+    offset = 12
+
+    while offset + 8 <= reader.size_bytes:
+        kind, size = struct.unpack("<4sI", reader.read_at(offset, 8))
+        body_start = offset + 8
+
+        if kind == b"ds64":
+            # RF64 keeps sizes past 4 GB here and sets the 32-bit ones to -1
+            large_data_size = struct.unpack("<Q", reader.read_at(body_start + 8, 8))[0]
+        elif kind == b"fmt ":
+            tag, channels, rate, byte_rate = struct.unpack("<HHII", reader.read_at(body_start, 12))
+            metadata.update(audio_codec=_WAV_CODECS.get(tag, f"0x{tag:04x}"), channels=channels, sample_rate=rate)
+            metadata["bitrate"] = byte_rate * 8
+        elif kind == b"bext":
+            # Broadcast WAV origination date and time, as recorders write them
+            stamp = reader.read_at(body_start + 320, 18).decode("ascii", "replace")
+            metadata["creation_time"] = bext_time(stamp)
+        elif kind == b"data":
+            data_size = large_data_size if size == 0xFFFFFFFF and large_data_size is not None else size
+            if byte_rate:
+                break
+
+        # Chunks are word aligned
+        offset = body_start + size + (size & 1)
+
+    if data_size is not None and byte_rate:
+        metadata["duration_seconds"] = round(min(data_size, reader.size_bytes) / byte_rate, 3)
+    return metadata
+
+
+def bext_time(stamp: str) -> Optional[str]:
+    """'YYYY-MM-DDHH:MM:SS' (any separators) as ISO 8601 recorder local time, or None"""
+    digits = "".join(character for character in stamp if character.isdigit())
+    try:
+        return datetime.strptime(digits[:14], "%Y%m%d%H%M%S").isoformat()
+    except ValueError:
+        return None
+
+
+def mp3_frame(header: bytes) -> Optional[Dict[str, int]]:
+    """Decode a 4-byte MPEG audio frame header, or None if it is not one"""
+    if len(header) < 4 or header[0] != 0xFF or header[1] & 0xE0 != 0xE0:
+        return None
+    version_bits = (header[1] >> 3) & 3
+    layer = 4 - ((header[1] >> 1) & 3)
+    bitrate_index = header[2] >> 4
+    rate_index = (header[2] >> 2) & 3
+    if version_bits == 1 or layer == 4 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    version = 1 if version_bits == 3 else 2
+    bitrate = _MP3_BITRATES[(version, layer)][bitrate_index - 1] * 1000
+    # MPEG 2.5 halves the MPEG 2 rates again
+    sample_rate = _MP3_SAMPLE_RATES[rate_index] // {3: 1, 2: 2, 0: 4}[version_bits]
+    samples = 384 if layer == 1 else 576 if layer == 3 and version == 2 else 1152
+    padding = (header[2] >> 1) & 1
+    if layer == 1:
+        length = (12 * bitrate // sample_rate + padding) * 4
+    else:
+        length = samples // 8 * bitrate // sample_rate + padding
+
+    return {
+        "version": version,
+        "layer": layer,
+        "bitrate": bitrate,
+        "sample_rate": sample_rate,
+        "samples": samples,
+        "length": length,
+        "channels": 1 if header[3] >> 6 == 3 else 2,
+    }
+
+
+def probe_mp3(reader) -> Dict[str, Any]:
+    """Metadata from the ID3 tag and first frame of an MP3 file"""
+    metadata: Dict[str, Any] = {"container": "mp3"}
+    audio_start = 0
+
+    head = reader.read_at(0, 10)
+    if head[:3] == b"ID3" and len(head) == 10:
+        tag_size = syncsafe(head[6:10])
+        audio_start = 10 + tag_size + (10 if head[5] & 0x10 else 0)
+        metadata["creation_time"] = id3_recording_time(reader.read_at(10, min(tag_size, MP3_SYNC_WINDOW)), head[3])
+
+    window = reader.read_at(audio_start, MP3_SYNC_WINDOW)
+    position = window.find(b"\xff")
+    frame = None
+    while position != -1:
+        frame = mp3_frame(window[position:position + 4])
+        # A real frame is followed by another one, which random bytes rarely are
+        if frame is not None:
+            following = position + frame["length"]
+            if following + 4 > len(window) or mp3_frame(window[following:following + 4]) is not None:
+                break
+        frame = None
+        position = window.find(b"\xff", position + 1)
+    if frame is None:
+        raise ValueError("No MPEG audio frame found")
+
+    audio_start += position
+    metadata.update(
+        audio_codec=f"mp{frame['layer']}",
+        sample_rate=frame["sample_rate"],
+        channels=frame["channels"],
+        bitrate=frame["bitrate"],
+    )
+
+    frames = vbr_frame_count(window[position:position + 64], frame)
+    if frames:
+        metadata["duration_seconds"] = round(frames * frame["samples"] / frame["sample_rate"], 3)
+        metadata["bitrate"] = None
+    else:
+        audio_end = reader.size_bytes
+        if reader.read_at(audio_end - 128, 3) == b"TAG":
+            audio_end -= 128
+        metadata["duration_seconds"] = round((audio_end - audio_start) * 8 / frame["bitrate"], 3)
+
+    return metadata
+
+
+def vbr_frame_count(first_frame: bytes, frame: Dict[str, int]) -> Optional[int]:
+    """Frame count from a Xing/Info or VBRI header in the first frame"""
+    stereo = frame["channels"] == 2
+    side_info = (32 if stereo else 17) if frame["version"] == 1 else (17 if stereo else 9)
+    xing = first_frame[4 + side_info:4 + side_info + 12]
+    if xing[:4] in (b"Xing", b"Info") and len(xing) == 12 and struct.unpack(">I", xing[4:8])[0] & 1:
+        return struct.unpack(">I", xing[8:12])[0]
+    vbri = first_frame[36:54]
+    if vbri[:4] == b"VBRI" and len(vbri) == 18:
+        return struct.unpack(">I", vbri[14:18])[0]
+    return None
+
+
+def syncsafe(data: bytes) -> int:
+    """ID3 integer with seven bits per byte"""
+    value = 0
+    for byte in data:
+        value = (value << 7) | (byte & 0x7F)
+    return value
+
+
+def id3_recording_time(tag: bytes, major_version: int) -> Optional[str]:
+    """Recording time (TDRC, or TYER in ID3v2.3) from the frames of an ID3v2 tag"""
+    if major_version not in (3, 4):
+        return None
+    wanted = (b"TDRC", b"TYER")
+    offset = 0
+    while offset + 10 <= len(tag):
+        frame_id = tag[offset:offset + 4]
+        if not frame_id.strip(b"\x00"):
+            # Padding
+            return None
+        size = syncsafe(tag[offset + 4:offset + 8]) if major_version == 4 else struct.unpack(">I", tag[offset + 4:offset + 8])[0]
+        body = tag[offset + 10:offset + 10 + size]
+        if frame_id in wanted and body:
+            encoding = {0: "latin-1", 1: "utf-16", 2: "utf-16-be", 3: "utf-8"}.get(body[0], "latin-1")
+            return body[1:].decode(encoding, "replace").strip("\x00").strip() or None
+        offset += 10 + size
+    return None
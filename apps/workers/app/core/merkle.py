@@ -0,0 +1,172 @@
+from typing import List, Optional, Tuple
+import hashlib
+import struct
+
+from app.core.config import settings
+
+
+# Sidecar layout: magic, format version, chunk size, content size, then one
+# 32-byte SHA-256 per chunk
+SIDECAR_MAGIC = b"MRKL"
+SIDECAR_VERSION = 1
+_HEADER = struct.Struct(">4sBIQ")
+
+DIGEST_SIZE = 32
+
+# Leaves and inner nodes are hashed with different prefixes, so a leaf can
+# never be passed off as a subtree (RFC 6962)
+_LEAF = b"\x00"
+_NODE = b"\x01"
+
+
+def leaf_hash(chunk: bytes) -> bytes:
+    digest = hashlib.sha256(_LEAF)
+    digest.update(chunk)
+    return digest.digest()
+
+
+def merkle_root(leaves: bytes) -> bytes:
+    """Root over concatenated leaf digests; an unpaired node moves up unchanged"""
+    level = [leaves[offset:offset + DIGEST_SIZE] for offset in range(0, len(leaves), DIGEST_SIZE)]
+    if not level:
+        return leaf_hash(b"")
+
+    while len(level) > 1:
+        paired = [hashlib.sha256(_NODE + level[i] + level[i + 1]).digest() for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            paired.append(level[-1])
+        level = paired
+
+    return level[0]
+
+
+class MerkleTree:
+    """
+    Chunk hashes of a blob and the Merkle root over them.
+
+    The root is the chain-of-custody checksum. Any byte range is verified by
+    hashing only the chunks it touches against the stored leaves, and the
+    leaves themselves are trusted once they reproduce the recorded root.
+    """
+
+    def __init__(self, chunk_size: int, size_bytes: int, leaves: bytes):
+        self.chunk_size = chunk_size
+        self.size_bytes = size_bytes
+        self.leaves = leaves
+        self._root: Optional[bytes] = None
+
+    def __len__(self) -> int:
+        return len(self.leaves) // DIGEST_SIZE
+
+    @property
+    def root(self) -> bytes:
+        if self._root is None:
+            self._root = merkle_root(self.leaves)
+        return self._root
+
+    @property
+    def hexroot(self) -> str:
+        return self.root.hex()
+
+    def leaf(self, index: int) -> bytes:
+        return self.leaves[index * DIGEST_SIZE:(index + 1) * DIGEST_SIZE]
+
+    def chunk_range(self, start: int, end: int) -> range:
+        """Indexes of the chunks overlapping bytes [start, end)"""
+        end = min(end, self.size_bytes)
+        if start >= end:
+            return range(0)
+        return range(start // self.chunk_size, (end - 1) // self.chunk_size + 1)
+
+    def chunk_bounds(self, index: int) -> Tuple[int, int]:
+        """Byte range [start, end) of one chunk"""
+        start = index * self.chunk_size
+        return start, min(start + self.chunk_size, self.size_bytes)
+
+    def verify_chunk(self, index: int, chunk: bytes) -> bool:
+        start, end = self.chunk_bounds(index)
+        return len(chunk) == end - start and leaf_hash(chunk) == self.leaf(index)
+
+    def verify_chunks(self, data: bytes, first: int) -> List[int]:
+        """
+        Check consecutive whole chunks starting at chunk `first`.
+
+        Returns:
+            Indexes of chunks whose content does not match, empty if all do
+        """
+        view = memoryview(data)
+        mismatched = []
+        index = first
+        while view:
+            start, end = self.chunk_bounds(index)
+            if not self.verify_chunk(index, view[:end - start].tobytes()):
+                mismatched.append(index)
+            view = view[end - start:]
+            index += 1
+        return mismatched
+
+    def to_sidecar(self) -> bytes:
+        return _HEADER.pack(SIDECAR_MAGIC, SIDECAR_VERSION, self.chunk_size, self.size_bytes) + self.leaves
+
+    @classmethod
+    def from_sidecar(cls, data: bytes) -> "MerkleTree":
+        magic, version, chunk_size, size_bytes = _HEADER.unpack_from(data)
+        if magic != SIDECAR_MAGIC or version != SIDECAR_VERSION:
+            raise ValueError("Not a Merkle sidecar or unsupported version")
+        leaves = data[_HEADER.size:]
+        if len(leaves) % DIGEST_SIZE or len(leaves) // DIGEST_SIZE != max(1, -(-size_bytes // chunk_size)):
+            raise ValueError("Truncated Merkle sidecar")
+        return cls(chunk_size, size_bytes, leaves)
+
+
+class MerkleHasher:
+    """
+    Incremental builder for a MerkleTree.
+
+    Data may arrive in any slicing. `rewind` drops back to an earlier chunk
+    boundary, so an interrupted transfer resumes there and only rehashes the
+    chunk that was cut off.
+    """
+
+    def __init__(self, chunk_size: int = 0):
+        self.chunk_size = chunk_size or settings.CUSTODY_CHUNK_SIZE
+        self.size_bytes = 0
+        self._leaves = bytearray()
+        self._pending = bytearray()
+
+    @property
+    def pending_bytes(self) -> int:
+        """Bytes of the current, unfinished chunk"""
+        return len(self._pending)
+
+    def update(self, data: bytes) -> None:
+        view = memoryview(data)
+        self.size_bytes += len(view)
+
+        if self._pending:
+            take = self.chunk_size - len(self._pending)
+            self._pending += view[:take]
+            view = view[take:]
+            if len(self._pending) < self.chunk_size:
+                return
+            self._leaves += leaf_hash(bytes(self._pending))
+            self._pending.clear()
+
+        whole = len(view) - len(view) % self.chunk_size
+        for offset in range(0, whole, self.chunk_size):
+            self._leaves += leaf_hash(view[offset:offset + self.chunk_size])
+        self._pending += view[whole:]
+
+    def rewind(self, size_bytes: int) -> None:
+        """Forget everything after `size_bytes`, which must be a chunk boundary already hashed"""
+        if size_bytes % self.chunk_size or size_bytes > self.size_bytes - len(self._pending):
+            raise ValueError(f"Cannot rewind to {size_bytes}")
+        del self._leaves[size_bytes // self.chunk_size * DIGEST_SIZE:]
+        self._pending.clear()
+        self.size_bytes = size_bytes
+
+    def finish(self) -> MerkleTree:
+        leaves = bytes(self._leaves)
+        if self._pending or not leaves:
+            leaves += leaf_hash(bytes(self._pending))
+        return MerkleTree(self.chunk_size, self.size_bytes, leaves)
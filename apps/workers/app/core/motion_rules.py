@@ -0,0 +1,205 @@
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, NamedTuple, Optional, Pattern, Tuple
+import json
+import os
+import re
+import threading
+import time
+
+from app.core.cache import content_key
+from app.core.config import settings
+
+
+RULES_PATH = Path(__file__).resolve().parent.parent / "rules" / "motions.json"
+
+# How often, at most, the rule file's modification time is checked
+RELOAD_CHECK_SECONDS = 2.0
+
+_ESCAPE = re.compile(r"\\.")
+
+
+class MotionRule(NamedTuple):
+    status: str
+    reasoning: str
+
+
+class MotionKind(NamedTuple):
+    """
+    Compiled rules for one kind of motion.
+
+    `scanners[k]` is one alternation of the first k patterns. A brief is read
+    with the widest scanner; each candidate position is checked against only
+    the rules that outrank the best match so far, and scanning continues with
+    the narrower scanner for those rules. One forward pass therefore finds
+    the highest-priority rule matching anywhere, which is what trying each
+    rule's pattern in turn would return.
+
+    When every pattern is a plain list of phrases, `phrases` holds them and
+    the brief is searched with substring tests instead, which is an order
+    of magnitude faster than any alternation in the re module.
+    """
+    label: str
+    patterns: Tuple[Pattern[str], ...]
+    rules: Tuple[MotionRule, ...]
+    scanners: Tuple[Optional[Pattern[str]], ...]
+    default: MotionRule
+    phrases: Optional[Tuple[Tuple[str, ...], ...]] = None
+
+    def rule_for(self, arguments: str) -> MotionRule:
+        text = arguments.lower()
+        if self.phrases is not None:
+            for rule, phrases in zip(self.rules, self.phrases):
+                if any(phrase in text for phrase in phrases):
+                    return rule
+            return self.default
+
+        best = len(self.patterns)
+        position = 0
+
+        while best > 0:
+            candidate = self.scanners[best].search(text, position)
+            if candidate is None:
+                break
+            start = candidate.start()
+            for index in range(best):
+                if self.patterns[index].match(text, start):
+                    best = index
+                    break
+            position = start + 1
+
+        return self.rules[best] if best < len(self.rules) else self.default
+
+
+class MotionRuleSet(NamedTuple):
+    """Immutable motion rules from one version of the rule file"""
+    version: str
+    kinds: Mapping[str, MotionKind]
+    fallback: MotionKind
+    statuses: Mapping[str, str]
+
+    def kind(self, kind: Optional[str]) -> MotionKind:
+        return self.kinds.get(kind or "", self.fallback)
+
+    def ruling_text(self, status: str, kind: Optional[str]) -> str:
+        """e.g. 'Motion to suppress GRANTED IN PART'; unknown kinds get a generic ruling"""
+        motion = self.kinds.get(kind or "")
+        if motion is None or status not in self.statuses:
+            return f"Motion {status.upper()}"
+        return f"{motion.label} {self.statuses[status]}"
+
+
+def _compile(pattern: str) -> Pattern[str]:
+    # Briefs are lowercased once instead of matching case-insensitively,
+    # which is several times slower in the re module
+    if _ESCAPE.sub("", pattern) != _ESCAPE.sub("", pattern).lower():
+        raise ValueError(f"Motion rule patterns must be lowercase: {pattern!r}")
+    return re.compile(pattern)
+
+
+def _phrases(pattern: str) -> Optional[Tuple[str, ...]]:
+    """The alternatives of a pattern that is only literal phrases, else None"""
+    alternatives = tuple(pattern.split("|"))
+    if all(alternative and re.escape(alternative).replace("\\ ", " ") == alternative for alternative in alternatives):
+        return alternatives
+    return None
+
+
+def build_rule_set(data: Dict[str, Any]) -> MotionRuleSet:
+    """
+    Compile raw rule file data.
+
+    Raises:
+        ValueError: If a pattern does not compile or is not lowercase, or a
+            rule uses a status the file does not define
+    """
+    statuses = dict(data["statuses"])
+    kinds: Dict[str, MotionKind] = {}
+
+    for name, section in data["kinds"].items():
+        rules = []
+        patterns = []
+        for rule in section["rules"]:
+            if rule["status"] not in statuses:
+                raise ValueError(f"Unknown motion status {rule['status']!r} in {name}")
+            try:
+                patterns.append(_compile(rule["pattern"]))
+            except re.error as exc:
+                raise ValueError(f"Bad motion rule pattern {rule['pattern']!r} in {name}: {exc}") from exc
+            rules.append(MotionRule(rule["status"], rule["reasoning"]))
+
+        scanners = [None] + [
+            re.compile("|".join(f"(?:{pattern.pattern})" for pattern in patterns[:count]))
+            for count in range(1, len(patterns) + 1)
+        ]
+        phrases = tuple(_phrases(pattern.pattern) for pattern in patterns)
+        default = section["default"]
+        kinds[name] = MotionKind(
+            section["label"],
+            tuple(patterns),
+            tuple(rules),
+            tuple(scanners),
+            MotionRule(default["status"], default["reasoning"]),
+            phrases if None not in phrases else None,
+        )
+
+    return MotionRuleSet(
+        version=f"{data.get('version', '0')}-{content_key(data)[:12]}",
+        kinds=MappingProxyType(kinds),
+        fallback=kinds[data["fallback_kind"]],
+        statuses=MappingProxyType(statuses),
+    )
+
+
+def load_rule_set(path: Path) -> MotionRuleSet:
+    with path.open(encoding="utf-8") as handle:
+        return build_rule_set(json.load(handle))
+
+
+class MotionRuleSource:
+    """
+    The current motion rules, reloaded when the rule file changes.
+
+    A changed file is compiled completely before it replaces the old rules,
+    so callers see either the old set or the new one, never a mix. A file
+    that fails to load leaves the old rules in place and is recorded in
+    `last_error` until it is fixed.
+    """
+
+    def __init__(self, path: Path, check_interval: float = RELOAD_CHECK_SECONDS):
+        self.path = path
+        self.check_interval = check_interval
+        self.last_error: Optional[str] = None
+        self._lock = threading.Lock()
+        self._stamp = self._file_stamp()
+        self._rules = load_rule_set(path)
+        self._checked_at = time.monotonic()
+
+    def _file_stamp(self) -> Tuple[int, int]:
+        status = os.stat(self.path)
+        return status.st_mtime_ns, status.st_size
+
+    def get(self) -> MotionRuleSet:
+        if time.monotonic() - self._checked_at >= self.check_interval:
+            self.reload_if_changed()
+        return self._rules
+
+    def reload_if_changed(self) -> bool:
+        """Swap in the rule file if it changed; returns whether it did"""
+        with self._lock:
+            self._checked_at = time.monotonic()
+            try:
+                stamp = self._file_stamp()
+                if stamp == self._stamp:
+                    return False
+                rules = load_rule_set(self.path)
+            except (OSError, ValueError, KeyError, TypeError) as exc:
+                self.last_error = f"{type(exc).__name__}: {exc}"
+                return False
+
+            self._rules, self._stamp = rules, stamp
+            self.last_error = None
+            return True
+
+
+motion_rules = MotionRuleSource(Path(settings.MOTION_RULES_PATH) if settings.MOTION_RULES_PATH else RULES_PATH)
@@ -0,0 +1,199 @@
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+import re
+import time
+
+from app.core.config import settings
+
+
+# Question structures counted for compound questions
+STACKED_QUESTIONS = "three or more questions"
+CONJOINED_QUESTION = "question joining clauses"
+
+_TERMINATORS = re.compile(r"[.!?]+")
+_CONJUNCTION = re.compile(r"\b(?:and|but|or)\b")
+
+
+class ObjectionGround(NamedTuple):
+    key: str
+    ground: str
+    description: str
+    # Phrases, or for a structural ground the question structures it counts
+    patterns: Tuple[str, ...]
+    structural: bool = False
+
+
+OBJECTION_GROUNDS: Tuple[ObjectionGround, ...] = (
+    ObjectionGround(
+        "hearsay", "Hearsay", "Out-of-court statement offered for truth",
+        ("he said", "she said", "they said", "told me", "heard that",
+         "according to", "someone told me", "word on the street"),
+    ),
+    ObjectionGround(
+        "leading", "Leading Question", "Question suggests the answer",
+        ("isn't it true that", "wouldn't you agree", "don't you think",
+         "you would say", "you must admit", "you have to agree"),
+    ),
+    ObjectionGround(
+        "compound", "Compound Question", "Multiple questions in one",
+        (STACKED_QUESTIONS, CONJOINED_QUESTION),
+        structural=True,
+    ),
+    ObjectionGround(
+        "argumentative", "Argumentative", "Question is argumentative or inflammatory",
+        ("how dare you", "how could you", "why would anyone",
+         "what kind of person", "don't you feel guilty"),
+    ),
+    ObjectionGround(
+        "asked_and_answered", "Asked and Answered", "Question already asked and answered",
+        ("we already covered", "you already answered", "we discussed this"),
+    ),
+    ObjectionGround(
+        "relevance", "Relevance", "Evidence not relevant to case",
+        ("what does this have to do", "how is this relevant",
+         "what's the point", "why are we talking about"),
+    ),
+    ObjectionGround(
+        "speculation", "Speculation", "Witness speculating without foundation",
+        ("what do you think", "what might have", "what could have",
+         "in your opinion", "what if"),
+    ),
+    ObjectionGround(
+        "character", "Character Evidence", "Character evidence not admissible",
+        ("what kind of person", "are you a", "do you often",
+         "have you ever", "your reputation"),
+    ),
+    ObjectionGround(
+        "privilege", "Privilege", "Protected by privilege",
+        ("attorney client", "doctor patient", "spousal privilege",
+         "confidential", "privileged"),
+    ),
+    ObjectionGround(
+        "best_evidence", "Best Evidence", "Original document required",
+        ("copy of", "photograph of", "description of",
+         "summary of", "instead of the original"),
+    ),
+)
+
+
+class PatternHit(NamedTuple):
+    ground: ObjectionGround
+    pattern: str
+    count: int
+
+
+class TurnScan(NamedTuple):
+    hits: List[PatternHit]
+    # Only the last max_chars characters were scanned
+    truncated: bool
+    # The time budget ran out; counts are from the patterns reached
+    over_budget: bool
+
+
+def segment_questions(line: str) -> List[str]:
+    """The sentences of one line that end in a question mark, terminators included"""
+    questions = []
+    start = 0
+    for terminator in _TERMINATORS.finditer(line):
+        if "?" in terminator.group():
+            questions.append(line[start:terminator.end()])
+        start = terminator.end()
+    return questions
+
+
+def question_structure(
+    text: str,
+    deadline: Optional[float] = None,
+    clock: Callable[[], float] = time.perf_counter,
+) -> Tuple[Dict[str, int], bool]:
+    """
+    Compound question structures in a lowercased turn, and whether it was read to the end.
+
+    A line asking three or more questions counts once as stacked, and each
+    question joining clauses with and, but or or counts as conjoined. Both
+    are read from sentence boundaries and whole words, so the cost is linear
+    in the length of the turn however many question marks it holds. The
+    deadline is read from `clock` before each line.
+    """
+    counts = {STACKED_QUESTIONS: 0, CONJOINED_QUESTION: 0}
+    for line in text.splitlines():
+        if deadline is not None and clock() > deadline:
+            return counts, False
+        if "?" not in line:
+            continue
+        questions = segment_questions(line)
+        if len(questions) >= 3:
+            counts[STACKED_QUESTIONS] += 1
+        counts[CONJOINED_QUESTION] += sum(1 for question in questions if _CONJUNCTION.search(question))
+    return counts, True
+
+
+class ObjectionScanner:
+    """
+    Every objection ground's matches in a turn, from patterns prepared once.
+
+    Phrases are counted with str.count on the lowercased turn, which is what
+    re.findall would count and faster on turns of a few hundred characters
+    than a single alternation of them all. A phrase shared by several
+    grounds is counted once. Compound questions are counted structurally by
+    question_structure. Matching is linear in the turn, and a turn longer
+    than max_chars is scanned from its last max_chars characters, where the
+    question being objected to is. A scan that still runs past budget_ms
+    stops and reports the counts it has; `clock` is what it is timed by.
+    """
+
+    def __init__(
+        self,
+        grounds: Iterable[ObjectionGround] = OBJECTION_GROUNDS,
+        max_chars: Optional[int] = None,
+        budget_ms: Optional[float] = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        self.grounds = tuple(grounds)
+        self.max_chars = max_chars if max_chars is not None else settings.OBJECTION_MAX_TURN_CHARS
+        self.budget_ms = budget_ms if budget_ms is not None else settings.OBJECTION_SCAN_BUDGET_MS
+        self.clock = clock
+        self.phrases = tuple(dict.fromkeys(
+            pattern for ground in self.grounds if not ground.structural for pattern in ground.patterns
+        ))
+        self.structural = any(ground.structural for ground in self.grounds)
+
+    def pattern_counts(self, text: str, deadline: Optional[float] = None) -> Tuple[Dict[str, int], bool]:
+        """Non-zero match counts by pattern in lowercased text, and whether every pattern was counted"""
+        counts: Dict[str, int] = {}
+        for phrase in self.phrases:
+            count = text.count(phrase)
+            if count:
+                counts[phrase] = count
+
+        # Phrase counting is bounded by the length cap; the deadline is
+        # checked between lines of the structural pass
+        complete = True
+        if self.structural:
+            structures, complete = question_structure(text, deadline, self.clock)
+            counts.update((name, count) for name, count in structures.items() if count)
+        return counts, complete
+
+    def scan(self, turn_text: str) -> TurnScan:
+        """Matched patterns in ground order, then pattern order"""
+        deadline = self.clock() + self.budget_ms / 1000
+        truncated = len(turn_text) > self.max_chars
+        text = (turn_text[-self.max_chars:] if truncated else turn_text).lower()
+        counts, complete = self.pattern_counts(text, deadline)
+        hits = [
+            PatternHit(ground, pattern, counts[pattern])
+            for ground in self.grounds
+            for pattern in ground.patterns
+            if pattern in counts
+        ]
+        return TurnScan(hits, truncated, not complete)
+
+
+def ground_counts(hits: Iterable[PatternHit]) -> Dict[str, int]:
+    """Total matches by ground key, for grounds with any"""
+    counts: Dict[str, int] = {}
+    for hit in hits:
+        counts[hit.ground.key] = counts.get(hit.ground.key, 0) + hit.count
+    return counts
+
+
+objection_scanner = ObjectionScanner()
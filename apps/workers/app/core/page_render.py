@@ -0,0 +1,222 @@
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import suppress
+from typing import Dict, NamedTuple, Optional, Tuple
+import os
+import threading
+import uuid
+
+import fitz  # PyMuPDF
+
+from app.core import storage
+from app.core.blob_store import blob_store, derived_key
+from app.core.config import settings
+from app.core.pools import get_process_pool
+
+
+# Zoom 1.0 renders at 72 dpi; requests are clamped and rounded so near-equal
+# zooms share cache entries
+MIN_ZOOM = 0.25
+MAX_ZOOM = 4.0
+
+RenderKey = Tuple[str, int, float]
+
+
+class RenderedPage(NamedTuple):
+    png: bytes
+    width: int
+    height: int
+    page_count: int
+
+
+# Open documents in this process, most recently used last. Reopening a PDF
+# means parsing its xref table again, which dominates rendering small pages
+_documents: "OrderedDict[str, fitz.Document]" = OrderedDict()
+_documents_pid: Optional[int] = None
+
+
+def _open_document(path: str) -> fitz.Document:
+    global _documents_pid
+    if _documents_pid != os.getpid():
+        # Inherited across a fork: the parent's handles are not ours to close
+        _documents.clear()
+        _documents_pid = os.getpid()
+
+    document = _documents.get(path)
+    if document is None:
+        document = fitz.open(path)
+        _documents[path] = document
+        while len(_documents) > settings.PAGE_RENDER_DOCUMENTS:
+            _documents.popitem(last=False)[1].close()
+    else:
+        _documents.move_to_end(path)
+    return document
+
+
+def render_page(path: str, page: int, zoom: float) -> RenderedPage:
+    """Rasterize one zero-based page to PNG with this process's cached document"""
+    document = _open_document(path)
+    pixmap = document[page].get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+    return RenderedPage(pixmap.tobytes("png"), pixmap.width, pixmap.height, len(document))
+
+
+def _warm() -> int:
+    return os.getpid()
+
+
+def normalize_zoom(zoom: float) -> float:
+    return round(min(max(zoom, MIN_ZOOM), MAX_ZOOM), 2)
+
+
+class PageRenderer:
+    """
+    On-demand PDF page rendering on a warm process pool.
+
+    Each pool worker keeps its recently opened documents, and rendered pages
+    are kept in an LRU bounded by PAGE_RENDER_CACHE_BYTES and keyed by
+    (checksum, page, zoom). A request also queues the next
+    PAGE_RENDER_PREFETCH pages, so a reader scrolling forward finds them
+    already rendered; a request for a page that is still being rendered
+    waits for that render instead of starting another. Without a pool
+    (prefork workers) pages render in-process and nothing is prefetched.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None, prefetch: Optional[int] = None):
+        self.max_bytes = max_bytes if max_bytes is not None else settings.PAGE_RENDER_CACHE_BYTES
+        self.prefetch = prefetch if prefetch is not None else settings.PAGE_RENDER_PREFETCH
+        self.size_bytes = 0
+        self._rendered: "OrderedDict[RenderKey, RenderedPage]" = OrderedDict()
+        self._pending: Dict[RenderKey, Future] = {}
+        self._sources: "OrderedDict[str, str]" = OrderedDict()
+        self._published: Dict[RenderKey, str] = {}
+        # Reentrant: a render that finishes while it is being submitted runs
+        # its done callback on the submitting thread
+        self._lock = threading.RLock()
+        self._warm_pid: Optional[int] = None
+
+    def _pool(self):
+        pool = get_process_pool("render", settings.PAGE_RENDER_WORKERS)
+        if pool is not None and self._warm_pid != os.getpid():
+            # Start every worker now rather than one per cold request
+            for future in [pool.submit(_warm) for _ in range(settings.PAGE_RENDER_WORKERS)]:
+                future.result()
+            self._warm_pid = os.getpid()
+        return pool
+
+    def local_path(self, checksum: str) -> str:
+        """Local copy of an exhibit PDF, downloaded once and kept for the most recent documents"""
+        with self._lock:
+            path = self._sources.get(checksum)
+            if path is not None:
+                # Another worker process sharing PAGE_RENDER_DIR may have evicted it
+                if os.path.exists(path):
+                    self._sources.move_to_end(checksum)
+                    return path
+                del self._sources[checksum]
+
+        record = blob_store.lookup(checksum)
+        if record is None:
+            raise LookupError(f"Unknown exhibit blob {checksum}")
+        os.makedirs(settings.PAGE_RENDER_DIR, exist_ok=True)
+        path = os.path.join(settings.PAGE_RENDER_DIR, f"{checksum}.pdf")
+        if not os.path.exists(path):
+            partial = f"{path}.{uuid.uuid4().hex}.part"
+            storage.download_file(record["s3_key"], partial)
+            os.replace(partial, path)
+
+        with self._lock:
+            self._sources[checksum] = path
+            while len(self._sources) > settings.PAGE_RENDER_DOCUMENTS:
+                # Workers that still have it open keep reading the unlinked file
+                with suppress(FileNotFoundError):
+                    os.unlink(self._sources.popitem(last=False)[1])
+        return path
+
+    def _store(self, key: RenderKey, rendered: RenderedPage) -> None:
+        with self._lock:
+            if key not in self._rendered:
+                self._rendered[key] = rendered
+                self.size_bytes += len(rendered.png)
+            while self.size_bytes > self.max_bytes and len(self._rendered) > 1:
+                evicted, rendered = self._rendered.popitem(last=False)
+                self.size_bytes -= len(rendered.png)
+                self._published.pop(evicted, None)
+
+    def _submit(self, pool, key: RenderKey, path: str) -> Future:
+        """Start rendering `key` unless it already is; caller holds the lock"""
+        future = self._pending.get(key)
+        if future is None:
+            future = pool.submit(render_page, path, key[1], key[2])
+            self._pending[key] = future
+            future.add_done_callback(lambda done: self._finished(key, done))
+        return future
+
+    def _finished(self, key: RenderKey, future: Future) -> None:
+        with self._lock:
+            self._pending.pop(key, None)
+        if not future.cancelled() and future.exception() is None:
+            self._store(key, future.result())
+
+    def cached(self, checksum: str, page: int, zoom: float) -> Optional[RenderedPage]:
+        key = (checksum, page, normalize_zoom(zoom))
+        with self._lock:
+            rendered = self._rendered.get(key)
+            if rendered is not None:
+                self._rendered.move_to_end(key)
+            return rendered
+
+    def render(self, checksum: str, page: int, zoom: float = 1.0) -> RenderedPage:
+        """
+        A zero-based page of an exhibit PDF as PNG.
+
+        Raises:
+            LookupError: If the exhibit is unknown
+            IndexError: If the page is past the end of the document
+        """
+        if page < 0:
+            raise IndexError(f"Page {page} out of range")
+        zoom = normalize_zoom(zoom)
+        key = (checksum, page, zoom)
+        rendered = self.cached(checksum, page, zoom)
+        pool = self._pool()
+        if rendered is None or pool is not None:
+            path = self.local_path(checksum)
+
+        if rendered is None:
+            if pool is None:
+                rendered = render_page(path, page, zoom)
+                self._store(key, rendered)
+            else:
+                with self._lock:
+                    future = self._submit(pool, key, path)
+                rendered = future.result()
+                self._store(key, rendered)
+
+        if pool is not None:
+            last = min(page + self.prefetch, rendered.page_count - 1)
+            with self._lock:
+                for following in range(page + 1, last + 1):
+                    if (checksum, following, zoom) not in self._rendered:
+                        self._submit(pool, (checksum, following, zoom), path)
+
+        return rendered
+
+    def publish(self, checksum: str, page: int, zoom: float = 1.0) -> Tuple[str, RenderedPage]:
+        """Render a page and store it next to the exhibit, uploading each cached render once"""
+        rendered = self.render(checksum, page, zoom)
+        key = (checksum, page, normalize_zoom(zoom))
+        with self._lock:
+            s3_key = self._published.get(key)
+        if s3_key is None:
+            s3_key = storage.upload_bytes(
+                rendered.png,
+                derived_key(checksum, f"render/{key[2]:g}/{page + 1:05d}.png"),
+                content_type="image/png",
+            )
+            with self._lock:
+                if key in self._rendered:
+                    self._published[key] = s3_key
+        return s3_key, rendered
+
+
+page_renderer = PageRenderer()
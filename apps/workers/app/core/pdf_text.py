@@ -0,0 +1,109 @@
+from functools import partial
+from typing import Any, Dict, Iterator, List, Optional
+import os
+
+import fitz  # PyMuPDF
+
+from app.core.cache import ResultCache, content_key
+from app.core.pools import get_process_pool, iter_bounded
+
+
+# Bump when the page payload changes shape
+PDF_TEXT_VERSION = "1"
+
+# Pages extracted per pool task; small enough that the first results come back
+# quickly, large enough to amortize pickling
+PAGES_PER_TASK = 16
+
+# Each pool task opens the document itself, and opening costs time in
+# proportion to its page count, so long documents are cut into about this
+# many ranges per pool worker rather than into PAGES_PER_TASK pages each
+RANGES_PER_WORKER = 4
+
+page_cache = ResultCache("pdf-page", PDF_TEXT_VERSION, max_entries=512)
+
+
+def page_cache_key(checksum: str, page: int) -> str:
+    """Cache key for one page of a document"""
+    return content_key(checksum, page)
+
+
+def page_ranges(pages: List[int], size: int = PAGES_PER_TASK) -> List[List[int]]:
+    """Split page numbers into task-sized groups, keeping document order"""
+    return [pages[start:start + size] for start in range(0, len(pages), size)]
+
+
+def extract_pages(path: str, pages: List[int], document: Optional[fitz.Document] = None) -> List[Dict[str, Any]]:
+    """
+    Extract text and word boxes for the given zero-based pages.
+
+    Opens `path` for the call unless an open `document` is given. Pool tasks
+    never keep a document past their range: a worker holding one would serve
+    it for a different file later spooled to the same path, and would keep
+    a deleted spool's disk space in use.
+
+    Returns:
+        One dict per page with 1-based `page`, `text`, page size and `words`
+        as [x0, y0, x1, y1, word] lists in reading order
+    """
+    if document is None:
+        with fitz.open(path) as opened:
+            return extract_pages(path, pages, opened)
+
+    extracted = []
+    for number in pages:
+        page = document[number]
+        words = [
+            [round(x0, 1), round(y0, 1), round(x1, 1), round(y1, 1), word]
+            for x0, y0, x1, y1, word, *_ in page.get_text("words", sort=True)
+        ]
+        extracted.append({
+            "page": number + 1,
+            "width": round(page.rect.width, 1),
+            "height": round(page.rect.height, 1),
+            "text": page.get_text("text", sort=True),
+            "words": words,
+        })
+
+    return extracted
+
+
+def iter_pdf_pages(path: str, checksum: str, page_count: int) -> Iterator[Dict[str, Any]]:
+    """
+    Yield every page of a PDF as soon as it is available.
+
+    Cached pages come first; the rest are extracted in groups of at least
+    PAGES_PER_TASK on the "pdf" process pool and yielded in completion order,
+    so callers can persist early pages while later ones are still being
+    parsed. At most two groups per pool worker are in flight, which bounds
+    memory on large files. Falls back to in-process extraction, with the
+    document opened once, when the worker cannot fork.
+    """
+    missing = []
+    for number in range(page_count):
+        cached = page_cache.get(page_cache_key(checksum, number))
+        if cached is not None:
+            yield cached
+        else:
+            missing.append(number)
+
+    if not missing:
+        return
+
+    pool = get_process_pool("pdf")
+    workers = os.cpu_count() or 1
+
+    if pool is None or len(missing) <= PAGES_PER_TASK:
+        with fitz.open(path) as document:
+            for pages in page_ranges(missing):
+                for page in extract_pages(path, pages, document):
+                    page_cache.set(page_cache_key(checksum, page["page"] - 1), page)
+                    yield page
+        return
+
+    size = max(PAGES_PER_TASK, -(-len(missing) // (RANGES_PER_WORKER * workers)))
+    extract = partial(extract_pages, path)
+    for _, pages in iter_bounded(pool, extract, page_ranges(missing, size), max_in_flight=2 * workers):
+        for page in pages:
+            page_cache.set(page_cache_key(checksum, page["page"] - 1), page)
+            yield page
@@ -0,0 +1,104 @@
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+import multiprocessing
+import os
+import threading
+
+
+_pools: Dict[Tuple[str, str], Executor] = {}
+_lock = threading.Lock()
+
+
+def can_fork_workers() -> bool:
+    """
+    Whether this process may start child processes.
+
+    Celery's prefork pool runs tasks in daemonic processes, which multiprocessing
+    does not allow to have children. Tasks that use a process pool are routed
+    to the "pooled" queue (celery_app.POOL_TASKS), whose worker runs with
+    `-P threads`; elsewhere callers fall back to in-process work.
+    """
+    return not multiprocessing.current_process().daemon
+
+
+def get_process_pool(name: str, max_workers: Optional[int] = None) -> Optional[ProcessPoolExecutor]:
+    """
+    Get a named process pool owned by the current process.
+
+    Pools are created lazily and keyed by pid, so a pool inherited across a
+    fork is never reused by the child.
+
+    Returns:
+        The pool, or None when this process cannot fork workers
+    """
+    if not can_fork_workers():
+        return None
+
+    key = ("process", f"{name}:{os.getpid()}")
+    with _lock:
+        pool = _pools.get(key)
+        if pool is None:
+            # The pooled worker is multithreaded, and forking a process whose
+            # other threads may hold locks can deadlock the child
+            pool = ProcessPoolExecutor(
+                max_workers=max_workers or os.cpu_count(),
+                mp_context=multiprocessing.get_context("forkserver"),
+            )
+            _pools[key] = pool
+        return pool  # type: ignore[return-value]
+
+
+def get_thread_pool(name: str, max_workers: Optional[int] = None) -> ThreadPoolExecutor:
+    """Get a named thread pool owned by the current process"""
+    key = ("thread", f"{name}:{os.getpid()}")
+    with _lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+            _pools[key] = pool
+        return pool  # type: ignore[return-value]
+
+
+def iter_bounded(
+    executor: Executor,
+    fn: Callable[..., Any],
+    items: Iterable[Any],
+    max_in_flight: int,
+) -> Iterator[Tuple[int, Any]]:
+    """
+    Run `fn` over `items` with at most `max_in_flight` calls pending.
+
+    Items are pulled lazily, so a slow consumer or slow pool holds back
+    submission instead of queueing every input. Work still pending when the
+    consumer stops or a call raises is cancelled.
+
+    Yields:
+        (index, result) pairs in completion order
+    """
+    queue = enumerate(items)
+    pending: Dict[Any, int] = {}
+
+    try:
+        while True:
+            while len(pending) < max_in_flight:
+                item = next(queue, None)
+                if item is None:
+                    break
+                pending[executor.submit(fn, item[1])] = item[0]
+            if not pending:
+                return
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def shutdown_pools() -> None:
+    """Shut down every pool created by this process"""
+    with _lock:
+        pid = str(os.getpid())
+        for key in [key for key in _pools if key[1].endswith(f":{pid}")]:
+            _pools.pop(key).shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,328 @@
+from functools import lru_cache
+from typing import BinaryIO, Dict, Iterable, List, Optional, Sequence, Tuple
+import re
+
+import numpy as np
+
+from app.core.cache import ResultCache, content_key
+from app.core.config import settings
+from app.core.text_stats import TEXT_CHUNK_SIZE
+
+
+# Bump when the patterns change so cached redactions are redone
+REDACTION_VERSION = "2"
+
+# Longest possible match; chunks overlap by more than this
+MAX_MATCH_BYTES = 400
+
+# Bytes carried between chunks: a whole match plus the context its
+# lookarounds inspect on either side
+REDACTION_OVERLAP = 2 * MAX_MATCH_BYTES
+
+# Names longer than this are not matched
+MAX_NAME_BYTES = 128
+
+MASK_BYTE = ord("*")
+
+# Every pattern refuses to start in the middle of a token, so a match does not
+# depend on where scanning of a window begins
+_PATTERNS = (
+    ("ssn", rb"(?<![\w-])\d{3}-\d{2}-\d{4}(?![\w-])"),
+    ("phone", rb"(?<![\w-])(?:\(\d{3}\)[ ]?|\d{3}[-. ])\d{3}[-. ]\d{4}(?![\w-])"),
+    ("account", rb"(?<![\w-])\d{8,17}(?![\w-])"),
+    ("email", rb"(?<![\w.%+-])[\w.%+-]{1,64}@[A-Za-z0-9-]{1,63}(?:\.[A-Za-z0-9-]{1,63}){1,4}(?![\w-])"),
+)
+
+_EMAIL_LOCAL_BYTES = 64
+_DOMAIN_RUN = re.compile(rb"[A-Za-z0-9.-]*")
+
+# Digits that make up the numeric patterns: SSNs, phones and accounts all have
+# at least this many within a short stretch
+_MIN_DIGITS = 8
+_MAX_DIGIT_SPREAD = 15
+_DIGIT_WINDOW = 24
+
+# Words of a name may be split by up to this much whitespace, e.g. a line break
+_NAME_GAP = 4
+_NAME_SEPARATOR = rb"[ \t\r\n]{1,%d}" % _NAME_GAP
+
+# Word boundaries around a name edge that is not ASCII: \b on bytes treats
+# every non-ASCII byte as a non-word character
+_NAME_START = rb"(?<![\w\x80-\xff])"
+_NAME_END = rb"(?![\w\x80-\xff])"
+
+Span = Tuple[int, int, str]
+
+
+def name_terms(names: Iterable[str]) -> List[str]:
+    """
+    Distinct names to redact, longest first.
+
+    Multi-word names also contribute their last word, so "Mr. Smith" is
+    redacted as well as "John Smith".
+    """
+    terms = set()
+    for name in names:
+        words = (name or "").split()
+        if not words:
+            continue
+        terms.add(" ".join(words))
+        if len(words) > 1 and len(words[-1]) > 1:
+            terms.add(words[-1])
+    return sorted(terms, key=lambda term: (-len(term), term))
+
+
+def case_forms(text: str) -> List[str]:
+    """
+    Distinct spellings of `text` in the cases names appear in.
+
+    IGNORECASE on bytes and bytes.lower() only fold ASCII, so "NÚÑEZ" in a
+    caption would not match "Núñez" without its own spelling.
+    """
+    return list(dict.fromkeys((text, text.lower(), text.upper(), text.title())))
+
+
+def _word_pattern(word: str, encoding: str) -> bytes:
+    """A name word matching any case of its non-ASCII letters; IGNORECASE covers the rest"""
+    pieces = []
+    for character in word:
+        if character.isascii():
+            pieces.append(re.escape(character.encode(encoding)))
+            continue
+        forms = [form.encode(encoding, "ignore") for form in case_forms(character)]
+        forms = [re.escape(form) for form in dict.fromkeys(forms) if form]
+        pieces.append(forms[0] if len(forms) == 1 else rb"(?:%s)" % b"|".join(forms))
+    return b"".join(pieces)
+
+
+def _name_pattern(term: str, encoding: str) -> bytes:
+    words = term.split()
+    body = _NAME_SEPARATOR.join(_word_pattern(word, encoding) for word in words)
+    start = rb"\b" if term[0].isascii() else _NAME_START
+    end = rb"\b" if term[-1].isascii() else _NAME_END
+    return start + body + end
+
+
+class Redactor:
+    """
+    One compiled multi-pattern scanner for SSNs, phone numbers, account
+    numbers, emails and a case's party and witness names.
+
+    Running a regular expression over every byte is slow, so candidate windows
+    are found first with bulk operations: a NumPy pass for dense runs of
+    digits, `find` for "@" and for each case form of a name's last word on the
+    lowercased data. The scanner then only runs inside those windows. Masking replaces
+    each matched byte with "*", so redacted copies keep every byte offset of
+    the original.
+    """
+
+    def __init__(self, names: Sequence[str] = (), encoding: str = "utf-8"):
+        self.terms = [
+            term for term in name_terms(names) if len(term.encode(encoding, "ignore")) <= MAX_NAME_BYTES
+        ]
+        self.encoding = encoding
+
+        alternatives = [rb"(?P<%s>%s)" % (kind.encode(), pattern) for kind, pattern in _PATTERNS]
+        if self.terms:
+            names = b"|".join(_name_pattern(term, encoding) for term in self.terms)
+            alternatives.append(rb"(?P<name>%s)" % names)
+        self.pattern = re.compile(b"|".join(alternatives), re.IGNORECASE)
+
+        # A name always ends with its last word; each trigger, one per case
+        # form of that word, maps to the longest stretch of name that can
+        # precede it
+        self._triggers: Dict[bytes, int] = {}
+        for term in self.terms:
+            words = term.split()
+            lead = max(
+                len("".join(form.split()[:-1]).encode(encoding, "ignore")) for form in case_forms(term)
+            ) + _NAME_GAP * (len(words) - 1)
+            for form in case_forms(words[-1]):
+                trigger = form.encode(encoding, "ignore").lower()
+                self._triggers[trigger] = max(self._triggers.get(trigger, 0), lead)
+
+    def _windows(self, data: bytes, start: int, stop: int) -> List[Tuple[int, int]]:
+        """Merged byte ranges of data[start:stop] that may contain a match"""
+        starts: List[np.ndarray] = []
+        ends: List[np.ndarray] = []
+
+        codes = np.frombuffer(data, dtype=np.uint8, count=stop - start, offset=start)
+        digits = np.flatnonzero((codes - np.uint8(48)) < 10)
+        if len(digits) >= _MIN_DIGITS:
+            dense = digits[:1 - _MIN_DIGITS][digits[_MIN_DIGITS - 1:] - digits[:1 - _MIN_DIGITS] <= _MAX_DIGIT_SPREAD]
+            starts.append(dense - 2)
+            ends.append(dense + _DIGIT_WINDOW)
+
+        # Emails end where the run of domain characters after "@" does
+        position = data.find(b"@", start, stop)
+        while position != -1:
+            domain_end = _DOMAIN_RUN.match(data, position + 1, position + MAX_MATCH_BYTES).end()
+            starts.append(np.array([position - start - _EMAIL_LOCAL_BYTES - 2]))
+            ends.append(np.array([domain_end - start + 1]))
+            position = data.find(b"@", domain_end, stop)
+
+        if self._triggers:
+            lowered = data[start:stop].lower()
+            for trigger, lead in self._triggers.items():
+                hits = []
+                position = lowered.find(trigger)
+                while position != -1:
+                    hits.append(position)
+                    position = lowered.find(trigger, position + 1)
+                if hits:
+                    positions = np.array(hits, dtype=np.int64)
+                    starts.append(positions - lead - 2)
+                    ends.append(positions + len(trigger) + 2)
+
+        # Scattered digits contribute an empty array
+        if not sum(len(found) for found in starts):
+            return []
+
+        starts_array = np.concatenate(starts) + start
+        ends_array = np.concatenate(ends) + start
+        order = np.argsort(starts_array, kind="stable")
+        starts_array = starts_array[order]
+        reach = np.maximum.accumulate(ends_array[order])
+        # A window opens wherever it starts past everything before it
+        opens = np.flatnonzero(starts_array[1:] > reach[:-1]) + 1
+        closes = np.append(opens - 1, len(starts_array) - 1)
+        opens = np.insert(opens, 0, 0)
+
+        return [
+            (max(start, int(low)), min(len(data), int(high)))
+            for low, high in zip(starts_array[opens], reach[closes])
+        ]
+
+    def scan(self, data: bytes, start: int = 0, limit: Optional[int] = None) -> List[Span]:
+        """
+        Non-overlapping matches in `data` that start in [start, limit).
+
+        Bytes before `start` are only context for the lookarounds, and matches
+        may run past `limit` up to the end of `data`.
+        """
+        limit = len(data) if limit is None else limit
+        spans: List[Span] = []
+        resume = start
+
+        for low, high in self._windows(data, start, len(data)):
+            if low >= limit:
+                break
+            for match in self.pattern.finditer(data, max(low, resume), high):
+                if match.start() >= limit:
+                    break
+                spans.append((match.start(), match.end(), match.lastgroup))
+                resume = match.end()
+
+        return spans
+
+    def redact_bytes(self, data: bytes) -> Tuple[bytes, List[Span]]:
+        """A masked copy of `data` and its byte spans"""
+        spans = self.scan(data)
+        return mask(data, spans), spans
+
+    def redact_text(self, text: str) -> Tuple[str, List[Span]]:
+        """A masked copy of `text` and its character spans"""
+        data = text.encode(self.encoding, "surrogatepass")
+        spans = self.scan(data)
+        if not spans:
+            return text, spans
+
+        if not text.isascii():
+            # Byte offsets to character offsets
+            spans = [
+                (len(data[:begin].decode(self.encoding, "surrogatepass")),
+                 len(data[:end].decode(self.encoding, "surrogatepass")),
+                 kind)
+                for begin, end, kind in spans
+            ]
+
+        pieces = []
+        previous = 0
+        for begin, end, _ in spans:
+            pieces.append(text[previous:begin])
+            pieces.append("*" * (end - begin))
+            previous = end
+        pieces.append(text[previous:])
+        return "".join(pieces), spans
+
+    def redact_stream(self, source: BinaryIO, sink: BinaryIO, chunk_size: int = TEXT_CHUNK_SIZE) -> List[Span]:
+        """
+        Copy `source` to `sink` with matches masked, a chunk at a time.
+
+        The last REDACTION_OVERLAP bytes of each chunk are held back and scanned
+        again with the next one, so a match that crosses a chunk boundary is
+        found whole. Returns spans as absolute byte offsets.
+        """
+        pending = b""
+        base = 0  # absolute offset of pending[0]
+        start = 0  # first byte of pending not yet written
+        spans: List[Span] = []
+
+        while True:
+            chunk = source.read(chunk_size)
+            pending = pending + chunk if pending else chunk
+            final = not chunk
+            limit = len(pending) if final else len(pending) - REDACTION_OVERLAP
+            if limit <= start:
+                if final:
+                    break
+                continue
+
+            found = self.scan(pending, start, limit)
+            cut = max(limit, found[-1][1]) if found else limit
+            sink.write(mask(pending[start:cut], found, offset=start))
+            spans.extend((base + begin, base + end, kind) for begin, end, kind in found)
+
+            if final:
+                break
+
+            # Keep a little written context so lookbehinds see the real bytes
+            keep = min(cut, 8)
+            pending = pending[cut - keep:]
+            base += cut - keep
+            start = keep
+
+        return spans
+
+
+def mask(data: bytes, spans: Sequence[Span], offset: int = 0) -> bytes:
+    """`data` with each span, shifted by -offset, overwritten with "*" """
+    if not spans:
+        return bytes(data)
+    masked = bytearray(data)
+    for begin, end, _ in spans:
+        masked[begin - offset:end - offset] = bytes([MASK_BYTE]) * (end - begin)
+    return bytes(masked)
+
+
+@lru_cache(maxsize=64)
+def _cached_redactor(terms: Tuple[str, ...], encoding: str) -> Redactor:
+    return Redactor(terms, encoding)
+
+
+def get_redactor(names: Iterable[str] = (), encoding: str = "utf-8") -> Redactor:
+    """A compiled redactor for a set of names, shared per process"""
+    return _cached_redactor(tuple(name_terms(names)), encoding)
+
+
+def redaction_profile(names: Iterable[str]) -> str:
+    """Short key for a pattern version and name set, used in redacted object keys"""
+    return content_key(REDACTION_VERSION, name_terms(names))[:16]
+
+
+# Party and witness names per case, published by intake normalization
+_case_names = ResultCache(
+    "pii-names", REDACTION_VERSION, max_entries=256, ttl=settings.INTAKE_CACHE_TTL_SECONDS
+)
+
+
+def store_case_names(case_id: str, names: Iterable[str]) -> List[str]:
+    """Record the names to redact from a case's exhibits and transcripts"""
+    unique = list(dict.fromkeys(name for name in names if name))
+    _case_names.set(content_key(case_id), unique)
+    return unique
+
+
+def load_case_names(case_id: str) -> List[str]:
+    """Names stored for a case, or an empty list before intake ran"""
+    return _case_names.get(content_key(case_id)) or []
@@ -0,0 +1,181 @@
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional
+import os
+import threading
+
+import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+
+from app.core.config import settings
+
+
+_client = None
+_client_pid: Optional[int] = None
+_client_lock = threading.Lock()
+
+# S3 DeleteObjects accepts at most 1000 keys per request
+DELETE_BATCH_SIZE = 1000
+
+
+def get_s3_client():
+    """
+    S3/MinIO client shared by every task in this worker process.
+
+    Created lazily and re-created after a fork, so prefork children never
+    share a connection pool with their parent. boto3 clients are thread-safe;
+    the pool is sized for concurrent multipart transfers.
+    """
+    global _client, _client_pid
+
+    if _client is None or _client_pid != os.getpid():
+        with _client_lock:
+            if _client is None or _client_pid != os.getpid():
+                _client = boto3.client(
+                    's3',
+                    endpoint_url=settings.S3_ENDPOINT_URL,
+                    aws_access_key_id=settings.AWS_ACCESS_KEY_ID or 'minioadmin',
+                    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY or 'minioadmin',
+                    region_name=settings.AWS_REGION,
+                    config=Config(
+                        max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+                        retries={'max_attempts': 5, 'mode': 'adaptive'},
+                        tcp_keepalive=True,
+                    ),
+                )
+                _client_pid = os.getpid()
+
+    return _client
+
+
+def get_bucket_name() -> str:
+    return settings.S3_BUCKET
+
+
+def get_transfer_config() -> TransferConfig:
+    """Multipart settings for concurrent part uploads and downloads"""
+    return TransferConfig(
+        multipart_threshold=settings.S3_MULTIPART_CHUNK_SIZE,
+        multipart_chunksize=settings.S3_MULTIPART_CHUNK_SIZE,
+        max_concurrency=settings.S3_TRANSFER_CONCURRENCY,
+        use_threads=True,
+    )
+
+
+def upload_fileobj(
+    fileobj: BinaryIO,
+    key: str,
+    content_type: Optional[str] = None,
+    metadata: Optional[Dict[str, str]] = None,
+) -> str:
+    """Upload a readable stream, in concurrent parts when it is large"""
+    extra_args: Dict[str, Any] = {}
+    if content_type:
+        extra_args['ContentType'] = content_type
+    if metadata:
+        extra_args['Metadata'] = metadata
+
+    get_s3_client().upload_fileobj(
+        fileobj, get_bucket_name(), key, ExtraArgs=extra_args or None, Config=get_transfer_config()
+    )
+    return key
+
+
+def upload_file(
+    path: str,
+    key: str,
+    content_type: Optional[str] = None,
+    metadata: Optional[Dict[str, str]] = None,
+) -> str:
+    """Upload a local file, in concurrent parts when it is large"""
+    extra_args: Dict[str, Any] = {}
+    if content_type:
+        extra_args['ContentType'] = content_type
+    if metadata:
+        extra_args['Metadata'] = metadata
+
+    get_s3_client().upload_file(
+        path, get_bucket_name(), key, ExtraArgs=extra_args or None, Config=get_transfer_config()
+    )
+    return key
+
+
+def copy_object(source_key: str, key: str) -> str:
+    """Server-side copy within the bucket (multipart copy for large objects)"""
+    get_s3_client().copy(
+        {'Bucket': get_bucket_name(), 'Key': source_key}, get_bucket_name(), key, Config=get_transfer_config()
+    )
+    return key
+
+
+def upload_bytes(
+    content: bytes,
+    key: str,
+    content_type: Optional[str] = None,
+    metadata: Optional[Dict[str, str]] = None,
+) -> str:
+    """Upload a small in-memory object with a single PUT"""
+    extra_args: Dict[str, Any] = {}
+    if content_type:
+        extra_args['ContentType'] = content_type
+    if metadata:
+        extra_args['Metadata'] = metadata
+
+    get_s3_client().put_object(Bucket=get_bucket_name(), Key=key, Body=content, **extra_args)
+    return key
+
+
+def download_file(key: str, path: str) -> str:
+    """Download an object to a local path, in concurrent ranges when it is large"""
+    get_s3_client().download_file(get_bucket_name(), key, path, Config=get_transfer_config())
+    return path
+
+
+def open_object(key: str, byte_range: Optional[str] = None):
+    """Streaming body for an object, optionally an HTTP byte range like 'bytes=0-1023'"""
+    kwargs: Dict[str, Any] = {'Bucket': get_bucket_name(), 'Key': key}
+    if byte_range:
+        kwargs['Range'] = byte_range
+    return get_s3_client().get_object(**kwargs)['Body']
+
+
+def presign_url(key: str, expires_in: int = 3600, method: str = 'get_object') -> str:
+    """Signed URL for downloading (or, with method='put_object', uploading) an object"""
+    return get_s3_client().generate_presigned_url(
+        method, Params={'Bucket': get_bucket_name(), 'Key': key}, ExpiresIn=expires_in
+    )
+
+
+def list_keys(prefix: str) -> Iterator[str]:
+    """Keys of every object under a prefix, a page of up to 1000 at a time"""
+    paginator = get_s3_client().get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=get_bucket_name(), Prefix=prefix):
+        for item in page.get('Contents', []):
+            yield item['Key']
+
+
+def delete_objects(keys: Iterable[str]) -> List[str]:
+    """
+    Delete objects in batches of up to 1000 keys per request.
+
+    Returns:
+        Keys that failed to delete
+    """
+    failed: List[str] = []
+    batch: List[str] = []
+
+    def flush() -> None:
+        response = get_s3_client().delete_objects(
+            Bucket=get_bucket_name(),
+            Delete={'Objects': [{'Key': key} for key in batch], 'Quiet': True},
+        )
+        failed.extend(error['Key'] for error in response.get('Errors', []))
+        batch.clear()
+
+    for key in keys:
+        batch.append(key)
+        if len(batch) == DELETE_BATCH_SIZE:
+            flush()
+    if batch:
+        flush()
+
+    return failed
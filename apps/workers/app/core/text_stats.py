@@ -0,0 +1,158 @@
+from typing import BinaryIO, List, NamedTuple, Tuple
+import codecs
+import io
+
+import numpy as np
+
+
+# Bytes read per step; a multiple of every code unit size below
+TEXT_CHUNK_SIZE = 1 << 20
+
+# Bytes sniffed for encoding detection
+SNIFF_SIZE = 64 * 1024
+
+# UTF-32 first: its little-endian BOM starts with the UTF-16 one
+_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32-le"),
+    (codecs.BOM_UTF32_BE, "utf-32-be"),
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+)
+
+# Code unit per encoding, used to find newlines without decoding
+_UNITS = {
+    "utf-16-le": np.dtype("<u2"),
+    "utf-16-be": np.dtype(">u2"),
+    "utf-32-le": np.dtype("<u4"),
+    "utf-32-be": np.dtype(">u4"),
+}
+_BYTE = np.dtype("u1")
+
+
+class TextStats(NamedTuple):
+    """Counts for a text file plus the byte offset where each line starts"""
+    encoding: str
+    bom_length: int
+    size_bytes: int
+    character_count: int
+    word_count: int
+    line_count: int
+    line_offsets: np.ndarray
+
+
+def detect_encoding(head: bytes) -> Tuple[str, int]:
+    """
+    Guess a file's encoding from its first bytes.
+
+    Returns:
+        (encoding, BOM length). BOMs win; BOM-less UTF-16 is recognised by
+        its zero high bytes; anything that is not valid UTF-8 is treated as
+        Windows-1252, the usual source of such exports.
+    """
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding, len(bom)
+
+    if len(head) >= 4:
+        even_zeros, odd_zeros = head[0::2].count(0), head[1::2].count(0)
+        if odd_zeros > len(head) // 4 and not even_zeros:
+            return "utf-16-le", 0
+        if even_zeros > len(head) // 4 and not odd_zeros:
+            return "utf-16-be", 0
+
+    try:
+        # final=False tolerates a sequence cut off at the end of the sample
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+        return "utf-8", 0
+    except UnicodeDecodeError:
+        return "cp1252", 0
+
+
+def _count_words(text: str, words: int, in_word: bool) -> Tuple[int, bool]:
+    """Add the words in `text`, not recounting one continued from the previous chunk"""
+    if not text:
+        return words, in_word
+    pieces = len(text.split())
+    if pieces and in_word and not text[0].isspace():
+        pieces -= 1
+    return words + pieces, not text[-1].isspace()
+
+
+def analyze_text(source: BinaryIO, chunk_size: int = TEXT_CHUNK_SIZE) -> TextStats:
+    """
+    Count characters, words and lines in one pass over fixed-size chunks.
+
+    Chunks are read into one reused buffer. An incremental decoder carries
+    multi-byte sequences split across chunks, and word state is carried across
+    boundaries, so counts match decoding the whole file at once. Lines end at
+    "\\n" (so "\\r\\n" counts once). Newlines are located on the raw bytes
+    with NumPy, giving the line-offset index without a second pass.
+    """
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    filled = source.readinto(buffer)
+
+    encoding, bom_length = detect_encoding(bytes(view[:min(filled, SNIFF_SIZE)]))
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    unit = _UNITS.get(encoding, _BYTE)
+
+    starts: List[np.ndarray] = [np.array([bom_length], dtype=np.int64)]
+    carry = b""
+    position = bom_length
+    skip = bom_length
+    characters = words = 0
+    in_word = False
+
+    while filled:
+        data = view[skip:filled]
+        skip = 0
+
+        text = decoder.decode(data)
+        characters += len(text)
+        words, in_word = _count_words(text, words, in_word)
+
+        # Code units may straddle chunks in UTF-16/32
+        raw = carry + data.tobytes() if carry or unit.itemsize > 1 else data
+        usable = len(raw) - len(raw) % unit.itemsize
+        units = np.frombuffer(raw, dtype=unit, count=usable // unit.itemsize)
+        newlines = np.flatnonzero(units == 10)
+        if len(newlines):
+            starts.append((position - len(carry)) + (newlines + 1) * unit.itemsize)
+        carry = bytes(raw[usable:])
+
+        position += len(data)
+        filled = source.readinto(buffer)
+
+    tail = decoder.decode(b"", final=True)
+    characters += len(tail)
+    words, in_word = _count_words(tail, words, in_word)
+
+    offsets = np.concatenate(starts)
+    # A trailing newline does not start another line; an empty file has none
+    if not characters or offsets[-1] >= position:
+        offsets = offsets[:-1]
+
+    dtype = np.uint32 if position < 2 ** 32 else np.uint64
+    return TextStats(
+        encoding=encoding,
+        bom_length=bom_length,
+        size_bytes=position,
+        character_count=characters,
+        word_count=words,
+        line_count=len(offsets),
+        line_offsets=offsets.astype(dtype),
+    )
+
+
+def line_range(offsets: np.ndarray, line: int, size_bytes: int) -> Tuple[int, int]:
+    """Byte range [start, end) of a zero-based line, e.g. for a ranged GET"""
+    end = int(offsets[line + 1]) if line + 1 < len(offsets) else size_bytes
+    return int(offsets[line]), end
+
+
+def offsets_to_npy(offsets: np.ndarray) -> bytes:
+    """Serialize a line-offset index as a .npy file viewers can memory-map"""
+    buffer = io.BytesIO()
+    np.save(buffer, offsets)
+    return buffer.getvalue()
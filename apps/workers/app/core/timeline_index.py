@@ -0,0 +1,227 @@
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+import json
+import re
+import threading
+
+import redis
+
+from app.core.cache import ResultCache, content_key, get_redis
+from app.core.config import settings
+
+
+MONTHS = {
+    name: number
+    for number, name in enumerate(
+        ["january", "february", "march", "april", "may", "june", "july",
+         "august", "september", "october", "november", "december"],
+        start=1,
+    )
+}
+
+_US_DATE = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})$")
+_ISO_DATE = re.compile(r"(\d{4})-(\d{2})-(\d{2})$")
+_LONG_DATE = re.compile(r"([A-Za-z]+) (\d{1,2}),? (\d{4})$")
+
+_SENTENCE_END = re.compile(r"[.!?](?:\s|$)|\n")
+
+# Sentence context kept for each event
+MAX_CONTEXT_CHARS = 300
+
+
+def to_iso_date(text: str) -> Optional[str]:
+    """Normalize MM/DD/YYYY, YYYY-MM-DD or 'Month DD, YYYY' to YYYY-MM-DD"""
+    text = text.strip()
+    try:
+        match = _US_DATE.match(text)
+        if match:
+            month, day, year = (int(part) for part in match.groups())
+            return date(year, month, day).isoformat()
+
+        match = _ISO_DATE.match(text)
+        if match:
+            year, month, day = (int(part) for part in match.groups())
+            return date(year, month, day).isoformat()
+
+        match = _LONG_DATE.match(text)
+        if match and match.group(1).lower() in MONTHS:
+            return date(int(match.group(3)), MONTHS[match.group(1).lower()], int(match.group(2))).isoformat()
+    except ValueError:
+        # Out-of-range day or month, e.g. 02/30/2023
+        return None
+
+    return None
+
+
+def sentence_around(text: str, start: int, end: int) -> str:
+    """The sentence containing text[start:end], capped at MAX_CONTEXT_CHARS"""
+    floor = max(0, start - MAX_CONTEXT_CHARS)
+    sentence_start = max(
+        text.rfind(". ", floor, start),
+        text.rfind("! ", floor, start),
+        text.rfind("? ", floor, start),
+        text.rfind("\n", floor, start),
+    )
+    sentence_start = floor if sentence_start < 0 else sentence_start + 1
+
+    ceiling = min(len(text), end + MAX_CONTEXT_CHARS)
+    match = _SENTENCE_END.search(text, end, ceiling)
+    sentence_end = match.start() + 1 if match else ceiling
+
+    return text[sentence_start:sentence_end].strip()[:MAX_CONTEXT_CHARS]
+
+
+class TimelineIndex:
+    """
+    Timeline events sorted by their ISO `date` for bisect-based queries.
+
+    Events without a resolvable date are kept (in document order) but never
+    returned by date queries.
+    """
+
+    def __init__(self, events: List[Dict[str, Any]]):
+        dated = [event for event in events if event.get("date")]
+        self.undated = [event for event in events if not event.get("date")]
+        self.events = sorted(dated, key=lambda event: (event["date"], event.get("offset", 0)))
+        self._keys = [event["date"] for event in self.events]
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def range(self, start: Optional[str] = None, end: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Events dated within [start, end]; either bound may be omitted"""
+        low = bisect_left(self._keys, start) if start else 0
+        high = bisect_right(self._keys, end) if end else len(self._keys)
+        return self.events[low:high]
+
+    def nearest(self, iso_date: str, limit: int = 1) -> List[Dict[str, Any]]:
+        """The `limit` events closest in time to `iso_date`, closest first"""
+        if not self.events:
+            return []
+
+        target = date.fromisoformat(iso_date).toordinal()
+
+        def distance(index: int) -> int:
+            return abs(date.fromisoformat(self._keys[index]).toordinal() - target)
+
+        # Expand outwards from the insertion point
+        right = bisect_left(self._keys, iso_date)
+        left = right - 1
+        nearest = []
+        while len(nearest) < limit and (left >= 0 or right < len(self._keys)):
+            if right >= len(self._keys) or (left >= 0 and distance(left) <= distance(right)):
+                nearest.append(self.events[left])
+                left -= 1
+            else:
+                nearest.append(self.events[right])
+                right += 1
+
+        return nearest
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Sorted dated events followed by undated ones"""
+        return self.events + self.undated
+
+
+# Events are shared through Redis; the small revision keys are checked on every
+# load so processes never serve an index older than the last normalization or
+# exhibit ingest.
+_timeline_store = ResultCache(
+    "timeline", "1", max_entries=256, ttl=settings.INTAKE_CACHE_TTL_SECONDS
+)
+_revision_store = ResultCache(
+    "timeline-revision", "1", max_entries=0, ttl=settings.INTAKE_CACHE_TTL_SECONDS
+)
+_indexes: "OrderedDict[str, tuple]" = OrderedDict()
+_indexes_lock = threading.Lock()
+MAX_LOADED_INDEXES = 256
+
+
+def _remember(case_id: str, revision: str, index: TimelineIndex) -> None:
+    with _indexes_lock:
+        _indexes[case_id] = (revision, index)
+        _indexes.move_to_end(case_id)
+        while len(_indexes) > MAX_LOADED_INDEXES:
+            _indexes.popitem(last=False)
+
+
+def exhibit_event_key(case_id: str) -> str:
+    return f"timeline-exhibits:{case_id}"
+
+
+def _exhibit_events(case_id: str) -> Tuple[int, List[Dict[str, Any]]]:
+    """Revision and events of a case's exhibits, e.g. when each recording was made"""
+    key = exhibit_event_key(case_id)
+    try:
+        pipe = get_redis().pipeline(transaction=True)
+        pipe.get(f"{key}:revision")
+        pipe.hgetall(key)
+        revision, raw = pipe.execute()
+    except redis.RedisError:
+        # As with the cached intake events, an unreachable Redis degrades
+        # the timeline instead of failing the caller
+        return 0, []
+    events = [json.loads(value) for _, value in sorted(raw.items())]
+    return int(revision or 0), events
+
+
+def add_exhibit_event(case_id: str, filename: str, event: Dict[str, Any]) -> None:
+    """
+    Put a dated exhibit on a case's timeline, replacing any earlier event for `filename`.
+
+    Exhibit events are kept apart from the intake events that store_timeline
+    replaces wholesale, one hash field per exhibit, so concurrent ingests never
+    overwrite each other and a new intake does not drop them.
+    """
+    key = exhibit_event_key(case_id)
+    pipe = get_redis().pipeline(transaction=True)
+    pipe.hset(key, filename, json.dumps(event, sort_keys=True))
+    pipe.incr(f"{key}:revision")
+    pipe.execute()
+
+
+def remove_exhibit_event(case_id: str, filename: str) -> None:
+    """Take an exhibit off a case's timeline"""
+    key = exhibit_event_key(case_id)
+    pipe = get_redis().pipeline(transaction=True)
+    pipe.hdel(key, filename)
+    pipe.incr(f"{key}:revision")
+    pipe.execute()
+
+
+def store_timeline(case_id: str, events: List[Dict[str, Any]]) -> TimelineIndex:
+    """Index a case's normalized timeline and publish it to other workers"""
+    revision = content_key(events)[:16]
+    exhibit_revision, exhibit_events = _exhibit_events(case_id)
+
+    _timeline_store.set(content_key(case_id, revision), events)
+    _revision_store.set(content_key(case_id), revision)
+
+    index = TimelineIndex(events + exhibit_events)
+    _remember(case_id, f"{revision}:{exhibit_revision}", index)
+    return index
+
+
+def load_timeline(case_id: str) -> Optional[TimelineIndex]:
+    """The current timeline index for a case, or None if nothing was ever stored"""
+    revision = _revision_store.get(content_key(case_id))
+    exhibit_revision, exhibit_events = _exhibit_events(case_id)
+
+    with _indexes_lock:
+        loaded = _indexes.get(case_id)
+    if revision is None and not exhibit_revision:
+        # Never published, or Redis is unreachable and this process has the last copy
+        return loaded[1] if loaded is not None else None
+    current = f"{revision}:{exhibit_revision}"
+    if loaded is not None and loaded[0] == current:
+        return loaded[1]
+
+    events = _timeline_store.get(content_key(case_id, revision)) if revision is not None else []
+    if events is None:
+        return None
+
+    index = TimelineIndex(events + exhibit_events)
+    _remember(case_id, current, index)
+    return index
@@ -0,0 +1,272 @@
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+import fcntl
+import json
+import os
+import re
+import threading
+
+import numpy as np
+
+from app.core.config import settings
+
+
+# Below this many vectors an exact scan is faster than probing clusters
+IVF_MIN_VECTORS = 4096
+
+# Clusters searched per query
+IVF_NPROBE = 8
+
+# Retrain clusters once the index has grown this much since training
+IVF_RETRAIN_GROWTH = 2.0
+
+KMEANS_ITERATIONS = 12
+
+MAX_LOADED_INDEXES = 64
+
+_ARRAYS = ("keys", "vectors", "centroids", "assignments")
+
+_PATH_PART = re.compile(r"[A-Za-z0-9_-]+")
+
+
+def _ivf_list_count(count: int) -> int:
+    return int(min(1024, max(16, np.sqrt(count))))
+
+
+def train_centroids(vectors: np.ndarray, lists: int, seed: int = 0) -> np.ndarray:
+    """Spherical k-means over a sample of unit vectors"""
+    rng = np.random.default_rng(seed)
+    sample = vectors[np.sort(rng.choice(len(vectors), size=min(len(vectors), 32 * lists), replace=False))]
+    centroids = sample[rng.choice(len(sample), size=lists, replace=False)].copy()
+
+    for _ in range(KMEANS_ITERATIONS):
+        assignments = np.argmax(sample @ centroids.T, axis=1)
+        order = np.argsort(assignments, kind="stable")
+        starts = np.searchsorted(assignments[order], np.arange(lists))
+        sums = np.add.reduceat(sample[order], np.minimum(starts, len(sample) - 1), axis=0)
+        # reduceat yields a single row for empty clusters; zero them
+        sums[np.bincount(assignments, minlength=lists) == 0] = 0
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        # Empty clusters keep their previous centroid
+        centroids = np.where(norms > 0, sums / np.maximum(norms, 1e-12), centroids).astype(np.float32)
+
+    return centroids
+
+
+class VectorIndex:
+    """
+    Cosine-similarity index over unit vectors, keyed by row id.
+
+    Small indexes are scanned exactly. From IVF_MIN_VECTORS rows an inverted
+    file is used: rows are assigned to spherical k-means centroids and a query
+    only scores the rows in its IVF_NPROBE closest clusters. Arrays may be
+    read-only memory maps; updates always produce a new index.
+    """
+
+    def __init__(
+        self,
+        keys: np.ndarray,
+        vectors: np.ndarray,
+        centroids: Optional[np.ndarray] = None,
+        assignments: Optional[np.ndarray] = None,
+        trained_count: int = 0,
+    ):
+        self.keys = keys
+        self.vectors = vectors
+        self.centroids = centroids
+        self.assignments = assignments
+        self.trained_count = trained_count
+
+        if centroids is not None:
+            self._order = np.argsort(assignments, kind="stable").astype(np.int32)
+            self._offsets = np.searchsorted(assignments[self._order], np.arange(len(centroids) + 1))
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @classmethod
+    def build(cls, keys: Sequence[str], vectors: np.ndarray) -> "VectorIndex":
+        """Index rows from scratch, training clusters when the index is large enough"""
+        keys_array = np.asarray(keys, dtype=str)
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if len(keys_array) < IVF_MIN_VECTORS:
+            return cls(keys_array, vectors)
+
+        centroids = train_centroids(vectors, _ivf_list_count(len(vectors)))
+        assignments = np.argmax(vectors @ centroids.T, axis=1).astype(np.int32)
+        return cls(keys_array, vectors, centroids, assignments, len(vectors))
+
+    def updated(self, keys: Sequence[str], vectors: np.ndarray) -> "VectorIndex":
+        """
+        A new index with `keys` inserted or replaced.
+
+        New rows are assigned to the existing clusters; clusters are only
+        retrained when the index has outgrown them.
+        """
+        incoming = set(keys)
+        keep = np.fromiter((key not in incoming for key in self.keys.tolist()), dtype=bool, count=len(self.keys))
+
+        merged_keys = np.concatenate([self.keys[keep], np.asarray(keys, dtype=str)])
+        merged_vectors = np.concatenate([self.vectors[keep], np.asarray(vectors, dtype=np.float32)])
+
+        if self.centroids is None or len(merged_keys) > IVF_RETRAIN_GROWTH * self.trained_count:
+            return VectorIndex.build(merged_keys, merged_vectors)
+
+        added = np.argmax(np.asarray(vectors, dtype=np.float32) @ self.centroids.T, axis=1).astype(np.int32)
+        assignments = np.concatenate([self.assignments[keep], added])
+        return VectorIndex(merged_keys, merged_vectors, self.centroids, assignments, self.trained_count)
+
+    def search(self, query: np.ndarray, limit: int = 5, nprobe: int = IVF_NPROBE) -> List[Tuple[str, float]]:
+        """The `limit` rows most similar to a unit query vector, best first"""
+        if not len(self.keys) or limit <= 0:
+            return []
+
+        query = np.asarray(query, dtype=np.float32)
+        if self.centroids is None:
+            candidates = None
+            scores = self.vectors @ query
+        else:
+            nearest = np.argpartition(-(self.centroids @ query), min(nprobe, len(self.centroids)) - 1)[:nprobe]
+            candidates = np.concatenate([self._order[self._offsets[i]:self._offsets[i + 1]] for i in nearest])
+            scores = self.vectors[candidates] @ query
+
+        limit = min(limit, len(scores))
+        if not limit:
+            return []
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top])]
+        rows = top if candidates is None else candidates[top]
+
+        return [(str(self.keys[row]), float(scores[index])) for row, index in zip(rows, top)]
+
+    def save(self, directory: Path, generation: int) -> None:
+        """Write this index as generation `generation` of `directory`"""
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in _ARRAYS:
+            array = getattr(self, name)
+            if array is not None:
+                np.save(directory / f"{name}-{generation}.npy", array)
+
+        manifest = {
+            "generation": generation,
+            "count": len(self.keys),
+            "ivf": self.centroids is not None,
+            "trained_count": self.trained_count,
+        }
+        staged = directory / f"manifest-{generation}.json"
+        staged.write_text(json.dumps(manifest))
+        # Readers pick up the new generation only once it is complete
+        os.replace(staged, directory / "manifest.json")
+
+    @classmethod
+    def load(cls, directory: Path, manifest: Dict[str, Any]) -> "VectorIndex":
+        """Open a saved generation with its arrays memory-mapped read-only"""
+        generation = manifest["generation"]
+
+        def array(name: str) -> np.ndarray:
+            return np.load(directory / f"{name}-{generation}.npy", mmap_mode="r")
+
+        return cls(
+            array("keys"),
+            array("vectors"),
+            array("centroids") if manifest["ivf"] else None,
+            array("assignments") if manifest["ivf"] else None,
+            manifest["trained_count"],
+        )
+
+
+def index_directory(case_id: str, table: str) -> Path:
+    """Directory holding a case's index for one table"""
+    for part in (case_id, table):
+        if not _PATH_PART.fullmatch(part):
+            raise ValueError(f"Invalid index path component: {part!r}")
+    return Path(settings.VECTOR_INDEX_DIR) / case_id / table
+
+
+def _read_manifest(directory: Path) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads((directory / "manifest.json").read_text())
+    except FileNotFoundError:
+        return None
+
+
+_loaded: "OrderedDict[Tuple[str, str], Tuple[Tuple[int, int], VectorIndex]]" = OrderedDict()
+_loaded_lock = threading.Lock()
+
+
+def load_index(case_id: str, table: str) -> Optional[VectorIndex]:
+    """
+    The current index for a case table, or None if none was built.
+
+    Opened indexes are kept per process and only reopened when another
+    process publishes a newer generation. The arrays are memory maps, so every
+    worker on the host shares one copy in the page cache.
+    """
+    directory = index_directory(case_id, table)
+    try:
+        status = (directory / "manifest.json").stat()
+    except FileNotFoundError:
+        return None
+
+    # The manifest is replaced, never rewritten, so a new inode means a new generation
+    stamp = (status.st_ino, status.st_mtime_ns)
+    key = (case_id, table)
+    with _loaded_lock:
+        loaded = _loaded.get(key)
+        if loaded is not None and loaded[0] == stamp:
+            _loaded.move_to_end(key)
+            return loaded[1]
+
+    manifest = _read_manifest(directory)
+    if manifest is None:
+        return None
+    try:
+        index = VectorIndex.load(directory, manifest)
+    except FileNotFoundError:
+        # A writer published and cleaned up a newer generation in between
+        return load_index(case_id, table)
+
+    with _loaded_lock:
+        _loaded[key] = (stamp, index)
+        _loaded.move_to_end(key)
+        while len(_loaded) > MAX_LOADED_INDEXES:
+            _loaded.popitem(last=False)
+
+    return index
+
+
+@contextmanager
+def _writer_lock(directory: Path) -> Iterator[None]:
+    """Serialize writers to one index across processes"""
+    directory.mkdir(parents=True, exist_ok=True)
+    with open(directory / ".lock", "w") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def update_index(case_id: str, table: str, keys: Sequence[str], vectors: np.ndarray) -> VectorIndex:
+    """Insert or replace rows in a case's index and publish a new generation"""
+    directory = index_directory(case_id, table)
+
+    with _writer_lock(directory):
+        manifest = _read_manifest(directory)
+        if manifest is None:
+            index = VectorIndex.build(keys, vectors)
+            generation = 1
+        else:
+            index = VectorIndex.load(directory, manifest).updated(keys, vectors)
+            generation = manifest["generation"] + 1
+
+        index.save(directory, generation)
+
+        # Processes that still map the old files keep them alive until they reload
+        if manifest is not None:
+            for name in _ARRAYS:
+                (directory / f"{name}-{manifest['generation']}.npy").unlink(missing_ok=True)
+
+    return index
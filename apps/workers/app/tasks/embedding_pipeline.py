@@ -0,0 +1,185 @@
+from celery_app import celery_app
+from app.core.config import settings
+from app.core.embeddings import Embedder, get_embedder, to_pgvector_binary
+from app.core.vector_index import load_index, update_index
+from app.core import database
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Sequence, Tuple
+from datetime import datetime
+import uuid
+
+import numpy as np
+
+
+# Characters of exhibit/fact text fed to the model
+EMBEDDING_MAX_CHARS = 20000
+
+# Each source yields (id, embedding_hash, body) for one case. The pipeline hashes `body` in SQL
+# with the same formula as embeddings.embedding_hash, so unchanged rows are
+# filtered out before any text is sent to the worker.
+EMBEDDING_SOURCES = {
+    "exhibits": """
+        SELECT e.id, e.embedding_hash,
+               left(concat_ws(E'\\n', e.title, string_agg(p.text, E'\\n' ORDER BY p.page)), %(max_chars)s) AS body
+        FROM exhibits e
+        LEFT JOIN exhibit_pages p ON p.checksum = e.checksum
+        WHERE e.case_id = %(case_id)s
+        GROUP BY e.id
+    """,
+    "facts": """
+        SELECT id, embedding_hash, left(text, %(max_chars)s) AS body
+        FROM facts
+        WHERE case_id = %(case_id)s
+    """,
+}
+
+CHANGED_ROWS_QUERY = """
+    WITH source AS ({source}),
+    hashed AS (
+        SELECT id, body, embedding_hash,
+               left(encode(sha256(convert_to(%(version)s || E'\\n' || body, 'UTF8')), 'hex'), 32) AS body_hash
+        FROM source
+    )
+    SELECT id, body, body_hash FROM hashed
+    WHERE embedding_hash IS DISTINCT FROM body_hash
+"""
+
+CREATE_LOAD_TABLE = """
+    CREATE TEMP TABLE embedding_load (
+        id UUID PRIMARY KEY,
+        embedding VECTOR(1536),
+        embedding_hash TEXT
+    ) ON COMMIT DROP
+"""
+
+INDEXED_ROWS_QUERY = """
+    SELECT id, embedding::real[] FROM {table}
+    WHERE case_id = %(case_id)s AND embedding IS NOT NULL
+"""
+
+APPLY_LOAD_TABLE = """
+    UPDATE {table} AS target
+    SET embedding = load.embedding, embedding_hash = load.embedding_hash
+    FROM embedding_load AS load
+    WHERE target.id = load.id
+"""
+
+
+@celery_app.task(bind=True)
+def embed_case_records(
+    self, case_id: str, tables: Optional[List[str]] = None, model: str = ""
+) -> Dict[str, Any]:
+    """
+    Embed a case's exhibits and facts whose content changed since last run.
+    
+    Args:
+        case_id: The case ID
+        tables: Subset of "exhibits" and "facts" (default: both)
+        model: Registered embedding model name (default: EMBEDDING_MODEL)
+    
+    Returns:
+        Number of rows re-embedded per table
+    """
+    try:
+        embedder = get_embedder(model)
+        embedded = {}
+        
+        for table in tables or list(EMBEDDING_SOURCES):
+            embedded[table] = embed_table(case_id, table, embedder)
+        
+        return {
+            "case_id": case_id,
+            "model": embedder.version,
+            "embedded": embedded,
+            "embedded_at": datetime.utcnow().isoformat()
+        }
+    
+    except Exception as exc:
+        self.retry(countdown=60, max_retries=3)
+        raise exc
+
+
+def iter_embedded_batches(
+    rows: Iterable[Sequence[Any]], embedder: Embedder, batch_size: int = 0
+) -> Iterator[Tuple[List[Sequence[Any]], np.ndarray]]:
+    """
+    Embed (id, body, body_hash) rows a batch at a time.
+    
+    Yields:
+        Each batch of rows with its (len(batch), dim) vectors, one model call per batch
+    """
+    batch_size = batch_size or settings.EMBEDDING_BATCH_SIZE
+    batch: List[Sequence[Any]] = []
+    
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch, embedder.embed([body or "" for _, body, _ in batch])
+            batch = []
+    
+    if batch:
+        yield batch, embedder.embed([body or "" for _, body, _ in batch])
+
+
+def copy_values(batch: List[Sequence[Any]], vectors: np.ndarray) -> List[Tuple[bytes, bytes, bytes]]:
+    """Binary COPY values (id, embedding, body_hash) for an embedded batch"""
+    return [
+        (uuid.UUID(str(row_id)).bytes, vector, body_hash.encode("utf-8"))
+        for (row_id, _, body_hash), vector in zip(batch, to_pgvector_binary(vectors))
+    ]
+
+
+def embed_table(case_id: str, table: str, embedder: Embedder, batch_size: int = 0) -> int:
+    """
+    Re-embed changed rows of one table in a single transaction.
+    
+    Changed rows stream through a server-side cursor, vectors are COPYed into
+    a temporary table batch by batch in binary format, and one UPDATE applies
+    them all. Once committed, the new vectors are merged into the case's
+    in-process ANN index.
+    """
+    if table not in EMBEDDING_SOURCES:
+        raise ValueError(f"Unsupported embedding table: {table}")
+    
+    batch_size = batch_size or settings.EMBEDDING_BATCH_SIZE
+    query = CHANGED_ROWS_QUERY.format(source=EMBEDDING_SOURCES[table])
+    params = {"case_id": case_id, "version": embedder.version, "max_chars": EMBEDDING_MAX_CHARS}
+    keys: List[str] = []
+    vectors: List[np.ndarray] = []
+    
+    with database.transaction() as cursor:
+        cursor.execute(CREATE_LOAD_TABLE)
+        
+        with cursor.connection.cursor(name=f"embed_{table}") as source:
+            source.itersize = batch_size
+            source.execute(query, params)
+            
+            for batch, batch_vectors in iter_embedded_batches(source, embedder, batch_size):
+                database.copy_binary_rows(
+                    cursor, "embedding_load", ("id", "embedding", "embedding_hash"), copy_values(batch, batch_vectors)
+                )
+                keys.extend(str(row_id) for row_id, _, _ in batch)
+                vectors.append(batch_vectors)
+        
+        if keys:
+            cursor.execute(APPLY_LOAD_TABLE.format(table=table))
+    
+    if keys:
+        if load_index(case_id, table) is None:
+            rebuild_case_index(case_id, table)
+        else:
+            update_index(case_id, table, keys, np.concatenate(vectors))
+    
+    return len(keys)
+
+
+def rebuild_case_index(case_id: str, table: str) -> int:
+    """Build a case's ANN index from every stored vector, e.g. on a fresh host"""
+    with database.transaction() as cursor:
+        cursor.execute(INDEXED_ROWS_QUERY.format(table=table), {"case_id": case_id})
+        rows = cursor.fetchall()
+    
+    if rows:
+        keys = [str(row_id) for row_id, _ in rows]
+        update_index(case_id, table, keys, np.array([vector for _, vector in rows], dtype=np.float32))
+    
+    return len(rows)
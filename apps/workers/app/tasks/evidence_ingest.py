@@ -1,12 +1,77 @@
 from celery_app import celery_app
-from typing import Dict, Any, List
-import boto3
+from app.core.blob_store import blob_key, blob_store, derived_key, derived_prefix
+from app.core.cache import ResultCache, content_key
+from app.core.config import settings
+from app.core.image_preview import PREVIEW_FORMAT, render_pyramid
+from app.core.media_probe import probe_file, probe_object
+from app.core.merkle import MerkleHasher, MerkleTree
+from app.core.page_render import page_renderer
+from app.core.pdf_text import iter_pdf_pages
+from app.core.pools import get_thread_pool, iter_bounded
+from app.core.redaction import REDACTION_VERSION, get_redactor, load_case_names, redaction_profile
+from app.core.text_stats import SNIFF_SIZE, analyze_text, detect_encoding, offsets_to_npy
+from app.core.timeline_index import add_exhibit_event, remove_exhibit_event, to_iso_date
+from app.core import database, storage
+from typing import Dict, Any, BinaryIO, Callable, Iterator, List, Optional, Tuple
+from contextlib import ExitStack, contextmanager
+from collections import Counter
+from datetime import datetime
+from functools import partial
 import hashlib
+import json
 import mimetypes
 import os
+import re
+import tempfile
+import uuid
+from botocore.exceptions import BotoCoreError
 from PIL import Image
 import fitz  # PyMuPDF
 import io
+import urllib3
+
+
+# Extracted PDF pages written to the database per statement
+PAGE_FLUSH_SIZE = 16
+
+# Times an interrupted source stream is reopened where it stopped
+SOURCE_RESUME_ATTEMPTS = 3
+
+# Failures of a source stream that are worth resuming
+SOURCE_READ_ERRORS = (OSError, BotoCoreError, urllib3.exceptions.HTTPError)
+
+# Files in flight per batch; each holds at most one local spool
+BATCH_INGEST_CONCURRENCY = 8
+
+# Exhibit rows written to the database per statement
+EXHIBIT_INSERT_BATCH = 200
+
+# Encodings the byte-level redactor reads correctly
+REDACTABLE_ENCODINGS = ("utf-8", "cp1252")
+
+# Idempotent on (case_id, checksum), so a retried batch rewrites the rows it
+# already flushed instead of inserting them again. An exhibit keeps the code
+# it was first given.
+EXHIBIT_INSERT = (
+    "INSERT INTO exhibits (case_id, code, title, s3_key, mime, foundation, checksum, size_bytes, custody_root) "
+    "VALUES %s "
+    "ON CONFLICT (case_id, checksum) DO UPDATE SET title = EXCLUDED.title, s3_key = EXCLUDED.s3_key, "
+    "mime = EXCLUDED.mime, foundation = EXCLUDED.foundation, "
+    "size_bytes = EXCLUDED.size_bytes, custody_root = EXCLUDED.custody_root"
+)
+
+EXHIBIT_CODES_QUERY = "SELECT code, checksum FROM exhibits WHERE case_id = %s"
+
+# Codes handed out to exhibits ingested without one
+EXHIBIT_CODE_PATTERN = re.compile(r"EX-(\d+)")
+
+EXHIBIT_PAGE_INSERT = (
+    "INSERT INTO exhibit_pages (checksum, page, text, words) VALUES %s "
+    "ON CONFLICT (checksum, page) DO UPDATE SET text = EXCLUDED.text, words = EXCLUDED.words"
+)
+
+# Redacted copies per (checksum, name set), so duplicates are not rescanned
+redaction_cache = ResultCache("exhibit-redaction", REDACTION_VERSION)
 
 
 @celery_app.task(bind=True)
@@ -14,78 +79,743 @@ def ingest_exhibit(self, case_id: str, file_data: Dict[str, Any]) -> Dict[str, A
     """
     Process and ingest an exhibit file.
     
+    The file is passed by reference and streamed to a local spool while it is
+    hashed, so worker memory stays at a few chunk sizes regardless of file
+    size. Content is stored once per SHA-256: when the checksum is already
+    known, the upload and metadata extraction are skipped and the case just
+    gains a reference to the existing blob.
+    
     Args:
         case_id: The case ID
-        file_data: File metadata and content
+        file_data: File metadata (`filename`, `mime_type`) plus one source:
+            `staged_key` (object already uploaded to the bucket, e.g. through a
+            signed URL), `path` (file on a volume shared with the worker), or
+            legacy inline `content` bytes
         
     Returns:
         Processed exhibit data with S3 key, metadata, and foundation requirements
     """
     try:
-        # Extract file information
-        filename = file_data.get('filename')
-        content = file_data.get('content')
-        mime_type = file_data.get('mime_type')
-        
-        # Generate checksum
-        checksum = hashlib.sha256(content).hexdigest()
-        
-        # Determine file type and process accordingly
-        if mime_type.startswith('image/'):
-            processed_data = process_image(content, filename, mime_type)
-        elif mime_type == 'application/pdf':
-            processed_data = process_pdf(content, filename)
-        elif mime_type.startswith('text/'):
-            processed_data = process_text(content, filename, mime_type)
-        else:
-            processed_data = process_generic(content, filename, mime_type)
+        return ingest_file(case_id, file_data)
         
-        # Upload to S3/MinIO
-        s3_key = upload_to_s3(case_id, filename, content, mime_type)
+    except Exception as exc:
+        self.retry(countdown=60, max_retries=3)
+        raise exc
+
+
+@celery_app.task(bind=True)
+def ingest_exhibits_batch(
+    self, case_id: str, files: List[Dict[str, Any]], concurrency: int = BATCH_INGEST_CONCURRENCY
+) -> Dict[str, Any]:
+    """
+    Ingest many exhibits in one message, pipelining transfers and parsing.
+    
+    Up to `concurrency` files move through the pipeline at once: transfers run
+    on I/O threads while PDF text and image previews run on their process
+    pools, so a large production is bound by the slowest resource rather than
+    the sum of every step. Exhibit rows are inserted in bulk as files finish.
+    
+    Args:
+        case_id: The case ID
+        files: One `file_data` payload per exhibit, as for `ingest_exhibit`;
+            each may also carry an exhibit `code` and `title`
+        concurrency: Maximum number of files in flight
         
-        # Determine foundation requirements based on file type
-        foundation_requirements = get_foundation_requirements(mime_type, processed_data)
+    Returns:
+        Batch summary with one result per input file, in input order, each
+        with the `exhibit_code` it was stored under. Files that fail, including
+        those asking for a code other content already has, carry an error
+        instead of failing the whole batch.
+    """
+    try:
+        results: List[Optional[Dict[str, Any]]] = [None] * len(files)
+        rows = []
+        completed = 0
+        # Loaded on every attempt, so a retry finds the rows it already flushed
+        codes = ExhibitCodes(existing_exhibit_codes(case_id))
+        
+        for index, result in iter_ingested_batch(case_id, files, concurrency):
+            if result["status"] != "error":
+                code = codes.assign(files[index].get('code'), result["checksum"])
+                if code is None:
+                    result = code_collision(result, files[index]['code'])
+                else:
+                    result["exhibit_code"] = code
+                    rows.append(exhibit_row(case_id, code, files[index], result))
+                    if len(rows) >= EXHIBIT_INSERT_BATCH:
+                        insert_exhibit_rows(rows)
+            
+            results[index] = result
+            completed += 1
+            
+            if self.request.id:
+                self.update_state(
+                    state="PROGRESS",
+                    meta={
+                        "completed": completed,
+                        "total": len(files),
+                        "filename": result["filename"],
+                        "status": result["status"]
+                    }
+                )
         
-        result = {
-            "exhibit_id": f"exhibit_{case_id}_{checksum[:8]}",
+        insert_exhibit_rows(rows)
+        failed = sum(1 for result in results if result["status"] == "error")
+        
+        return {
+            "case_id": case_id,
+            "total": len(results),
+            "succeeded": len(results) - failed,
+            "failed": failed,
+            "results": results,
+            "ingested_at": datetime.utcnow().isoformat()
+        }
+        
+    except Exception as exc:
+        self.retry(countdown=60, max_retries=3)
+        raise exc
+
+
+@celery_app.task(bind=True)
+def release_exhibit(self, case_id: str, filename: str, checksum: str) -> Dict[str, Any]:
+    """
+    Drop a case's reference to an exhibit blob, deleting the blob when unused.
+    
+    Args:
+        case_id: The case ID
+        filename: Filename the exhibit was ingested under
+        checksum: The exhibit's SHA-256
+        
+    Returns:
+        Remaining reference count and whether the blob was deleted
+    """
+    try:
+        remaining, released = blob_store.release_reference(checksum, f"{case_id}/{filename}")
+        blob_store.unindex_case_exhibit(case_id, filename)
+        remove_exhibit_event(case_id, filename)
+        deleted = False
+        
+        if released is not None:
+            # The record is already out of the registry, so no ingest can
+            # dedupe onto the blob while its objects are deleted. Derived
+            # artifacts (pages, previews, renders, redacted copies, custody
+            # sidecar) go with it.
+            keys = [released["s3_key"], *storage.list_keys(derived_prefix(checksum))]
+            failed = storage.delete_objects(keys)
+            if failed:
+                raise RuntimeError(f"Failed to delete {len(failed)} objects of blob {checksum}")
+            blob_store.finish_release(checksum)
+            deleted = True
+        
+        return {
             "case_id": case_id,
-            "filename": filename,
-            "s3_key": s3_key,
-            "mime_type": mime_type,
             "checksum": checksum,
-            "size_bytes": len(content),
-            "foundation_requirements": foundation_requirements,
-            "metadata": processed_data,
-            "status": "ingested"
+            "reference_count": remaining,
+            "blob_deleted": deleted
         }
         
-        return result
+    except Exception as exc:
+        self.retry(countdown=60, max_retries=3)
+        raise exc
+
+
+@celery_app.task(bind=True)
+def verify_exhibit_range(self, checksum: str, start: int = 0, end: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Check a byte range of a stored exhibit against its chain-of-custody tree.
+    
+    Only the custody chunks overlapping the range are downloaded and hashed,
+    so spot-checking a range served to a viewer, or one scene of a long
+    video, does not mean rehashing the whole file.
+    
+    Args:
+        checksum: The exhibit's SHA-256
+        start: First byte of the range
+        end: End of the range (exclusive), or None for the end of the file
+        
+    Returns:
+        Whether the range is intact, with the indexes of any chunks that are not
+    """
+    try:
+        return verify_blob_range(checksum, start, end)
         
     except Exception as exc:
         self.retry(countdown=60, max_retries=3)
         raise exc
 
 
-def process_image(content: bytes, filename: str, mime_type: str) -> Dict[str, Any]:
-    """Process image files for metadata extraction"""
+@celery_app.task(bind=True)
+def render_exhibit_page(self, checksum: str, page: int, zoom: float = 1.0) -> Dict[str, Any]:
+    """
+    Render one page of a PDF exhibit for viewing.
+    
+    Renders come from the worker's page cache when possible, and each request
+    queues the following pages so scrolling forward does not wait.
+    
+    Args:
+        checksum: The exhibit's SHA-256
+        page: 1-based page number
+        zoom: Scale factor; 1.0 renders at 72 dpi
+        
+    Returns:
+        Signed URL and size of the rendered PNG, plus the document's page count
+    """
     try:
-        image = Image.open(io.BytesIO(content))
+        s3_key, rendered = page_renderer.publish(checksum, page - 1, zoom)
         
         return {
-            "width": image.width,
-            "height": image.height,
-            "format": image.format,
-            "mode": image.mode,
-            "exif_data": extract_exif_data(image) if hasattr(image, '_getexif') else None,
+            "checksum": checksum,
+            "page": page,
+            "page_count": rendered.page_count,
+            "width": rendered.width,
+            "height": rendered.height,
+            "s3_key": s3_key,
+            "url": storage.presign_url(s3_key)
         }
+        
+    except Exception as exc:
+        self.retry(countdown=60, max_retries=3)
+        raise exc
+
+
+@celery_app.task(bind=True)
+def probe_exhibit_media(self, checksum: str) -> Dict[str, Any]:
+    """
+    Read container metadata of a stored audio or video exhibit.
+    
+    Only the header byte ranges are fetched, so exhibits stored before
+    probing existed can be backfilled without downloading them.
+    
+    Args:
+        checksum: The exhibit's SHA-256
+        
+    Returns:
+        Duration, codecs, resolution and creation time, where recorded
+    """
+    try:
+        record = blob_store.lookup(checksum)
+        if record is None:
+            raise LookupError(f"Unknown exhibit blob {checksum}")
+        
+        return {
+            "checksum": checksum,
+            **probe_object(record["s3_key"], record["size_bytes"])
+        }
+        
+    except Exception as exc:
+        self.retry(countdown=60, max_retries=3)
+        raise exc
+
+
+def ingest_file(case_id: str, file_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Hash, deduplicate, store and describe one exhibit"""
+    # Extract file information
+    filename = file_data.get('filename')
+    mime_type = file_data.get('mime_type') or mimetypes.guess_type(filename or '')[0] or 'application/octet-stream'
+    staged_key = file_data.get('staged_key')
+    
+    with ExitStack() as stack:
+        # Hashing needs one full read; keep a local copy for metadata extraction
+        # unless the source already is a local file
+        local_path = file_data.get('path')
+        if local_path:
+            with open(local_path, 'rb') as handle:
+                checksum, size_bytes, custody = hash_stream(handle)
+        else:
+            source = stack.enter_context(open_exhibit_source(file_data))
+            spool = stack.enter_context(tempfile.NamedTemporaryFile(suffix=os.path.splitext(filename or '')[1]))
+            reopen = partial(reopen_staged_object, stack, staged_key) if staged_key else None
+            checksum, size_bytes, custody = hash_stream(source, tee=spool, reopen=reopen)
+            spool.flush()
+            local_path = spool.name
+        
+        record = blob_store.lookup(checksum)
+        deduplicated = record is not None
+        while True:
+            if record is None:
+                record = store_blob(checksum, local_path, size_bytes, filename, mime_type, staged_key, custody)
+            reference_count = blob_store.add_reference(checksum, f"{case_id}/{filename}")
+            if reference_count:
+                break
+            # Released between the lookup and the reference: store it again
+            record, deduplicated = None, False
+        
+        redaction = None
+        if mime_type.startswith('text/'):
+            names = file_data.get('pii_names') or load_case_names(case_id)
+            redaction = store_redacted_copy(checksum, local_path, mime_type, names, record.get("generation"))
+    
+    blob_store.index_case_exhibit(case_id, filename, checksum)
+    
+    if staged_key:
+        delete_staged_object(staged_key)
+    
+    processed_data = record["metadata"]
+    
+    # Determine foundation requirements based on file type
+    foundation_requirements = get_foundation_requirements(mime_type, processed_data)
+    
+    # A recording's embedded time also places it on the case timeline
+    recording = recording_event(filename, checksum, mime_type, processed_data)
+    if recording is not None:
+        add_exhibit_event(case_id, filename, recording)
+    
+    result = {
+        "exhibit_id": f"exhibit_{case_id}_{checksum[:8]}",
+        "case_id": case_id,
+        "filename": filename,
+        "s3_key": record["s3_key"],
+        "mime_type": mime_type,
+        "checksum": checksum,
+        "custody_checksum": record.get("custody_root"),
+        "size_bytes": size_bytes,
+        "foundation_requirements": foundation_requirements,
+        "metadata": processed_data,
+        "deduplicated": deduplicated,
+        "reference_count": reference_count,
+        "redaction": redaction,
+        "status": "ingested"
+    }
+    
+    return result
+
+
+def ingest_batch_item(case_id: str, file_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Ingest one file of a batch, returning an error result instead of raising"""
+    try:
+        return ingest_file(case_id, file_data)
+    except Exception as e:
+        return {
+            "case_id": case_id,
+            "filename": file_data.get('filename'),
+            "status": "error",
+            "error": str(e)
+        }
+
+
+def iter_ingested_batch(
+    case_id: str, files: List[Dict[str, Any]], concurrency: int = BATCH_INGEST_CONCURRENCY
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Ingest files on the batch thread pool, yielding (index, result) as each finishes"""
+    pool = get_thread_pool("exhibit-batch", BATCH_INGEST_CONCURRENCY)
+    ingest = partial(ingest_batch_item, case_id)
+    return iter_bounded(pool, ingest, files, max_in_flight=max(1, min(concurrency, BATCH_INGEST_CONCURRENCY)))
+
+
+class ExhibitCodes:
+    """
+    Exhibit codes in use in one case, by the checksum each is attached to.
+    
+    Content already in the case keeps its code. A requested code is refused
+    when it belongs to other content, and files without one continue the
+    case's EX-NNNN sequence, so a second batch never reuses the first's codes.
+    """
+    
+    def __init__(self, existing: Dict[str, Optional[str]]):
+        self.owners = dict(existing)
+        self.by_checksum = {checksum: code for code, checksum in existing.items() if checksum}
+        numbers = [int(match.group(1)) for match in map(EXHIBIT_CODE_PATTERN.fullmatch, existing) if match]
+        self.next_number = max(numbers, default=0) + 1
+    
+    def assign(self, requested: Optional[str], checksum: str) -> Optional[str]:
+        """Code for content in this case, or None if `requested` is taken by other content"""
+        known = self.by_checksum.get(checksum)
+        if known is not None:
+            return known
+        
+        if requested:
+            if requested in self.owners:
+                return None
+            code = requested
+        else:
+            code = f"EX-{self.next_number:04d}"
+            while code in self.owners:
+                self.next_number += 1
+                code = f"EX-{self.next_number:04d}"
+            self.next_number += 1
+        
+        self.owners[code] = checksum
+        self.by_checksum[checksum] = code
+        return code
+
+
+def existing_exhibit_codes(case_id: str) -> Dict[str, Optional[str]]:
+    """Exhibit codes already stored for a case, mapped to their checksums"""
+    with database.transaction() as cursor:
+        cursor.execute(EXHIBIT_CODES_QUERY, (case_id,))
+        return dict(cursor.fetchall())
+
+
+def code_collision(result: Dict[str, Any], code: str) -> Dict[str, Any]:
+    """Error result for a file whose requested code belongs to other content"""
+    # The blob stays stored under the case, so resubmitting the file with a
+    # free code only adds its row
+    return {
+        "case_id": result["case_id"],
+        "filename": result["filename"],
+        "checksum": result["checksum"],
+        "status": "error",
+        "error": f"Exhibit code {code} is already used by another exhibit in this case"
+    }
+
+
+def exhibit_row(case_id: str, code: str, file_data: Dict[str, Any], result: Dict[str, Any]) -> Tuple[Any, ...]:
+    """Row for the exhibits table from an ingest result"""
+    return (
+        case_id,
+        code,
+        file_data.get('title') or result["filename"],
+        result["s3_key"],
+        result["mime_type"],
+        json.dumps(result["foundation_requirements"]),
+        result["checksum"],
+        result["size_bytes"],
+        result.get("custody_checksum"),
+    )
+
+
+def insert_exhibit_rows(rows: List[Tuple[Any, ...]]) -> None:
+    """Bulk upsert pending exhibit rows and clear the list"""
+    if rows:
+        # One statement may not upsert the same row twice; identical content
+        # in a batch shares one exhibit
+        unique = list({(row[0], row[6]): row for row in rows}.values())
+        database.insert_rows(EXHIBIT_INSERT, unique, template="(%s, %s, %s, %s, %s, %s::jsonb, %s, %s, %s)")
+        rows.clear()
+
+
+def hash_stream(
+    source: BinaryIO,
+    tee: Optional[BinaryIO] = None,
+    reopen: Optional[Callable[[int], BinaryIO]] = None,
+) -> Tuple[str, int, MerkleTree]:
+    """
+    SHA-256, size and custody Merkle tree of a stream, copying it to `tee` when given.
+    
+    With `reopen(offset)`, a stream that fails part way is reopened at the
+    last complete custody chunk, so an interrupted transfer only re-reads and
+    rehashes the chunk it was cut off in.
+    """
+    reader = HashingReader(source, tee)
+    resumes = 0
+    while True:
+        try:
+            # Reading a custody chunk at a time loses at most one chunk on failure
+            while reader.read(reader.merkle.chunk_size):
+                pass
+            break
+        except SOURCE_READ_ERRORS:
+            if reopen is None or resumes >= SOURCE_RESUME_ATTEMPTS:
+                raise
+            resumes += 1
+            reader.resume(reopen)
+    return reader.hexdigest(), reader.size_bytes, reader.merkle.finish()
+
+
+def reopen_staged_object(stack: ExitStack, staged_key: str, offset: int) -> BinaryIO:
+    """Stream a staged object from `offset` on, closed with `stack`"""
+    body = storage.open_object(staged_key, f"bytes={offset}-")
+    stack.callback(body.close)
+    return body
+
+
+def store_blob(
+    checksum: str,
+    local_path: str,
+    size_bytes: int,
+    filename: str,
+    mime_type: str,
+    staged_key: Optional[str] = None,
+    custody: Optional[MerkleTree] = None,
+) -> Dict[str, Any]:
+    """Store new content under its checksum and extract its metadata once"""
+    # Content released moments ago must finish deleting before it is stored again
+    blob_store.wait_for_release(checksum)
+    s3_key = blob_key(checksum)
+    # Distinguishes this copy of the content from one stored before a release
+    record = {"s3_key": s3_key, "mime_type": mime_type, "size_bytes": size_bytes, "generation": uuid.uuid4().hex}
+    object_metadata = {'sha256': checksum}
+    if custody is not None:
+        object_metadata['custody-root'] = custody.hexroot
+        record["custody_root"] = custody.hexroot
+        record["custody_key"] = storage.upload_bytes(
+            custody.to_sidecar(), derived_key(checksum, "custody/merkle.bin"), content_type='application/octet-stream'
+        )
+    
+    # Content already in the bucket is copied server-side rather than re-uploaded.
+    # The transfer runs on an I/O thread while the file is parsed.
+    uploads = get_thread_pool("exhibit-upload", settings.S3_TRANSFER_CONCURRENCY)
+    if staged_key:
+        upload = uploads.submit(storage.copy_object, staged_key, s3_key)
+    else:
+        upload = uploads.submit(
+            storage.upload_file, local_path, s3_key, content_type=mime_type, metadata=object_metadata
+        )
+    
+    # Determine file type and process accordingly
+    try:
+        processed_data = process_exhibit_file(local_path, filename, mime_type, size_bytes, checksum)
+    finally:
+        # The spool must outlive the upload
+        upload.result()
+    
+    record["metadata"] = processed_data
+    return blob_store.register(checksum, record)
+
+
+def load_custody_tree(record: Dict[str, Any]) -> MerkleTree:
+    """A blob's custody tree, checked against the root recorded at ingest"""
+    if not record.get("custody_key"):
+        raise LookupError(f"No custody tree for {record['s3_key']}")
+        
+    body = storage.open_object(record["custody_key"])
+    try:
+        tree = MerkleTree.from_sidecar(body.read())
+    finally:
+        body.close()
+        
+    if tree.hexroot != record["custody_root"]:
+        raise ValueError(f"Custody tree for {record['s3_key']} does not match its recorded root")
+    return tree
+
+
+def verify_blob_range(checksum: str, start: int = 0, end: Optional[int] = None) -> Dict[str, Any]:
+    """Hash only the custody chunks overlapping [start, end) and compare them to the tree"""
+    record = blob_store.lookup(checksum)
+    if record is None:
+        raise LookupError(f"Unknown exhibit blob {checksum}")
+    tree = load_custody_tree(record)
+    end = tree.size_bytes if end is None else min(end, tree.size_bytes)
+    chunks = tree.chunk_range(start, end)
+    tampered = []
+    
+    if chunks:
+        first_byte = tree.chunk_bounds(chunks[0])[0]
+        last_byte = tree.chunk_bounds(chunks[-1])[1] - 1
+        body = storage.open_object(record["s3_key"], f"bytes={first_byte}-{last_byte}")
+        try:
+            for index in chunks:
+                chunk_start, chunk_end = tree.chunk_bounds(index)
+                if not tree.verify_chunk(index, read_fully(body, chunk_end - chunk_start)):
+                    tampered.append(index)
+        finally:
+            body.close()
+            
+    return {
+        "checksum": checksum,
+        "custody_root": tree.hexroot,
+        "start": start,
+        "end": end,
+        "chunks_checked": len(chunks),
+        "tampered_chunks": tampered,
+        "verified": not tampered
+    }
+
+
+def store_redacted_copy(
+    checksum: str, path: str, mime_type: str, names: List[str], generation: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Stream a PII-redacted copy of a text exhibit next to its blob.
+    
+    Masking keeps byte offsets, so the span map and the line-offset index
+    apply to both copies. Content without matches is not copied: the
+    redacted key then points at the original blob. Results are cached per
+    stored `generation` of the blob, since releasing it deletes the copies.
+    """
+    profile = redaction_profile(names)
+    cache_key = content_key(checksum, generation, profile)
+    cached = redaction_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    with open(path, 'rb') as source:
+        encoding, _ = detect_encoding(source.read(SNIFF_SIZE))
+        if encoding not in REDACTABLE_ENCODINGS:
+            return {"profile": profile, "skipped": f"unsupported encoding {encoding}"}
+        source.seek(0)
+        
+        with tempfile.NamedTemporaryFile() as redacted:
+            spans = get_redactor(names, encoding).redact_stream(source, redacted)
+            redacted.flush()
+            if spans:
+                redacted_key = storage.upload_file(
+                    redacted.name, derived_key(checksum, f"redacted/{profile}/content"), content_type=mime_type
+                )
+            else:
+                redacted_key = blob_key(checksum)
+    
+    span_map = {"version": REDACTION_VERSION, "encoding": encoding, "spans": [list(span) for span in spans]}
+    result = {
+        "profile": profile,
+        "redacted_key": redacted_key,
+        "spans_key": storage.upload_bytes(
+            json.dumps(span_map, separators=(',', ':')).encode('utf-8'),
+            derived_key(checksum, f"redacted/{profile}/spans.json"),
+            content_type='application/json'
+        ),
+        "span_counts": dict(Counter(kind for _, _, kind in spans)),
+    }
+    redaction_cache.set(cache_key, result)
+    return result
+
+
+@contextmanager
+def open_exhibit_source(file_data: Dict[str, Any]) -> Iterator[BinaryIO]:
+    """Open a readable binary stream over whichever source the message references"""
+    if file_data.get('staged_key'):
+        body = storage.open_object(file_data['staged_key'])
+        try:
+            yield body
+        finally:
+            body.close()
+    elif file_data.get('path'):
+        with open(file_data['path'], 'rb') as handle:
+            yield handle
+    elif file_data.get('content') is not None:
+        yield io.BytesIO(file_data['content'])
+    else:
+        raise ValueError("file_data must include staged_key, path or content")
+
+
+class HashingReader:
+    """
+    Non-seekable reader that hashes (and optionally tees) what passes through.
+    
+    Reads are filled to the requested size, so a multipart upload never gets a
+    short part from a network stream that returns partial reads.
+    """
+    
+    def __init__(self, source: BinaryIO, tee: Optional[BinaryIO] = None):
+        self.source = source
+        self.tee = tee
+        self.hasher = hashlib.sha256()
+        self.merkle = MerkleHasher()
+        self.size_bytes = 0
+        # Size and SHA-256 state at the last complete custody chunk
+        self._checkpoint = (0, self.hasher.copy())
+    
+    def readable(self) -> bool:
+        return True
+    
+    def seekable(self) -> bool:
+        return False
+    
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            data = self.source.read()
+        else:
+            data = read_fully(self.source, size)
+        
+        # Feed the flat hash a custody chunk at a time to checkpoint its state
+        view = memoryview(data)
+        while view:
+            piece = view[:self.merkle.chunk_size - self.merkle.pending_bytes]
+            view = view[len(piece):]
+            self.hasher.update(piece)
+            self.merkle.update(piece)
+            if not self.merkle.pending_bytes:
+                self._checkpoint = (self.merkle.size_bytes, self.hasher.copy())
+                
+        self.size_bytes += len(data)
+        if self.tee is not None:
+            self.tee.write(data)
+        return data
+    
+    def resume(self, reopen: Callable[[int], BinaryIO]) -> None:
+        """Drop back to the last complete custody chunk and continue from a reopened source"""
+        offset, hasher = self._checkpoint
+        self.hasher = hasher.copy()
+        self.merkle.rewind(offset)
+        self.size_bytes = offset
+        if self.tee is not None:
+            self.tee.seek(offset)
+            self.tee.truncate()
+        self.source = reopen(offset)
+        
+    def hexdigest(self) -> str:
+        return self.hasher.hexdigest()
+
+
+def read_fully(source: BinaryIO, size: int) -> bytes:
+    """Read `size` bytes, or up to EOF, from a stream that may return short reads"""
+    buffer = bytearray()
+    while len(buffer) < size:
+        chunk = source.read(size - len(buffer))
+        if not chunk:
+            break
+        buffer += chunk
+    return bytes(buffer)
+
+
+def process_exhibit_file(
+    path: str,
+    filename: str,
+    mime_type: str,
+    size_bytes: int,
+    checksum: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Dispatch metadata extraction by MIME type"""
+    if mime_type.startswith('image/'):
+        return process_image(path, filename, mime_type, checksum)
+    elif mime_type == 'application/pdf':
+        return process_pdf(path, filename, checksum)
+    elif mime_type.startswith('text/'):
+        return process_text(path, filename, mime_type, checksum)
+    elif mime_type.startswith(('audio/', 'video/')):
+        return process_media(path, size_bytes, filename, mime_type)
+    else:
+        return process_generic(size_bytes, filename, mime_type)
+
+
+def process_image(path: str, filename: str, mime_type: str, checksum: Optional[str] = None) -> Dict[str, Any]:
+    """Process image files for metadata extraction, and previews when `checksum` is given"""
+    try:
+        # Image.open only parses the header; nothing here may call load()
+        with Image.open(path) as image:
+            metadata = {
+                "width": image.width,
+                "height": image.height,
+                "format": image.format,
+                "mode": image.mode,
+                "exif_data": extract_exif_data(image) if hasattr(image, '_getexif') else None,
+            }
     except Exception as e:
         return {"error": f"Failed to process image: {str(e)}"}
+    
+    if checksum:
+        try:
+            metadata["previews"] = store_previews(path, checksum)
+        except Exception as e:
+            metadata["previews"] = {"error": f"Failed to render previews: {str(e)}"}
+    
+    return metadata
 
 
-def process_pdf(content: bytes, filename: str) -> Dict[str, Any]:
-    """Process PDF files for metadata extraction"""
+def store_previews(path: str, checksum: str) -> List[Dict[str, Any]]:
+    """Render the preview pyramid and store each level next to the original"""
+    previews = []
+    
+    for level in render_pyramid(path):
+        s3_key = storage.upload_bytes(
+            level["data"],
+            derived_key(checksum, f"preview/{level['size']}.{PREVIEW_FORMAT.lower()}"),
+            content_type=f"image/{PREVIEW_FORMAT.lower()}"
+        )
+        previews.append({
+            "size": level["size"],
+            "width": level["width"],
+            "height": level["height"],
+            "s3_key": s3_key
+        })
+    
+    return previews
+
+
+def process_pdf(path: str, filename: str, checksum: Optional[str] = None) -> Dict[str, Any]:
+    """Process PDF files for metadata extraction, and page text when `checksum` is given"""
     try:
-        pdf_document = fitz.open(stream=content, filetype="pdf")
+        pdf_document = fitz.open(path)
         
         metadata = {
             "page_count": len(pdf_document),
@@ -99,30 +829,116 @@ def process_pdf(content: bytes, filename: str) -> Dict[str, Any]:
         }
         
         pdf_document.close()
-        return metadata
     except Exception as e:
         return {"error": f"Failed to process PDF: {str(e)}"}
+    
+    if checksum:
+        try:
+            metadata["text"] = store_pdf_text(path, checksum, metadata["page_count"])
+        except Exception as e:
+            metadata["text"] = {"error": f"Failed to extract PDF text: {str(e)}"}
+    
+    return metadata
+
+
+def store_pdf_text(path: str, checksum: str, page_count: int) -> Dict[str, Any]:
+    """
+    Persist each page's text and word boxes as soon as it is extracted.
+    
+    Pages go to storage one object each and to `exhibit_pages` in batches of
+    PAGE_FLUSH_SIZE, so the start of a long document is searchable while the
+    rest is still being parsed.
+    """
+    batch: List[Tuple[str, int, str, str]] = []
+    character_count = 0
+    
+    def flush() -> None:
+        database.insert_rows(EXHIBIT_PAGE_INSERT, batch, template="(%s, %s, %s, %s::jsonb)")
+        batch.clear()
+    
+    for page in iter_pdf_pages(path, checksum, page_count):
+        storage.upload_bytes(
+            json.dumps(page, separators=(',', ':')).encode('utf-8'),
+            derived_key(checksum, f"pages/{page['page']:05d}.json"),
+            content_type='application/json'
+        )
+        
+        # Postgres text columns reject NUL characters
+        text = page["text"].replace('\x00', '')
+        character_count += len(text)
+        batch.append((checksum, page["page"], text, json.dumps(page["words"])))
+        if len(batch) >= PAGE_FLUSH_SIZE:
+            flush()
+    
+    if batch:
+        flush()
+    
+    return {
+        "pages_extracted": page_count,
+        "character_count": character_count,
+        "pages_prefix": derived_key(checksum, "pages/")
+    }
 
 
-def process_text(content: bytes, filename: str, mime_type: str) -> Dict[str, Any]:
-    """Process text files for metadata extraction"""
+def process_text(path: str, filename: str, mime_type: str, checksum: Optional[str] = None) -> Dict[str, Any]:
+    """Process text files in streamed chunks, storing a line-offset index when `checksum` is given"""
     try:
-        text_content = content.decode('utf-8', errors='ignore')
+        with open(path, 'rb', buffering=0) as handle:
+            stats = analyze_text(handle)
         
-        return {
-            "character_count": len(text_content),
-            "word_count": len(text_content.split()),
-            "line_count": len(text_content.splitlines()),
-            "encoding": "utf-8",
+        metadata = {
+            "character_count": stats.character_count,
+            "word_count": stats.word_count,
+            "line_count": stats.line_count,
+            "encoding": stats.encoding,
         }
+        
+        if checksum:
+            # Line i starts at byte offsets[i], so viewers can range-read any line
+            metadata["line_index_key"] = storage.upload_bytes(
+                offsets_to_npy(stats.line_offsets),
+                derived_key(checksum, "text/line-offsets.npy"),
+                content_type='application/octet-stream'
+            )
+        
+        return metadata
     except Exception as e:
         return {"error": f"Failed to process text: {str(e)}"}
 
 
-def process_generic(content: bytes, filename: str, mime_type: str) -> Dict[str, Any]:
+def process_media(path: str, size_bytes: int, filename: str, mime_type: str) -> Dict[str, Any]:
+    """Process audio and video files from their container headers, without decoding or reading the media"""
+    metadata = process_generic(size_bytes, filename, mime_type)
+    try:
+        metadata.update(probe_file(path))
+    except Exception as e:
+        metadata["error"] = f"Failed to probe media: {str(e)}"
+    return metadata
+
+
+def recording_event(filename: str, checksum: str, mime_type: str, metadata: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Timeline event for when an audio or video exhibit was recorded, or None if its headers do not say"""
+    creation_time = metadata.get("creation_time")
+    if not creation_time or not mime_type.startswith(('audio/', 'video/')):
+        return None
+    # Container times start with the date; an ID3 year alone cannot be placed
+    iso_date = to_iso_date(creation_time[:10])
+    if iso_date is None:
+        return None
+    return {
+        "date": iso_date,
+        "date_text": creation_time,
+        "description": f"Recording {filename} made",
+        "source": "exhibit",
+        "filename": filename,
+        "checksum": checksum,
+    }
+
+
+def process_generic(size_bytes: int, filename: str, mime_type: str) -> Dict[str, Any]:
     """Process generic files"""
     return {
-        "size_bytes": len(content),
+        "size_bytes": size_bytes,
         "mime_type": mime_type,
     }
 
@@ -154,35 +970,9 @@ def extract_exif_data(image: Image.Image) -> Dict[str, Any]:
     return {}
 
 
-def upload_to_s3(case_id: str, filename: str, content: bytes, mime_type: str) -> str:
-    """Upload file to S3/MinIO"""
-    try:
-        s3_client = boto3.client(
-            's3',
-            endpoint_url=os.getenv('S3_ENDPOINT_URL', 'http://localhost:9000'),
-            aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID', 'minioadmin'),
-            aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY', 'minioadmin'),
-            region_name=os.getenv('AWS_REGION', 'us-east-1'),
-        )
-        
-        bucket_name = os.getenv('S3_BUCKET', 'courtroom-simulator')
-        s3_key = f"cases/{case_id}/exhibits/{filename}"
-        
-        s3_client.put_object(
-            Bucket=bucket_name,
-            Key=s3_key,
-            Body=content,
-            ContentType=mime_type,
-            Metadata={
-                'case_id': case_id,
-                'original_filename': filename,
-            }
-        )
-        
-        return s3_key
-        
-    except Exception as e:
-        raise Exception(f"Failed to upload to S3: {str(e)}")
+def delete_staged_object(staged_key: str) -> None:
+    """Remove a staged upload once it has been ingested"""
+    storage.delete_objects([staged_key])
 
 
 def get_foundation_requirements(mime_type: str, metadata: Dict[str, Any]) -> List[str]:
@@ -214,6 +1004,18 @@ def get_foundation_requirements(mime_type: str, metadata: Dict[str, Any]) -> Lis
             "hearsay_exception"
         ])
         
+    elif mime_type.startswith(('audio/', 'video/')):
+        requirements.extend([
+            "authentication",
+            "relevance",
+            "fair_and_accurate_representation",
+            "chain_of_custody"
+        ])
+        
+        # Without an embedded recording time, a witness has to establish when it was made
+        if not metadata.get("creation_time"):
+            requirements.append("date_and_time_of_recording")
+        
     else:
         requirements.extend([
             "authentication",
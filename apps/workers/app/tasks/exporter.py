@@ -1,4 +1,5 @@
 from celery_app import celery_app
+from app.core import storage
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 import uuid
@@ -52,7 +53,7 @@ def export_trial_bundle(self, case_id: str, export_format: str = "zip") -> Dict[
             "case_id": case_id,
             "format": export_format,
             "download_url": download_url,
-            "expires_at": (datetime.utcnow().timestamp() + 3600),  # 1 hour expiry
+            "expires_at": (datetime.utcnow().timestamp() + EXPORT_URL_EXPIRY_SECONDS),
             "file_size": len(export_file),
             "exported_at": trial_data["exported_at"]
         }
@@ -333,11 +334,33 @@ Admitted: {len(exhibits['admitted'])}
 """
 
 
+EXPORT_CONTENT_TYPES = {
+    "zip": "application/zip",
+    "pdf": "application/pdf",
+    "html": "text/html",
+    "md": "text/markdown",
+}
+
+# Signed download links expire with the export record
+EXPORT_URL_EXPIRY_SECONDS = 3600
+
+
 def upload_and_sign_url(file_content: bytes, trial_data: Dict[str, Any]) -> str:
     """Upload file to storage and generate signed URL"""
-    # This would upload to S3/MinIO and generate a signed URL
-    # For now, return a placeholder URL
-    return f"https://storage.example.com/exports/{trial_data['export_id']}/trial-bundle.zip"
+    export_format = trial_data.get("format", "zip")
+    s3_key = f"exports/{trial_data['export_id']}/trial-bundle.{export_format}"
+    
+    storage.upload_bytes(
+        file_content,
+        s3_key,
+        content_type=EXPORT_CONTENT_TYPES.get(export_format, "application/octet-stream"),
+        metadata={
+            "case_id": str(trial_data["case_id"]),
+            "export_id": trial_data["export_id"],
+        }
+    )
+    
+    return storage.presign_url(s3_key, expires_in=EXPORT_URL_EXPIRY_SECONDS)
 
 
 @celery_app.task(bind=True)
@@ -1,9 +1,182 @@
 from celery_app import celery_app
-from typing import Dict, Any, List
+from app.core.cache import ResultCache, content_key
+from app.core.catalog import CATALOGS_VERSION, get_catalog
+from app.core.config import settings
+from app.core.pools import get_process_pool
+from app.core.redaction import store_case_names
+from app.core.timeline_index import TimelineIndex, sentence_around, store_timeline, to_iso_date
+from typing import Dict, Any, Iterator, List, NamedTuple, Optional, Tuple, Union
+from bisect import bisect_left
+import json
 import re
 from datetime import datetime
 
 
+# Charge/claim catalog: (terms, label, burden) per case type. Terms are matched
+# case-insensitively as substrings, longest term first at any given position.
+CHARGE_CATALOG = {
+    "criminal": [
+        (("theft", "stole", "stolen"), "Theft", "BRD"),
+        (("assault", "battery", "attack"), "Assault", "BRD"),
+        (("murder", "homicide", "killed"), "Murder", "BRD"),
+        (("burglary", "breaking", "entering"), "Burglary", "BRD"),
+        (("fraud", "deceit", "false"), "Fraud", "BRD"),
+        (("drug", "narcotic", "controlled substance"), "Drug Possession", "BRD"),
+        (("drunk", "dui", "dwi", "intoxicated"), "DUI", "BRD"),
+    ],
+    "civil": [
+        (("breach", "contract", "agreement"), "Breach of Contract", "preponderance"),
+        (("negligence", "careless", "fault"), "Negligence", "preponderance"),
+        (("defamation", "libel", "slander"), "Defamation", "preponderance"),
+        (("trespass", "property", "land"), "Trespass", "preponderance"),
+        (("nuisance", "annoyance", "disturbance"), "Nuisance", "preponderance"),
+    ],
+}
+
+
+def _trie_pattern(terms: List[str]) -> str:
+    """Build a prefix-factored alternation so each position is tried once"""
+    trie: Dict[str, Any] = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def emit(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # A term ending here may be extended by a longer one; the greedy
+        # optional group prefers the longer term and backtracks if it fails.
+        return f"(?:{body})?" if "" in node else body
+
+    return emit(trie)
+
+
+def _overlaps(outer: str, inner: str) -> bool:
+    """Whether a match of `outer` can hide an occurrence of `inner` from a non-overlapping scan"""
+    if inner != outer and inner in outer:
+        return True
+    # inner starts inside outer and runs past its end
+    return any(outer.endswith(inner[:size]) for size in range(1, len(inner)))
+
+
+def compile_charge_matcher(
+    catalog: List[Tuple[Tuple[str, ...], str, str]]
+) -> Tuple["re.Pattern[str]", Dict[str, int], Dict[str, List[Tuple[str, int]]]]:
+    """
+    Compile a charge catalog into a single scanner.
+
+    Returns:
+        The combined pattern (matched against lowercased text), a map from
+        each term to the index of its catalog entry, and for each term the
+        terms of other entries that its matches may hide, e.g. "land" inside
+        "slander", with their entry indexes
+    """
+    term_index: Dict[str, int] = {}
+    for index, (terms, _, _) in enumerate(catalog):
+        for term in terms:
+            term_index.setdefault(term.lower(), index)
+
+    hidden: Dict[str, List[Tuple[str, int]]] = {}
+    for outer, outer_index in term_index.items():
+        for inner, inner_index in term_index.items():
+            if inner_index != outer_index and _overlaps(outer, inner):
+                hidden.setdefault(outer, []).append((inner, inner_index))
+
+    return re.compile(_trie_pattern(list(term_index))), term_index, hidden
+
+
+CHARGE_MATCHERS = {
+    case_type: compile_charge_matcher(catalog)
+    for case_type, catalog in CHARGE_CATALOG.items()
+}
+
+# Cases per process-pool job in normalize_intake_batch
+BATCH_CHUNK_SIZE = 200
+
+MONTH_NAMES = (
+    "January|February|March|April|May|June|July|August|September|October|November|December"
+)
+
+WITNESS_CUES = "witness(?:es)?|testified|saw|observed|heard|reported"
+
+# One tokenizing pass over the summary. Dates are tried before names, a name
+# may not swallow the month of a following "Month DD, YYYY" date, and a
+# capitalized cue word ("Witness Sarah Wilson") is a cue, not a first name.
+ENTITY_PATTERN = re.compile(
+    rf"(?P<date>\d{{1,2}}/\d{{1,2}}/\d{{4}}|\d{{4}}-\d{{2}}-\d{{2}}|(?:{MONTH_NAMES}) \d{{1,2}},? \d{{4}})"
+    rf"|(?P<name>(?!(?i:{WITNESS_CUES})\b)[A-Z][a-z]+ (?:[A-Z]\. )?(?!(?:{MONTH_NAMES}) \d)[A-Z][a-z]+)"
+    rf"|(?P<witness_cue>(?i:{WITNESS_CUES}))"
+)
+
+# Characters either side of a witness cue searched for a name
+WITNESS_WINDOW = 50
+
+
+# Paragraphs are separated by blank lines. No charge term or entity can span
+# one, so per-paragraph extraction rebased to absolute offsets matches a full scan.
+PARAGRAPH_BREAK = re.compile(r"\n[ \t\r]*\n")
+
+# Sections of a normalized case diffed by normalize_intake_incremental, with
+# the fields that identify an item within each
+DELTA_SECTIONS = {
+    "counts": ("label",),
+    "elements": ("count_id", "name"),
+    "defenses": ("count_id", "name"),
+    "parties": ("name", "side"),
+    "timeline": None,
+    "witnesses": ("name",),
+    "exhibits": ("code",),
+}
+
+# Bump when parser output changes; catalog edits are picked up automatically
+NORMALIZER_VERSION = "5"
+CATALOG_VERSION = content_key(CHARGE_CATALOG, ENTITY_PATTERN.pattern, WITNESS_WINDOW, CATALOGS_VERSION)[:12]
+
+intake_cache = ResultCache(
+    "intake",
+    f"{NORMALIZER_VERSION}:{CATALOG_VERSION}",
+    max_entries=settings.INTAKE_CACHE_MAX_ENTRIES,
+    ttl=settings.INTAKE_CACHE_TTL_SECONDS,
+)
+
+paragraph_cache = ResultCache(
+    "intake-paragraph",
+    f"{NORMALIZER_VERSION}:{CATALOG_VERSION}",
+    max_entries=settings.INTAKE_CACHE_MAX_ENTRIES * 8,
+    ttl=settings.INTAKE_CACHE_TTL_SECONDS,
+)
+
+# Intake last published to each case's timeline and redaction names, so a
+# repeat intake costs one read instead of rewriting both. Shared through
+# Redis only: another worker may have published a newer intake since.
+published_intakes = ResultCache(
+    "intake-published",
+    NORMALIZER_VERSION,
+    max_entries=0,
+    ttl=settings.INTAKE_CACHE_TTL_SECONDS,
+)
+
+# Last normalized state per case, the base for incremental deltas
+intake_state_cache = ResultCache(
+    "intake-state",
+    f"{NORMALIZER_VERSION}:{CATALOG_VERSION}",
+    max_entries=settings.INTAKE_CACHE_MAX_ENTRIES,
+    ttl=settings.INTAKE_CACHE_TTL_SECONDS,
+)
+
+
+class EntitySpan(NamedTuple):
+    """A typed span emitted by the entity scanner"""
+    kind: str  # "name", "date" or "witness_cue"
+    text: str
+    start: int
+    end: int
+
+
 @celery_app.task(bind=True)
 def normalize_intake(self, case_data: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -16,197 +189,554 @@ def normalize_intake(self, case_data: Dict[str, Any]) -> Dict[str, Any]:
         Normalized case structure with counts, elements, defenses, etc.
     """
     try:
-        summary = case_data.get("summary", "")
-        case_type = case_data.get("case_type", "criminal")
+        return normalize_case_cached(case_data)
         
-        # Parse counts/charges
-        counts = parse_counts(summary, case_type)
-        
-        # Parse parties
-        parties = parse_parties(summary, case_type)
-        
-        # Parse timeline
-        timeline = parse_timeline(summary)
+    except Exception as exc:
+        self.retry(countdown=60, max_retries=3)
+        raise exc
+
+
+@celery_app.task(bind=True)
+def normalize_intake_batch(
+    self, cases: Union[List[Dict[str, Any]], str], chunk_size: int = BATCH_CHUNK_SIZE
+) -> Dict[str, Any]:
+    """
+    Normalize many case intakes in one message.
+    
+    Args:
+        cases: List of raw case payloads, or an NDJSON string with one per line
+        chunk_size: Number of cases handed to each process-pool job
         
-        # Parse witnesses
-        witnesses = parse_witnesses(summary)
+    Returns:
+        Batch summary with one result per input item, in input order. Items
+        that fail carry an error instead of failing the whole batch.
+    """
+    try:
+        items = parse_ndjson(cases) if isinstance(cases, str) else list(cases)
+        results = []
         
-        # Parse exhibits
-        exhibits = parse_exhibits(case_data.get("exhibits", []))
+        for result in iter_normalized_batch(items, chunk_size):
+            results.append(result)
+            if self.request.id and len(results) % chunk_size == 0:
+                self.update_state(
+                    state="PROGRESS",
+                    meta={"completed": len(results), "total": len(items)}
+                )
         
-        # Generate elements and defenses
-        elements = generate_elements(counts, case_type)
-        defenses = generate_defenses(counts, case_type)
+        failed = sum(1 for result in results if result["status"] == "error")
         
-        result = {
-            "case_id": case_data.get("id"),
-            "counts": counts,
-            "elements": elements,
-            "defenses": defenses,
-            "parties": parties,
-            "timeline": timeline,
-            "witnesses": witnesses,
-            "exhibits": exhibits,
-            "status": "normalized",
+        return {
+            "total": len(results),
+            "succeeded": len(results) - failed,
+            "failed": failed,
+            "results": results,
             "normalized_at": datetime.utcnow().isoformat()
         }
         
-        return result
-        
     except Exception as exc:
         self.retry(countdown=60, max_retries=3)
         raise exc
 
 
-def parse_counts(summary: str, case_type: str) -> List[Dict[str, Any]]:
-    """Parse counts/charges from case summary"""
-    counts = []
+def normalize_case(
+    case_data: Dict[str, Any],
+    charge_hits: Optional[Dict[int, List[List[int]]]] = None,
+    spans: Optional[List[EntitySpan]] = None,
+) -> Dict[str, Any]:
+    """
+    Run every intake parser over a single raw case payload.
     
-    if case_type == "criminal":
-        # Common criminal charges
-        criminal_patterns = [
-            (r"theft|stole|stolen", "Theft", "BRD"),
-            (r"assault|battery|attack", "Assault", "BRD"),
-            (r"murder|homicide|killed", "Murder", "BRD"),
-            (r"burglary|breaking|entering", "Burglary", "BRD"),
-            (r"fraud|deceit|false", "Fraud", "BRD"),
-            (r"drug|narcotic|controlled substance", "Drug Possession", "BRD"),
-            (r"drunk|DUI|DWI|intoxicated", "DUI", "BRD"),
-        ]
+    Precomputed charge hits and entity spans (e.g. merged from per-paragraph
+    extraction) skip the corresponding scans.
+    """
+    summary = case_data.get("summary", "")
+    case_type = case_data.get("case_type", "criminal")
+    jurisdiction = case_data.get("jurisdiction")
+    
+    # Parse counts/charges
+    counts = parse_counts(summary, case_type, charge_hits, jurisdiction)
+    
+    # Names, dates and witness cues come from a single scan
+    if spans is None:
+        spans = scan_entities(summary)
+    
+    # Parse parties
+    parties = parse_parties(summary, case_type, spans)
+    
+    # Parse timeline
+    timeline = parse_timeline(summary, spans)
+    
+    # Parse witnesses
+    witnesses = parse_witnesses(summary, spans)
+    
+    # Parse exhibits
+    exhibits = parse_exhibits(case_data.get("exhibits", []))
+    
+    # Generate elements and defenses
+    elements = generate_elements(counts, case_type, jurisdiction)
+    defenses = generate_defenses(counts, case_type, jurisdiction)
+    
+    return {
+        "case_id": case_data.get("id"),
+        "counts": counts,
+        "elements": elements,
+        "defenses": defenses,
+        "parties": parties,
+        "timeline": timeline,
+        "witnesses": witnesses,
+        "exhibits": exhibits,
+        "status": "normalized",
+        "normalized_at": datetime.utcnow().isoformat()
+    }
+
+
+def intake_cache_key(case_data: Dict[str, Any]) -> str:
+    """Cache key over every input that affects normalization"""
+    return content_key(
+        case_data.get("summary", ""),
+        case_data.get("case_type", "criminal"),
+        case_data.get("jurisdiction"),
+        case_data.get("exhibits", []),
+    )
+
+
+def normalize_case_cached(case_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize a case, reusing a cached result for identical inputs"""
+    key = intake_cache_key(case_data)
+    
+    result = intake_cache.get(key)
+    if result is None:
+        result = normalize_case(case_data)
+        intake_cache.set(key, result)
+    
+    # Identical intakes may belong to different cases, and a cached result
+    # is reported as normalized now, like a fresh one
+    result["case_id"] = case_data.get("id")
+    result["normalized_at"] = datetime.utcnow().isoformat()
+    if result["case_id"]:
+        publish_case_tables(result["case_id"], result, key)
+    return result
+
+
+def publish_case_tables(case_id: str, result: Dict[str, Any], stamp: str) -> None:
+    """Store a case's timeline and redaction names unless the intake `stamp` identifies was the last stored"""
+    published_key = content_key(case_id)
+    if published_intakes.get(published_key) == stamp:
+        return
+    store_timeline(case_id, result["timeline"])
+    store_case_names(case_id, case_names(result))
+    published_intakes.set(published_key, stamp)
+
+
+def case_names(result: Dict[str, Any]) -> List[str]:
+    """Party and witness names from a normalized case, the names redacted downstream"""
+    return [entry["name"] for entry in result.get("parties", []) + result.get("witnesses", []) if entry.get("name")]
+
+
+@celery_app.task(bind=True)
+def get_intake_cache_stats(self) -> Dict[str, Any]:
+    """
+    Report intake cache hit/miss counters for this worker process.
+    
+    Returns:
+        Cache statistics
+    """
+    return intake_cache.stats()
+
+
+class _BatchItemError(str):
+    """Placeholder for a batch item that could not be decoded"""
+
+
+@celery_app.task(bind=True)
+def normalize_intake_incremental(
+    self, case_data: Dict[str, Any], base_revision: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Re-normalize an edited case, re-extracting only changed paragraphs.
+    
+    Args:
+        case_data: Raw case data from frontend (must include `id`)
+        base_revision: Revision the client currently holds, from a previous call
         
-        for pattern, charge_name, burden in criminal_patterns:
-            if re.search(pattern, summary, re.IGNORECASE):
-                counts.append({
-                    "label": charge_name,
-                    "description": f"Charge of {charge_name.lower()}",
-                    "burden": burden,
-                    "elements": get_criminal_elements(charge_name),
-                    "defenses": get_criminal_defenses(charge_name)
-                })
+    Returns:
+        A delta against `base_revision` when it matches the stored state,
+        otherwise the full normalized result (`full: True`)
+    """
+    try:
+        return normalize_incremental(case_data, base_revision)
+        
+    except Exception as exc:
+        self.retry(countdown=60, max_retries=3)
+        raise exc
+
+
+def split_paragraphs(summary: str) -> List[Tuple[int, str]]:
+    """Split a summary on blank lines into (offset, text) paragraphs"""
+    paragraphs = []
+    start = 0
+    
+    for match in PARAGRAPH_BREAK.finditer(summary):
+        paragraphs.append((start, summary[start:match.start()]))
+        start = match.end()
+    paragraphs.append((start, summary[start:]))
+    
+    return paragraphs
+
+
+def extract_paragraph(text: str, case_type: str) -> Dict[str, Any]:
+    """Charge hits and entity spans for one paragraph, offsets relative to it"""
+    key = content_key(case_type, text)
     
-    elif case_type == "civil":
-        # Common civil claims
-        civil_patterns = [
-            (r"breach|contract|agreement", "Breach of Contract", "preponderance"),
-            (r"negligence|careless|fault", "Negligence", "preponderance"),
-            (r"defamation|libel|slander", "Defamation", "preponderance"),
-            (r"trespass|property|land", "Trespass", "preponderance"),
-            (r"nuisance|annoyance|disturbance", "Nuisance", "preponderance"),
-        ]
+    extraction = paragraph_cache.get(key)
+    if extraction is None:
+        extraction = {
+            "charges": {str(index): spans for index, spans in scan_charges(text, case_type).items()},
+            "entities": [list(span) for span in scan_entities(text)],
+        }
+        paragraph_cache.set(key, extraction)
+    
+    return extraction
+
+
+def merge_paragraphs(
+    paragraphs: List[Tuple[int, str]], extractions: List[Dict[str, Any]]
+) -> Tuple[Dict[int, List[List[int]]], List[EntitySpan]]:
+    """Rebase per-paragraph extractions onto the full summary"""
+    charge_hits: Dict[int, List[List[int]]] = {}
+    spans: List[EntitySpan] = []
+    
+    for (offset, _), extraction in zip(paragraphs, extractions):
+        for index, hits in extraction["charges"].items():
+            charge_hits.setdefault(int(index), []).extend(
+                [start + offset, end + offset] for start, end in hits
+            )
+        spans.extend(
+            EntitySpan(kind, text, start + offset, end + offset)
+            for kind, text, start, end in extraction["entities"]
+        )
+    
+    return charge_hits, spans
+
+
+def _item_identity(item: Dict[str, Any], fields: Optional[Tuple[str, ...]]) -> str:
+    if fields is None:
+        return json.dumps(item, sort_keys=True, default=str)
+    return json.dumps([item.get(field) for field in fields], default=str)
+
+
+def diff_normalized(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Per-section changes between two normalized cases.
+    
+    Items are matched by the identity fields in DELTA_SECTIONS; `updated`
+    holds items whose identity is unchanged but whose content differs.
+    """
+    changes = {}
+    
+    for section, fields in DELTA_SECTIONS.items():
+        before = {_item_identity(item, fields): item for item in previous.get(section, [])}
+        after = {_item_identity(item, fields): item for item in current.get(section, [])}
         
-        for pattern, claim_name, burden in civil_patterns:
-            if re.search(pattern, summary, re.IGNORECASE):
-                counts.append({
-                    "label": claim_name,
-                    "description": f"Claim of {claim_name.lower()}",
-                    "burden": burden,
-                    "elements": get_civil_elements(claim_name),
-                    "defenses": get_civil_defenses(claim_name)
-                })
+        added = [item for key, item in after.items() if key not in before]
+        removed = [item for key, item in before.items() if key not in after]
+        updated = [item for key, item in after.items() if key in before and before[key] != item]
+        
+        if added or removed or updated:
+            changes[section] = {"added": added, "removed": removed, "updated": updated}
+    
+    return changes
+
+
+def normalize_incremental(case_data: Dict[str, Any], base_revision: Optional[str] = None) -> Dict[str, Any]:
+    """Normalize from per-paragraph extractions and diff against the stored state"""
+    case_id = case_data.get("id")
+    summary = case_data.get("summary", "")
+    case_type = case_data.get("case_type", "criminal")
+    
+    paragraphs = split_paragraphs(summary)
+    paragraph_hashes = [content_key(text) for _, text in paragraphs]
+    revision = content_key(
+        case_type, case_data.get("jurisdiction"), paragraph_hashes, case_data.get("exhibits", [])
+    )
+    
+    state_key = content_key(case_id)
+    previous = intake_state_cache.get(state_key) if case_id else None
+    previous_hashes = set(previous["paragraph_hashes"]) if previous else set()
+    
+    extractions = [extract_paragraph(text, case_type) for _, text in paragraphs]
+    charge_hits, spans = merge_paragraphs(paragraphs, extractions)
+    result = normalize_case(case_data, charge_hits=charge_hits, spans=spans)
+    
+    if case_id:
+        publish_case_tables(case_id, result, f"incremental:{revision}")
+        intake_state_cache.set(state_key, {
+            "revision": revision,
+            "paragraph_hashes": paragraph_hashes,
+            "result": result,
+        })
+    
+    paragraph_summary = {
+        "total": len(paragraphs),
+        "changed": [index for index, digest in enumerate(paragraph_hashes) if digest not in previous_hashes],
+        "removed": len(previous_hashes - set(paragraph_hashes)),
+    }
+    
+    if previous is None or base_revision is None or previous["revision"] != base_revision:
+        return {
+            "case_id": case_id,
+            "revision": revision,
+            "full": True,
+            "paragraphs": paragraph_summary,
+            "result": result,
+        }
+    
+    return {
+        "case_id": case_id,
+        "revision": revision,
+        "base_revision": base_revision,
+        "full": False,
+        "paragraphs": paragraph_summary,
+        "changes": diff_normalized(previous["result"], result),
+        "normalized_at": result["normalized_at"],
+    }
+
+
+def parse_ndjson(payload: str) -> List[Any]:
+    """Split an NDJSON payload into items; malformed lines become error markers"""
+    items: List[Any] = []
+    
+    # Only "\n" ends a record: str.splitlines() would also break on U+2028,
+    # U+2029 and U+0085, which JSON allows raw inside strings
+    for line_number, line in enumerate(payload.split("\n"), start=1):
+        line = line.removesuffix("\r")
+        if not line.strip():
+            continue
+        try:
+            items.append(json.loads(line))
+        except ValueError as e:
+            items.append(_BatchItemError(f"Invalid JSON on line {line_number}: {e}"))
+    
+    return items
+
+
+def normalize_chunk(offset: int, chunk: List[Any]) -> List[Dict[str, Any]]:
+    """Normalize a slice of a batch, isolating failures per item"""
+    results = []
+    
+    for index, case_data in enumerate(chunk, start=offset):
+        try:
+            if isinstance(case_data, _BatchItemError):
+                raise ValueError(str(case_data))
+            if not isinstance(case_data, dict):
+                raise ValueError("Case payload must be a JSON object")
+            results.append({"index": index, "status": "normalized", "result": normalize_case_cached(case_data)})
+        except Exception as e:
+            case_id = case_data.get("id") if isinstance(case_data, dict) else None
+            results.append({"index": index, "status": "error", "case_id": case_id, "error": str(e)})
+    
+    return results
+
+
+def iter_normalized_batch(items: List[Any], chunk_size: int = BATCH_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Normalize a batch across the local process pool, yielding results in input order.
+    
+    Falls back to in-process normalization when the worker cannot fork.
+    """
+    chunk_size = max(1, chunk_size)
+    offsets = list(range(0, len(items), chunk_size))
+    chunks = [items[offset:offset + chunk_size] for offset in offsets]
+    
+    pool = get_process_pool("intake", max_workers=None) if len(chunks) > 1 else None
+    chunk_results = pool.map(normalize_chunk, offsets, chunks) if pool else map(normalize_chunk, offsets, chunks)
+    
+    for results in chunk_results:
+        yield from results
+
+
+def scan_charges(summary: str, case_type: str) -> Dict[int, List[List[int]]]:
+    """
+    Scan a summary once for every charge/claim in the catalog.
+
+    Args:
+        summary: Case summary text
+        case_type: 'criminal' or 'civil'
+
+    Returns:
+        Mapping of catalog index to the [start, end] spans where it matched
+    """
+    if case_type not in CHARGE_MATCHERS:
+        return {}
+
+    pattern, term_index, hidden = CHARGE_MATCHERS[case_type]
+    lowered = summary.lower()
+    flags = 0
+    if len(lowered) != len(summary):
+        # A few characters change length when lowercased; fall back to a
+        # case-insensitive scan so spans still index into the original text
+        flags = re.IGNORECASE
+        pattern = re.compile(pattern.pattern, flags)
+        lowered = summary
+
+    hits: Dict[int, List[List[int]]] = {}
+    found = [(match.group().lower(), match.start(), match.end()) for match in pattern.finditer(lowered)]
+    for term, start, end in found:
+        hits.setdefault(term_index[term], []).append([start, end])
+
+    # finditer never looks inside a match, so re-check the few terms each
+    # match can hide, only in the stretch of text around it
+    seen = set(found)
+    for term, start, end in found:
+        for inner, index in hidden.get(term, ()):
+            # re caches the compiled pattern
+            search = re.compile(re.escape(inner), flags)
+            for match in search.finditer(lowered, max(0, start - len(inner) + 1), end + len(inner) - 1):
+                occurrence = (inner, match.start(), match.end())
+                if occurrence not in seen:
+                    seen.add(occurrence)
+                    found.append(occurrence)
+                    hits.setdefault(index, []).append([match.start(), match.end()])
+
+    for spans in hits.values():
+        spans.sort()
+    return hits
+
+
+def parse_counts(
+    summary: str,
+    case_type: str,
+    hits: Optional[Dict[int, List[List[int]]]] = None,
+    jurisdiction: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Parse counts/charges from case summary"""
+    counts = []
     
+    if hits is None:
+        hits = scan_charges(summary, case_type)
+
+    for index, (_, label, burden) in enumerate(CHARGE_CATALOG.get(case_type, [])):
+        if index not in hits:
+            continue
+
+        if case_type == "criminal":
+            counts.append({
+                "label": label,
+                "description": f"Charge of {label.lower()}",
+                "burden": burden,
+                "elements": get_criminal_elements(label, jurisdiction),
+                "defenses": get_criminal_defenses(label, jurisdiction),
+                "spans": hits[index]
+            })
+        else:
+            counts.append({
+                "label": label,
+                "description": f"Claim of {label.lower()}",
+                "burden": burden,
+                "elements": get_civil_elements(label, jurisdiction),
+                "defenses": get_civil_defenses(label, jurisdiction),
+                "spans": hits[index]
+            })
+
     return counts
 
 
-def parse_parties(summary: str, case_type: str) -> List[Dict[str, Any]]:
-    """Parse parties from case summary"""
-    parties = []
+def scan_entities(summary: str) -> List[EntitySpan]:
+    """
+    Tokenize a summary into names, dates and witness cues in one pass.
     
-    # Look for party names (simplified pattern matching)
-    name_patterns = [
-        r"([A-Z][a-z]+ [A-Z][a-z]+)",  # First Last
-        r"([A-Z][a-z]+ [A-Z]\. [A-Z][a-z]+)",  # First M. Last
+    Args:
+        summary: Case summary text
+        
+    Returns:
+        Typed spans in document order
+    """
+    return [
+        EntitySpan(match.lastgroup, match.group(), match.start(), match.end())
+        for match in ENTITY_PATTERN.finditer(summary)
     ]
+
+
+def parse_parties(summary: str, case_type: str, spans: Optional[List[EntitySpan]] = None) -> List[Dict[str, Any]]:
+    """Parse parties from case summary"""
+    parties = []
     
-    names = []
-    for pattern in name_patterns:
-        matches = re.findall(pattern, summary)
-        names.extend(matches)
+    if spans is None:
+        spans = scan_entities(summary)
     
-    # Remove duplicates and assign roles
-    unique_names = list(set(names))
+    # Unique names in order of first appearance, so roles are stable across runs
+    unique_names = list(dict.fromkeys(span.text for span in spans if span.kind == "name"))
     
     if case_type == "criminal":
-        if len(unique_names) >= 1:
-            parties.append({
-                "name": unique_names[0],
-                "side": "prosecution",
-                "role": "prosecutor"
-            })
-        if len(unique_names) >= 2:
-            parties.append({
-                "name": unique_names[1],
-                "side": "defense",
-                "role": "defendant"
-            })
+        sides = [("prosecution", "prosecutor"), ("defense", "defendant")]
     else:  # civil
-        if len(unique_names) >= 1:
-            parties.append({
-                "name": unique_names[0],
-                "side": "plaintiff",
-                "role": "plaintiff"
-            })
-        if len(unique_names) >= 2:
-            parties.append({
-                "name": unique_names[1],
-                "side": "defendant",
-                "role": "defendant"
-            })
+        sides = [("plaintiff", "plaintiff"), ("defendant", "defendant")]
+    
+    for name, (side, role) in zip(unique_names, sides):
+        parties.append({
+            "name": name,
+            "side": side,
+            "role": role
+        })
     
     return parties
 
 
-def parse_timeline(summary: str) -> List[Dict[str, Any]]:
-    """Parse timeline of events from case summary"""
+def parse_timeline(summary: str, spans: Optional[List[EntitySpan]] = None) -> List[Dict[str, Any]]:
+    """
+    Parse timeline of events from case summary.
+    
+    Events carry the ISO date (None when the text is not a valid date), the
+    date as written, the surrounding sentence and its offset, sorted by date.
+    """
     timeline = []
     
-    # Look for date patterns
-    date_patterns = [
-        r"(\d{1,2}/\d{1,2}/\d{4})",  # MM/DD/YYYY
-        r"(\d{4}-\d{2}-\d{2})",  # YYYY-MM-DD
-        r"(January|February|March|April|May|June|July|August|September|October|November|December) \d{1,2},? \d{4}",  # Month DD, YYYY
-    ]
+    if spans is None:
+        spans = scan_entities(summary)
     
-    for pattern in date_patterns:
-        dates = re.findall(pattern, summary)
-        for date in dates:
+    for span in spans:
+        if span.kind == "date":
             timeline.append({
-                "date": date,
-                "description": "Event occurred",
-                "source": "case_summary"
+                "date": to_iso_date(span.text),
+                "date_text": span.text,
+                "description": sentence_around(summary, span.start, span.end),
+                "source": "case_summary",
+                "offset": span.start
             })
     
-    return timeline
+    return TimelineIndex(timeline).to_list()
 
 
-def parse_witnesses(summary: str) -> List[Dict[str, Any]]:
+def parse_witnesses(summary: str, spans: Optional[List[EntitySpan]] = None) -> List[Dict[str, Any]]:
     """Parse witnesses from case summary"""
     witnesses = []
+    seen = set()
     
-    # Look for witness indicators
-    witness_indicators = [
-        r"witness(?:es)?",
-        r"testified",
-        r"saw",
-        r"observed",
-        r"heard",
-        r"reported"
-    ]
+    if spans is None:
+        spans = scan_entities(summary)
     
-    # Extract names near witness indicators
-    for indicator in witness_indicators:
-        matches = re.finditer(indicator, summary, re.IGNORECASE)
-        for match in matches:
-            # Look for names around the witness indicator
-            context = summary[max(0, match.start()-50):match.end()+50]
-            name_matches = re.findall(r"([A-Z][a-z]+ [A-Z][a-z]+)", context)
-            
-            for name in name_matches:
-                if name not in [w["name"] for w in witnesses]:
-                    witnesses.append({
-                        "name": name,
-                        "role": "witness",
-                        "credibility_notes": "Identified from case summary"
-                    })
+    names = [span for span in spans if span.kind == "name"]
+    name_starts = [span.start for span in names]
+    
+    # Names wholly inside the window around each witness cue
+    for cue in spans:
+        if cue.kind != "witness_cue":
+            continue
+        
+        window_start = cue.start - WITNESS_WINDOW
+        window_end = cue.end + WITNESS_WINDOW
+        
+        for index in range(bisect_left(name_starts, window_start), len(names)):
+            name = names[index]
+            if name.start >= window_end:
+                break
+            if name.end <= window_end and name.text not in seen:
+                seen.add(name.text)
+                witnesses.append({
+                    "name": name.text,
+                    "role": "witness",
+                    "credibility_notes": "Identified from case summary"
+                })
     
     return witnesses
 
@@ -227,112 +757,36 @@ def parse_exhibits(exhibits_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return exhibits
 
 
-def get_criminal_elements(charge_name: str) -> Dict[str, Any]:
+def get_criminal_elements(charge_name: str, jurisdiction: Optional[str] = None) -> Dict[str, Any]:
     """Get elements for criminal charges"""
-    elements_map = {
-        "Theft": {
-            "elements": [
-                "taking",
-                "property_of_another",
-                "without_consent",
-                "intent_to_deprive"
-            ]
-        },
-        "Assault": {
-            "elements": [
-                "intentional_act",
-                "reasonable_apprehension",
-                "imminent_harm"
-            ]
-        },
-        "Murder": {
-            "elements": [
-                "unlawful_killing",
-                "human_being",
-                "malice_aforethought"
-            ]
-        },
-        "Burglary": {
-            "elements": [
-                "breaking",
-                "entering",
-                "dwelling",
-                "intent_to_commit_felony"
-            ]
-        },
-        "Fraud": {
-            "elements": [
-                "false_representation",
-                "material_fact",
-                "intent_to_deceive",
-                "reliance",
-                "damage"
-            ]
-        }
-    }
-    
-    return elements_map.get(charge_name, {"elements": ["general_intent", "actus_reus"]})
+    definition = get_catalog(jurisdiction).charge("criminal", charge_name)
+    return {"elements": [entry.name for entry in definition.elements]}
 
 
-def get_criminal_defenses(charge_name: str) -> Dict[str, Any]:
+def get_criminal_defenses(charge_name: str, jurisdiction: Optional[str] = None) -> Dict[str, Any]:
     """Get defenses for criminal charges"""
-    return {
-        "defenses": [
-            "alibi",
-            "self_defense",
-            "insanity",
-            "duress",
-            "entrapment"
-        ]
-    }
+    definition = get_catalog(jurisdiction).charge("criminal", charge_name)
+    return {"defenses": [entry.name for entry in definition.defenses]}
 
 
-def get_civil_elements(claim_name: str) -> Dict[str, Any]:
+def get_civil_elements(claim_name: str, jurisdiction: Optional[str] = None) -> Dict[str, Any]:
     """Get elements for civil claims"""
-    elements_map = {
-        "Breach of Contract": {
-            "elements": [
-                "valid_contract",
-                "breach",
-                "damages"
-            ]
-        },
-        "Negligence": {
-            "elements": [
-                "duty",
-                "breach",
-                "causation",
-                "damages"
-            ]
-        },
-        "Defamation": {
-            "elements": [
-                "false_statement",
-                "publication",
-                "fault",
-                "damages"
-            ]
-        }
-    }
-    
-    return elements_map.get(claim_name, {"elements": ["general_elements"]})
+    definition = get_catalog(jurisdiction).charge("civil", claim_name)
+    return {"elements": [entry.name for entry in definition.elements]}
 
 
-def get_civil_defenses(claim_name: str) -> Dict[str, Any]:
+def get_civil_defenses(claim_name: str, jurisdiction: Optional[str] = None) -> Dict[str, Any]:
     """Get defenses for civil claims"""
-    return {
-        "defenses": [
-            "statute_of_limitations",
-            "contributory_negligence",
-            "assumption_of_risk",
-            "immunity"
-        ]
-    }
+    definition = get_catalog(jurisdiction).charge("civil", claim_name)
+    return {"defenses": [entry.name for entry in definition.defenses]}
 
 
-def generate_elements(counts: List[Dict[str, Any]], case_type: str) -> List[Dict[str, Any]]:
+def generate_elements(
+    counts: List[Dict[str, Any]], case_type: str, jurisdiction: Optional[str] = None
+) -> List[Dict[str, Any]]:
     """Generate comprehensive elements list"""
     elements = []
+    catalog = get_catalog(jurisdiction)
     
     for count in counts:
         count_elements = count.get("elements", {}).get("elements", [])
@@ -341,15 +795,18 @@ def generate_elements(counts: List[Dict[str, Any]], case_type: str) -> List[Dict
                 "name": element,
                 "count_id": count.get("label"),
                 "status": "unmet",
-                "description": f"Element: {element.replace('_', ' ').title()}"
+                "description": catalog.describe(element, "Element")
             })
     
     return elements
 
 
-def generate_defenses(counts: List[Dict[str, Any]], case_type: str) -> List[Dict[str, Any]]:
+def generate_defenses(
+    counts: List[Dict[str, Any]], case_type: str, jurisdiction: Optional[str] = None
+) -> List[Dict[str, Any]]:
     """Generate comprehensive defenses list"""
     defenses = []
+    catalog = get_catalog(jurisdiction)
     
     for count in counts:
         count_defenses = count.get("defenses", {}).get("defenses", [])
@@ -358,7 +815,7 @@ def generate_defenses(counts: List[Dict[str, Any]], case_type: str) -> List[Dict
                 "name": defense,
                 "count_id": count.get("label"),
                 "status": "available",
-                "description": f"Defense: {defense.replace('_', ' ').title()}"
+                "description": catalog.describe(defense, "Defense")
             })
     
     return defenses
@@ -1,8 +1,8 @@
 from celery_app import celery_app
+from app.core.objection_scanner import ground_counts, objection_scanner
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 import uuid
-import re
 
 
 @celery_app.task(bind=True)
@@ -19,116 +19,32 @@ def suggest_objection_grounds(self, turn_text: str, context: Dict[str, Any]) ->
     """
     try:
         suggestions = []
+        # Every ground's matches in the turn, counted per pattern
+        scanned = objection_scanner.scan(turn_text)
+        hits = scanned.hits
         
-        # Define objection patterns and their grounds
-        objection_patterns = {
-            "hearsay": {
-                "patterns": [
-                    r"he said", r"she said", r"they said", r"told me", r"heard that",
-                    r"according to", r"someone told me", r"word on the street"
-                ],
-                "ground": "Hearsay",
-                "description": "Out-of-court statement offered for truth"
-            },
-            "leading": {
-                "patterns": [
-                    r"isn't it true that", r"wouldn't you agree", r"don't you think",
-                    r"you would say", r"you must admit", r"you have to agree"
-                ],
-                "ground": "Leading Question",
-                "description": "Question suggests the answer"
-            },
-            "compound": {
-                "patterns": [
-                    r"\?.*\?.*\?", r"and.*\?", r"but.*\?", r"or.*\?"
-                ],
-                "ground": "Compound Question",
-                "description": "Multiple questions in one"
-            },
-            "argumentative": {
-                "patterns": [
-                    r"how dare you", r"how could you", r"why would anyone",
-                    r"what kind of person", r"don't you feel guilty"
-                ],
-                "ground": "Argumentative",
-                "description": "Question is argumentative or inflammatory"
-            },
-            "asked_and_answered": {
-                "patterns": [
-                    r"we already covered", r"you already answered", r"we discussed this"
-                ],
-                "ground": "Asked and Answered",
-                "description": "Question already asked and answered"
-            },
-            "relevance": {
-                "patterns": [
-                    r"what does this have to do", r"how is this relevant",
-                    r"what's the point", r"why are we talking about"
-                ],
-                "ground": "Relevance",
-                "description": "Evidence not relevant to case"
-            },
-            "speculation": {
-                "patterns": [
-                    r"what do you think", r"what might have", r"what could have",
-                    r"in your opinion", r"what if"
-                ],
-                "ground": "Speculation",
-                "description": "Witness speculating without foundation"
-            },
-            "character": {
-                "patterns": [
-                    r"what kind of person", r"are you a", r"do you often",
-                    r"have you ever", r"your reputation"
-                ],
-                "ground": "Character Evidence",
-                "description": "Character evidence not admissible"
-            },
-            "privilege": {
-                "patterns": [
-                    r"attorney client", r"doctor patient", r"spousal privilege",
-                    r"confidential", r"privileged"
-                ],
-                "ground": "Privilege",
-                "description": "Protected by privilege"
-            },
-            "best_evidence": {
-                "patterns": [
-                    r"copy of", r"photograph of", r"description of",
-                    r"summary of", r"instead of the original"
-                ],
-                "ground": "Best Evidence",
-                "description": "Original document required"
-            }
-        }
-        
-        # Analyze turn text for objection patterns
-        turn_lower = turn_text.lower()
-        
-        for objection_type, config in objection_patterns.items():
-            for pattern in config["patterns"]:
-                if re.search(pattern, turn_lower, re.IGNORECASE):
-                    # Calculate confidence based on pattern match strength
-                    matches = re.findall(pattern, turn_lower, re.IGNORECASE)
-                    confidence = min(len(matches) * 0.3, 1.0)
-                    
-                    # Adjust confidence based on context
-                    if context.get("phase") == "witness_examination":
-                        if context.get("examination_mode") == "cross" and objection_type == "leading":
-                            confidence *= 0.5  # Leading questions more acceptable in cross
-                        elif context.get("examination_mode") == "direct" and objection_type == "leading":
-                            confidence *= 1.2  # Leading questions less acceptable in direct
-                    
-                    if confidence > 0.3:  # Only suggest if confidence is reasonable
-                        suggestions.append({
-                            "id": str(uuid.uuid4()),
-                            "ground": config["ground"],
-                            "description": config["description"],
-                            "confidence": round(confidence, 2),
-                            "pattern_matched": pattern,
-                            "objection_type": objection_type,
-                            "suggested_at": datetime.utcnow().isoformat()
-                        })
+        for hit in hits:
+            objection_type = hit.ground.key
+            # Calculate confidence based on pattern match strength
+            confidence = min(hit.count * 0.3, 1.0)
+            
+            # Adjust confidence based on context
+            if context.get("phase") == "witness_examination":
+                if context.get("examination_mode") == "cross" and objection_type == "leading":
+                    confidence *= 0.5  # Leading questions more acceptable in cross
+                elif context.get("examination_mode") == "direct" and objection_type == "leading":
+                    confidence *= 1.2  # Leading questions less acceptable in direct
+            
+            if confidence > 0.3:  # Only suggest if confidence is reasonable
+                suggestions.append({
+                    "id": str(uuid.uuid4()),
+                    "ground": hit.ground.ground,
+                    "description": hit.ground.description,
+                    "confidence": round(confidence, 2),
+                    "pattern_matched": hit.pattern,
+                    "objection_type": objection_type,
+                    "suggested_at": datetime.utcnow().isoformat()
+                })
         
         # Sort by confidence (highest first)
         suggestions.sort(key=lambda x: x["confidence"], reverse=True)
@@ -139,7 +55,10 @@ def suggest_objection_grounds(self, turn_text: str, context: Dict[str, Any]) ->
         return {
             "suggestions": suggestions,
             "total_suggestions": len(suggestions),
+            "ground_counts": ground_counts(hits),
             "turn_text_length": len(turn_text),
+            "scan_truncated": scanned.truncated,
+            "scan_over_budget": scanned.over_budget,
             "context": context
         }
         
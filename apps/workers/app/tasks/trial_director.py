@@ -1,5 +1,10 @@
 from celery_app import celery_app
-from typing import Dict, Any, List
+from app.core.embeddings import get_embedder
+from app.core.redaction import get_redactor, load_case_names
+from app.core.timeline_index import load_timeline, to_iso_date
+from app.core.vector_index import load_index
+from app.tasks.intake_normalizer import scan_entities
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 import uuid
 
@@ -44,12 +49,17 @@ def add_turn(self, case_id: str, turn_data: Dict[str, Any]) -> Dict[str, Any]:
     
     Args:
         case_id: The case ID
-        turn_data: Turn information (speaker, text, phase, etc.)
+        turn_data: Turn information (speaker, text, phase, etc.); `pii_names`
+            overrides the party and witness names stored at intake
         
     Returns:
-        Updated trial state with new turn
+        Updated trial state with new turn, carrying a PII-redacted copy of
+        its text and the redacted character spans
     """
     try:
+        names = turn_data.get("pii_names") or load_case_names(case_id)
+        redacted_text, redaction_spans = get_redactor(names).redact_text(turn_data.get("text", ""))
+        
         turn = {
             "id": str(uuid.uuid4()),
             "case_id": case_id,
@@ -58,6 +68,8 @@ def add_turn(self, case_id: str, turn_data: Dict[str, Any]) -> Dict[str, Any]:
             "witness_id": turn_data.get("witness_id"),
             "count_id": turn_data.get("count_id"),
             "text": turn_data.get("text", ""),
+            "redacted_text": redacted_text,
+            "redaction_spans": [list(span) for span in redaction_spans],
             "timestamp_ms": int(datetime.utcnow().timestamp() * 1000),
             "meta": turn_data.get("meta", {}),
             "created_at": datetime.utcnow().isoformat()
@@ -255,6 +267,126 @@ def end_witness_examination(self, case_id: str, witness_id: str) -> Dict[str, An
         raise exc
 
 
+@celery_app.task(bind=True)
+def query_timeline(
+    self, case_id: str, start_date: Optional[str] = None, end_date: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Get the case timeline events dated within a range.
+    
+    Args:
+        case_id: The case ID
+        start_date: Inclusive ISO start date (YYYY-MM-DD), or None for open
+        end_date: Inclusive ISO end date (YYYY-MM-DD), or None for open
+        
+    Returns:
+        Matching events in date order
+    """
+    try:
+        index = load_timeline(case_id)
+        events = index.range(start_date, end_date) if index else []
+        
+        return {
+            "case_id": case_id,
+            "start_date": start_date,
+            "end_date": end_date,
+            "events": events,
+            "total_events": len(events),
+            "indexed": index is not None
+        }
+        
+    except Exception as exc:
+        self.retry(countdown=60, max_retries=3)
+        raise exc
+
+
+@celery_app.task(bind=True)
+def anchor_turn_to_timeline(self, case_id: str, turn_data: Dict[str, Any], limit: int = 3) -> Dict[str, Any]:
+    """
+    Find the timeline events nearest to the dates a turn refers to.
+    
+    Args:
+        case_id: The case ID
+        turn_data: Turn information; dates are read from its text, falling
+            back to `meta.time_hint`
+        limit: Maximum events per referenced date
+        
+    Returns:
+        Referenced dates with their nearest timeline events
+    """
+    try:
+        index = load_timeline(case_id)
+        anchors = []
+        
+        if index:
+            for iso_date in get_turn_dates(turn_data):
+                anchors.append({"date": iso_date, "events": index.nearest(iso_date, limit)})
+        
+        return {
+            "case_id": case_id,
+            "turn_id": turn_data.get("id"),
+            "anchors": anchors,
+            "indexed": index is not None
+        }
+        
+    except Exception as exc:
+        self.retry(countdown=60, max_retries=3)
+        raise exc
+
+
+@celery_app.task(bind=True)
+def anchor_turn_to_evidence(self, case_id: str, turn_data: Dict[str, Any], limit: int = 3) -> Dict[str, Any]:
+    """
+    Find the exhibits and facts most similar to what a turn says.
+    
+    Args:
+        case_id: The case ID
+        turn_data: Turn information with its `text`
+        limit: Maximum matches per source table
+        
+    Returns:
+        Matching exhibit and fact IDs with cosine similarity scores
+    """
+    try:
+        return {
+            "case_id": case_id,
+            "turn_id": turn_data.get("id"),
+            **find_supporting_evidence(case_id, turn_data.get("text", ""), limit)
+        }
+        
+    except Exception as exc:
+        self.retry(countdown=60, max_retries=3)
+        raise exc
+
+
+def find_supporting_evidence(case_id: str, text: str, limit: int = 3) -> Dict[str, List[Dict[str, Any]]]:
+    """Nearest exhibits and facts to `text` from the case's in-process indexes"""
+    query = get_embedder().embed([text])[0]
+    matches = {}
+    
+    for table in ("exhibits", "facts"):
+        index = load_index(case_id, table)
+        hits = index.search(query, limit) if index is not None and query.any() else []
+        matches[table] = [{"id": key, "score": round(score, 4)} for key, score in hits]
+    
+    return matches
+
+
+def get_turn_dates(turn_data: Dict[str, Any]) -> List[str]:
+    """ISO dates mentioned in a turn, in order of first mention"""
+    dates = [
+        to_iso_date(span.text)
+        for span in scan_entities(turn_data.get("text", ""))
+        if span.kind == "date"
+    ]
+    
+    if not dates:
+        time_hint = turn_data.get("meta", {}).get("time_hint")
+        dates = [to_iso_date(time_hint)] if time_hint else []
+    
+    return list(dict.fromkeys(date for date in dates if date))
+
+
 def analyze_element_coverage(turn: Dict[str, Any], case_elements: List[Dict[str, Any]]) -> Dict[str, Any]:
     """Analyze turn content for element coverage updates"""
     # This is a simplified analysis - in practice, this would use NLP/AI
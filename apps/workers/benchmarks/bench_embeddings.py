@@ -0,0 +1,96 @@
+"""
+Embedding throughput and vector load cost.
+
+Measures vectors/s for the configured local model at several batch sizes, and
+the time to serialize vectors as text literals vs binary COPY values. With
+--db (needs Postgres with pgvector from docker-compose.dev.yml and psycopg2)
+it also times loading them into a temporary table with binary COPY vs
+execute_values. Usage (from apps/workers):
+    python -m benchmarks.bench_embeddings [count] [--db]
+"""
+import random
+import sys
+import time
+import uuid
+
+from app.core.embeddings import get_embedder, to_pgvector, to_pgvector_binary
+
+
+WORDS = (
+    "officer witness vehicle intersection statement report defendant plaintiff "
+    "contract breach damages injury evidence exhibit testimony camera footage "
+    "receipt invoice signature medical record timeline phone call email"
+).split()
+
+
+def sample_texts(count: int, words: int = 120) -> list:
+    rng = random.Random(7)
+    return [" ".join(rng.choice(WORDS) for _ in range(words)) for _ in range(count)]
+
+
+def time_embedding(texts: list) -> None:
+    embedder = get_embedder()
+    for batch_size in (1, 32, 256, 1024):
+        started = time.perf_counter()
+        for offset in range(0, len(texts), batch_size):
+            embedder.embed(texts[offset:offset + batch_size])
+        elapsed = time.perf_counter() - started
+        print(f"embed batch={batch_size:5d}: {len(texts) / elapsed:8.0f} vectors/s")
+
+
+def time_load(texts: list, use_db: bool) -> None:
+    vectors = get_embedder().embed(texts)
+    ids = [uuid.UUID(int=index) for index in range(len(texts))]
+
+    started = time.perf_counter()
+    literals = to_pgvector(vectors)
+    text_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    binary = to_pgvector_binary(vectors)
+    binary_elapsed = time.perf_counter() - started
+
+    for label, elapsed in (("text literals", text_elapsed), ("binary values", binary_elapsed)):
+        print(f"serialize {label:15s} {len(texts)} vectors: {elapsed * 1000:7.1f} ms")
+
+    if not use_db:
+        return
+
+    from psycopg2.extras import execute_values
+
+    from app.core import database
+
+    create = "CREATE TEMP TABLE bench_load (id UUID, embedding VECTOR(1536), embedding_hash TEXT) ON COMMIT DROP"
+
+    started = time.perf_counter()
+    with database.transaction() as cursor:
+        cursor.execute(create)
+        database.copy_binary_rows(
+            cursor, "bench_load", ("id", "embedding", "embedding_hash"),
+            [(row_id.bytes, vector, b"bench") for row_id, vector in zip(ids, to_pgvector_binary(vectors))]
+        )
+    copy_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    with database.transaction() as cursor:
+        cursor.execute(create)
+        execute_values(
+            cursor, "INSERT INTO bench_load VALUES %s",
+            [(str(row_id), literal, "bench") for row_id, literal in zip(ids, to_pgvector(vectors))],
+            page_size=database.INSERT_PAGE_SIZE
+        )
+    values_elapsed = time.perf_counter() - started
+
+    for label, elapsed in (("binary COPY", copy_elapsed), ("execute_values", values_elapsed)):
+        print(f"load {label:15s} {len(ids)} vectors: {elapsed * 1000:.0f} ms ({len(ids) / elapsed:.0f} vectors/s)")
+
+
+def main(count: int = 5000, use_db: bool = False) -> None:
+    texts = sample_texts(count)
+    time_embedding(texts)
+    time_load(texts, use_db)
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if arg != "--db"]
+    main(int(args[0]) if args else 5000, "--db" in sys.argv)
@@ -0,0 +1,63 @@
+"""
+Benchmark the compiled charge matcher against the per-pattern search loop.
+
+Usage (from apps/workers):
+    python -m benchmarks.bench_intake_counts [pages]
+"""
+import re
+import sys
+import timeit
+
+from app.tasks import intake_normalizer
+from app.tasks.intake_normalizer import CHARGE_CATALOG, scan_charges
+
+PAGE = (
+    "On March 3, 2023 the defendant, John Smith, entered the store on Main Street. "
+    "Witness Sarah Wilson testified that she saw him near the register. The manager "
+    "reported the incident to police after reviewing the security footage. " * 12
+)
+
+
+def legacy_scan(summary: str, case_type: str) -> list:
+    """Original approach: one re.search per catalog pattern"""
+    return [
+        label
+        for terms, label, _ in CHARGE_CATALOG[case_type]
+        if re.search("|".join(terms), summary, re.IGNORECASE)
+    ]
+
+
+def catalog_of(size: int) -> list:
+    """Grow the criminal catalog with synthetic offenses that never match"""
+    return CHARGE_CATALOG["criminal"] + [
+        ((f"offense{i}x", f"statute{i}q"), f"Offense {i}", "BRD") for i in range(size)
+    ]
+
+
+def main(pages: int = 50) -> None:
+    summary = (PAGE * pages) + " The defendant stole a laptop."
+    runs = 20
+
+    for case_type in ("criminal", "civil"):
+        legacy = timeit.timeit(lambda: legacy_scan(summary, case_type), number=runs) / runs
+        compiled = timeit.timeit(lambda: scan_charges(summary, case_type), number=runs) / runs
+        print(
+            f"{case_type:9s} {pages} pages ({len(summary):,} chars): "
+            f"legacy {legacy * 1000:.2f} ms, compiled {compiled * 1000:.2f} ms"
+        )
+
+    # Catalog growth: legacy cost scales with pattern count, the compiled scan does not
+    for size in (0, 100, 300):
+        patterns = catalog_of(size)
+        intake_normalizer.CHARGE_CATALOG["bench"] = patterns
+        intake_normalizer.CHARGE_MATCHERS["bench"] = intake_normalizer.compile_charge_matcher(patterns)
+        legacy = timeit.timeit(lambda: legacy_scan(summary, "bench"), number=5) / 5
+        compiled = timeit.timeit(lambda: scan_charges(summary, "bench"), number=5) / 5
+        print(
+            f"catalog {len(patterns):4d} patterns: "
+            f"legacy {legacy * 1000:.2f} ms, compiled {compiled * 1000:.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
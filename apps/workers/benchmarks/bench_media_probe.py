@@ -0,0 +1,64 @@
+"""
+Container header probe latency on a large video.
+
+Writes a sparse MP4 of the given size with its movie header after the media
+data, as cameras that do not "fast start" record it, then times probing it
+from disk and reports how many bytes were actually read.
+Usage (from apps/workers):
+    python -m benchmarks.bench_media_probe [gigabytes]
+"""
+import os
+import struct
+import sys
+import tempfile
+import time
+
+from app.core.media_probe import FileReader, probe_media
+
+
+def atom(kind: bytes, body: bytes) -> bytes:
+    return struct.pack(">I4s", 8 + len(body), kind) + body
+
+
+def movie_header(sample_count: int) -> bytes:
+    """A one-track movie header with sample tables sized like a real recording"""
+    entry = atom(b"avc1", b"\x00" * 6 + b"\x00\x01" + b"\x00" * 16 + struct.pack(">HH", 1920, 1080) + b"\x00" * 50)
+    tables = atom(b"stsz", b"\x00" * (12 + 4 * sample_count)) + atom(b"stco", b"\x00" * (8 + 4 * sample_count // 30))
+    return atom(b"moov",
+        atom(b"mvhd", b"\x00" * 4 + struct.pack(">IIII", 0, 0, 30, sample_count) + b"\x00" * 80)
+        + atom(b"trak", atom(b"mdia",
+            atom(b"hdlr", b"\x00" * 8 + b"vide" + b"\x00" * 13)
+            + atom(b"minf", atom(b"stbl", atom(b"stsd", struct.pack(">II", 0, 1) + entry) + tables))
+        ))
+    )
+
+
+def main(gigabytes: float = 4) -> None:
+    mdat_size = int(gigabytes * 1024 ** 3)
+    # One frame per 1/30 s at roughly 8 Mbit/s
+    moov = movie_header(mdat_size // 33_000)
+
+    with tempfile.NamedTemporaryFile(suffix=".mp4") as handle:
+        handle.write(atom(b"ftyp", b"isom\x00\x00\x02\x00isommp41"))
+        handle.write(struct.pack(">I4sQ", 1, b"mdat", mdat_size))
+        handle.seek(mdat_size - 16, os.SEEK_CUR)
+        handle.write(moov)
+        handle.flush()
+        size = handle.tell()
+
+        timings = []
+        for _ in range(20):
+            with open(handle.name, "rb") as source:
+                reader = FileReader(source, size)
+                started = time.perf_counter()
+                metadata = probe_media(reader)
+                timings.append(time.perf_counter() - started)
+
+    timings.sort()
+    print(f"{size / 1024 ** 3:.1f} GB file, movie header {len(moov) / 1e6:.1f} MB at the end")
+    print(f"  probe: median {timings[len(timings) // 2] * 1000:.2f} ms, {reader.bytes_read} bytes read")
+    print(f"  {metadata}")
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 4)
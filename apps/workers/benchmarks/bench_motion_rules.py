@@ -0,0 +1,65 @@
+"""
+Motion rulings per second on long briefs.
+
+Compares the compiled rule engine with the original approach of one
+case-insensitive re.search per rule, on briefs that match late or not at
+all, which is where a ruling has to read the whole brief.
+Usage (from apps/workers):
+    python -m benchmarks.bench_motion_rules [words]
+"""
+import json
+import random
+import re
+import sys
+import time
+
+from app.core.motion_rules import RULES_PATH
+from app.tasks.motion_engine import analyze_motion
+
+WORDS = (
+    "the defendant respectfully moves this court to exclude certain matters at trial "
+    "because they were obtained in violation of the fourth amendment and would confuse the jury "
+    "counsel for the state has indicated an intent to introduce the following at trial"
+).split()
+
+TAILS = ["", " the officer conducted a warrantless search", " the statement is hearsay"]
+
+
+def legacy_analyze(kind: str, arguments: str, rules: dict) -> str:
+    """Original approach: one case-insensitive search per rule until one matches"""
+    section = rules["kinds"].get(kind, rules["kinds"]["limine"])
+    for rule in section["rules"]:
+        if re.search(rule["pattern"], arguments, re.IGNORECASE):
+            return rule["status"]
+    return section["default"]["status"]
+
+
+def sample_briefs(words: int, count: int = 12) -> list:
+    rng = random.Random(7)
+    return [
+        (kind, " ".join(rng.choice(WORDS) for _ in range(words)) + TAILS[index % len(TAILS)])
+        for index, kind in zip(range(count), ["limine", "suppress", "summary_judgment", "sever"] * count)
+    ]
+
+
+def rate(rule, briefs: list, repeat: int = 5) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for kind, brief in briefs:
+            rule(kind, brief)
+    return repeat * len(briefs) / (time.perf_counter() - started)
+
+
+def main(words: int = 5000) -> None:
+    rules = json.loads(RULES_PATH.read_text())
+    briefs = sample_briefs(words)
+    for kind, brief in briefs:
+        assert analyze_motion(kind, brief, "")["status"] == legacy_analyze(kind, brief, rules)
+
+    print(f"{len(briefs)} briefs of ~{words} words:")
+    print(f"  legacy re.search per rule: {rate(lambda kind, brief: legacy_analyze(kind, brief, rules), briefs):8.0f} rulings/s")
+    print(f"  compiled rule engine:      {rate(lambda kind, brief: analyze_motion(kind, brief, ''), briefs):8.0f} rulings/s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
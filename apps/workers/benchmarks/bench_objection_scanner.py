@@ -0,0 +1,122 @@
+"""
+Objection ground scanning latency per turn.
+
+Scans synthetic examination turns with the objection scanner and with the
+original approach of re.search then re.findall per pattern, checks their
+phrase counts agree, and reports microseconds per turn. Then times the
+worst case for the original compound patterns, a long line of "and"
+clauses with no question mark, as the turn grows, and the time per
+character of fuzzed adversarial turns with the length cap lifted, which
+stays flat when scanning is linear.
+Usage (from apps/workers):
+    python -m benchmarks.bench_objection_scanner [turns]
+"""
+import random
+import re
+import sys
+import time
+
+from app.core.objection_scanner import OBJECTION_GROUNDS, ObjectionScanner
+
+
+WORDS = (
+    "on the night of the incident you drove north toward the warehouse and stopped "
+    "near the loading dock where the officer was waiting with the report correct"
+).split()
+
+PHRASES = ["isn't it true that", "she said", "according to", "have you ever", "copy of", "what if"]
+
+LEGACY_COMPOUND = [r"\?.*\?.*\?", r"and.*\?", r"but.*\?", r"or.*\?"]
+
+
+def sample_turns(count: int, words: int = 40) -> list:
+    rng = random.Random(7)
+    turns = []
+    for _ in range(count):
+        turn = [rng.choice(WORDS) for _ in range(words)]
+        if rng.random() < 0.5:
+            turn.insert(rng.randrange(words), rng.choice(PHRASES))
+        turns.append(" ".join(turn).capitalize() + rng.choice(["?", ".", "? and then?"]))
+    return turns
+
+
+def legacy_counts(turn: str) -> dict:
+    """Original approach: re.search then re.findall for every pattern"""
+    counts = {}
+    lowered = turn.lower()
+    for ground in OBJECTION_GROUNDS:
+        for pattern in LEGACY_COMPOUND if ground.structural else ground.patterns:
+            if re.search(pattern, lowered, re.IGNORECASE):
+                counts[pattern] = len(re.findall(pattern, lowered, re.IGNORECASE))
+    return counts
+
+
+def time_per_turn(label: str, scan, turns: list) -> float:
+    started = time.perf_counter()
+    for turn in turns:
+        scan(turn)
+    per_turn = (time.perf_counter() - started) / len(turns) * 1e6
+    print(f"  {label:<34}{per_turn:8.1f} us/turn")
+    return per_turn
+
+
+def phrase_counts(scanner: ObjectionScanner, turn: str) -> dict:
+    counts, _ = scanner.pattern_counts(turn.lower())
+    return {pattern: count for pattern, count in counts.items() if pattern in scanner.phrases}
+
+
+def worst_case(scanner: ObjectionScanner) -> None:
+    print("worst case, one line of 'and' clauses and no question mark:")
+    for size in (2000, 8000, 32000, 128000, 1000000):
+        turn = ("and the witness " * (size // 16 + 1))[:size]
+        started = time.perf_counter()
+        scanned = scanner.scan(turn)
+        compiled = (time.perf_counter() - started) * 1000
+        legacy = "skipped"
+        if size <= 32000:
+            started = time.perf_counter()
+            legacy_counts(turn)
+            legacy = f"{(time.perf_counter() - started) * 1000:.1f} ms"
+        print(f"  {size:>8} chars: scanner {compiled:6.2f} ms (truncated={scanned.truncated}), legacy {legacy}")
+
+
+def adversarial_turn(rng: random.Random, size: int) -> str:
+    """Question marks, conjunctions and long unbroken lines: the inputs that stalled .* patterns"""
+    pieces = ["?", "? ", "and ", "or ", "but ", "and?", "x", " ", ".", "\n", "what if ", "he said "]
+    weights = [20, 10, 10, 10, 5, 5, 20, 15, 2, 1, 1, 1]
+    text = "".join(rng.choices(pieces, weights, k=size // 3))
+    return (text * (size // max(len(text), 1) + 1))[:size]
+
+
+def fuzzed_scaling() -> None:
+    print("fuzzed adversarial turns, no length cap:")
+    rng = random.Random(11)
+    uncapped = ObjectionScanner(max_chars=10 ** 7, budget_ms=10 ** 6)
+    for size in (20000, 200000, 2000000):
+        turn = adversarial_turn(rng, size)
+        best = float("inf")
+        for _ in range(3):
+            started = time.perf_counter()
+            uncapped.scan(turn)
+            best = min(best, time.perf_counter() - started)
+        print(f"  {size:>8} chars: {best * 1000:8.2f} ms, {best / size * 1e9:6.1f} ns/char")
+
+
+def main(count: int = 20000) -> None:
+    turns = sample_turns(count)
+    scanner = ObjectionScanner()
+    assert all(
+        phrase_counts(scanner, turn) == {p: c for p, c in legacy_counts(turn).items() if p in scanner.phrases}
+        for turn in turns[:1000]
+    )
+
+    print(f"{count} turns of ~{sum(map(len, turns)) // count} characters:")
+    legacy = time_per_turn("legacy search + findall:", legacy_counts, turns)
+    compiled = time_per_turn("precompiled scanner:", scanner.scan, turns)
+    print(f"  speedup: {legacy / compiled:.1f}x")
+    worst_case(scanner)
+    fuzzed_scaling()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
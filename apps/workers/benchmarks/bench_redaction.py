@@ -0,0 +1,67 @@
+"""
+PII redaction throughput.
+
+Streams a synthetic transcript through the redactor and reports MB/s with
+and without party names, at a realistic and a deliberately dense PII rate,
+next to a plain regular-expression scan of the same data for comparison.
+Usage (from apps/workers):
+    python -m benchmarks.bench_redaction [megabytes]
+"""
+import io
+import random
+import sys
+import time
+
+from app.core.redaction import Redactor
+
+
+WORDS = (
+    "the witness said that on the night of march he was at home with his family "
+    "and did not see anything unusual objection sustained counsel please rephrase "
+    "exhibit page line officer vehicle report statement"
+).split()
+
+PII = ["123-45-6789", "(555) 123-4567", "555.867.5309", "j.doe@example.com", "4111111111111111", "Jane Smith", "Mr. Chen"]
+
+NAMES = ["Jane Smith", "Robert Johnson", "Maria Garcia", "Wei Chen"]
+
+
+def sample_text(megabytes: float, pii_rate: float) -> bytes:
+    rng = random.Random(7)
+    words = []
+    size = 0
+    while size < megabytes * 1_000_000:
+        roll = rng.random()
+        word = rng.choice(PII) if roll < pii_rate else str(rng.randint(1, 2030)) if roll < 0.01 else rng.choice(WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words).encode("utf-8")
+
+
+def time_redaction(data: bytes, names: list) -> None:
+    redactor = Redactor(names)
+    started = time.perf_counter()
+    spans = redactor.redact_stream(io.BytesIO(data), io.BytesIO())
+    elapsed = time.perf_counter() - started
+    print(f"  redact_stream names={len(names)}: {len(data) / elapsed / 1e6:7.0f} MB/s, {len(spans)} spans")
+
+
+def time_full_scan(data: bytes, names: list) -> None:
+    redactor = Redactor(names)
+    started = time.perf_counter()
+    count = sum(1 for _ in redactor.pattern.finditer(data))
+    elapsed = time.perf_counter() - started
+    print(f"  full regex scan names={len(names)}: {len(data) / elapsed / 1e6:5.0f} MB/s, {count} spans")
+
+
+def main(megabytes: float = 64) -> None:
+    for label, rate in (("realistic", 0.0005), ("dense", 0.01)):
+        data = sample_text(megabytes, rate)
+        print(f"{label} PII ({len(data) / 1e6:.0f} MB):")
+        for names in ([], NAMES):
+            time_redaction(data, names)
+        time_full_scan(data[:8_000_000], NAMES)
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 64)
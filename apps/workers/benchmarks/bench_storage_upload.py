@@ -0,0 +1,66 @@
+"""
+Upload throughput: a fresh boto3 client per exhibit vs the shared storage client.
+
+Needs a reachable MinIO/S3 (see docker-compose.dev.yml) and the bucket in
+S3_BUCKET. Usage (from apps/workers):
+    python -m benchmarks.bench_storage_upload [count] [size_bytes]
+"""
+import os
+import sys
+import time
+import uuid
+
+import boto3
+
+from app.core import storage
+from app.core.pools import get_thread_pool
+
+
+def fresh_client_upload(key: str, body: bytes) -> None:
+    """Original approach: build a client (and connection) for every upload"""
+    client = boto3.client(
+        's3',
+        endpoint_url=os.getenv('S3_ENDPOINT_URL', 'http://localhost:9000'),
+        aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID', 'minioadmin'),
+        aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY', 'minioadmin'),
+        region_name=os.getenv('AWS_REGION', 'us-east-1'),
+    )
+    client.put_object(Bucket=storage.get_bucket_name(), Key=key, Body=body)
+
+
+def main(count: int = 1000, size: int = 16 * 1024) -> None:
+    body = os.urandom(size)
+    prefix = f"bench/{uuid.uuid4()}"
+    keys = []
+
+    started = time.perf_counter()
+    for i in range(count):
+        key = f"{prefix}/fresh/{i}"
+        fresh_client_upload(key, body)
+        keys.append(key)
+    fresh = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for i in range(count):
+        key = f"{prefix}/shared/{i}"
+        storage.upload_bytes(body, key)
+        keys.append(key)
+    shared = time.perf_counter() - started
+
+    pool = get_thread_pool("bench-upload", max_workers=16)
+    started = time.perf_counter()
+    shared_keys = [f"{prefix}/pooled/{i}" for i in range(count)]
+    list(pool.map(lambda key: storage.upload_bytes(body, key), shared_keys))
+    keys.extend(shared_keys)
+    pooled = time.perf_counter() - started
+
+    for label, elapsed in (("fresh client", fresh), ("shared client", shared), ("shared + 16 threads", pooled)):
+        print(f"{label:20s} {count} x {size // 1024} KiB: {elapsed:.2f} s ({count / elapsed:.0f} objects/s)")
+
+    failed = storage.delete_objects(keys)
+    print(f"cleaned up {len(keys) - len(failed)} objects")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    main(*args)
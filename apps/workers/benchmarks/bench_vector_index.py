@@ -0,0 +1,64 @@
+"""
+Anchoring latency: embedding a transcript line and searching a case's index.
+
+Builds exact and IVF indexes over clustered synthetic unit vectors (documents
+about a few hundred topics), then reports search latency percentiles and IVF
+recall@10 against the exact scan. Usage (from
+apps/workers):
+    python -m benchmarks.bench_vector_index [sizes...]
+"""
+import sys
+import time
+
+import numpy as np
+
+from app.core.embeddings import EMBEDDING_DIM, get_embedder, normalize_rows
+from app.core.vector_index import VectorIndex
+
+
+def percentiles(samples: list) -> str:
+    p50, p99 = np.percentile(np.array(samples) * 1e6, [50, 99])
+    return f"p50 {p50:7.0f} us  p99 {p99:7.0f} us"
+
+
+def main(sizes=(1000, 5000, 50000), queries: int = 200) -> None:
+    rng = np.random.default_rng(0)
+    embedder = get_embedder()
+
+    started = time.perf_counter()
+    for _ in range(queries):
+        embedder.embed(["Officer, where was the defendant standing when you first saw the vehicle?"])
+    print(f"embed one turn: {(time.perf_counter() - started) / queries * 1e6:.0f} us")
+
+    for size in sizes:
+        topics = rng.standard_normal((300, EMBEDDING_DIM)).astype(np.float32)
+        noise = 1.5 * rng.standard_normal((size, EMBEDDING_DIM)).astype(np.float32)
+        vectors = normalize_rows(topics[rng.integers(0, len(topics), size)] + noise)
+        keys = [str(i) for i in range(size)]
+        probes = normalize_rows(vectors[:queries] + 0.05 * rng.standard_normal((queries, EMBEDDING_DIM)).astype(np.float32))
+
+        exact = VectorIndex(np.asarray(keys), vectors)
+        started = time.perf_counter()
+        index = VectorIndex.build(keys, vectors)
+        build = time.perf_counter() - started
+
+        for label, candidate in (("exact", exact), ("built", index)):
+            samples = []
+            for probe in probes:
+                started = time.perf_counter()
+                candidate.search(probe, limit=10)
+                samples.append(time.perf_counter() - started)
+            kind = "ivf" if candidate.centroids is not None else "flat"
+            print(f"{size:6d} vectors {label:5s} ({kind:4s}): {percentiles(samples)}")
+
+        if index.centroids is not None:
+            recall = np.mean([
+                len({key for key, _ in index.search(probe, 10)} & {key for key, _ in exact.search(probe, 10)}) / 10
+                for probe in probes
+            ])
+            print(f"{size:6d} vectors ivf build {build:.2f} s, recall@10 {recall:.3f}")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*([tuple(args)] if args else []))
@@ -1,5 +1,19 @@
 from celery import Celery
+from celery.signals import worker_init
 from app.core.config import settings
+import gc
+
+# Tasks that fan work out to process pools (app.core.pools). Prefork children
+# are daemonic and cannot start pools, so these run on their own queue,
+# consumed by a worker started with `-P threads`:
+#   celery -A celery_app worker -P threads -Q pooled
+POOL_QUEUE = "pooled"
+POOL_TASKS = (
+    "app.tasks.intake_normalizer.normalize_intake_batch",
+    "app.tasks.evidence_ingest.ingest_exhibit",
+    "app.tasks.evidence_ingest.ingest_exhibits_batch",
+    "app.tasks.evidence_ingest.render_exhibit_page",
+)
 
 celery_app = Celery(
     "courtroom_simulator_workers",
@@ -8,7 +22,9 @@ celery_app = Celery(
     include=[
         "app.tasks.intake_normalizer",
         "app.tasks.evidence_ingest",
+        "app.tasks.embedding_pipeline",
         "app.tasks.trial_director",
+        "app.tasks.motion_engine",
         "app.tasks.objection_engine",
         "app.tasks.instruction_engine",
         "app.tasks.deliberation_engine",
@@ -28,4 +44,19 @@ celery_app.conf.update(
     task_soft_time_limit=25 * 60,  # 25 minutes
     worker_prefetch_multiplier=1,
     worker_max_tasks_per_child=1000,
+    task_routes={name: {"queue": POOL_QUEUE} for name in POOL_TASKS},
 )
+
+
+@worker_init.connect
+def preload_shared_tables(**kwargs):
+    """
+    Load read-only lookup tables in the parent before the pool forks.
+    
+    gc.freeze() moves everything allocated so far out of the collector's
+    generations, so GC passes in the children do not write to (and copy)
+    the pages holding the shared catalogs.
+    """
+    from app.core.catalog import CATALOGS  # noqa: F401
+    
+    gc.freeze()
@@ -80,7 +80,22 @@ CREATE TABLE exhibits (
     foundation JSONB DEFAULT '{}',
     admitted BOOLEAN DEFAULT FALSE,
     objections JSONB DEFAULT '{}',
-    embedding VECTOR(1536)
+    checksum TEXT,
+    size_bytes BIGINT,
+    custody_root TEXT,
+    embedding VECTOR(1536),
+    embedding_hash TEXT,
+    UNIQUE (case_id, code),
+    UNIQUE (case_id, checksum)
+);
+
+-- Extracted page text, shared by every exhibit with the same content
+CREATE TABLE exhibit_pages (
+    checksum TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    words JSONB DEFAULT '[]',
+    PRIMARY KEY (checksum, page)
 );
 
 CREATE TABLE facts (
@@ -89,7 +104,8 @@ CREATE TABLE facts (
     text TEXT NOT NULL,
     time_hint TEXT,
     source TEXT,
-    embedding VECTOR(1536)
+    embedding VECTOR(1536),
+    embedding_hash TEXT
 );
 
 -- Pretrial Motions & Rulings
@@ -193,6 +209,7 @@ CREATE INDEX idx_objections_case_id_turn_id ON objections(case_id, turn_id);
 CREATE INDEX idx_exhibits_case_id ON exhibits(case_id);
 CREATE INDEX idx_witnesses_case_id ON witnesses(case_id);
 CREATE INDEX idx_counts_case_id ON counts(case_id);
+CREATE INDEX idx_exhibit_pages_text ON exhibit_pages USING gin (to_tsvector('english', text));
 CREATE INDEX idx_audit_log_org_id ON audit_log(org_id);
 CREATE INDEX idx_audit_log_case_id ON audit_log(case_id);
 